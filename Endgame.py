@@ -1,9 +1,14 @@
 from abc import ABC, abstractmethod
 import itertools
 import random
+from codes import swap
+from multiset import MultisetPermutations
+from knowledge import KnowledgeBase, UNKNOWN
 
 class Player(ABC):
-    """Player for Mastermind"""
+    """Player for Mastermind, random decisions are drawn from rng (set by Mastermind for every round)"""
+
+    rng = random
 
     def __init__(self):
         """Constructor for Player"""
@@ -43,17 +48,17 @@ class Endgame(Player):
 
         self.player_name ="EndGame"
 
-        self.rule_out_dict = []      # knowledge dictionary.
+        self.knowledge = None        # knowledge base (see knowledge.py), colors excluded at every index.
         self.last_guess = None
-        self.queue = []
+        self.queue = iter(())        # lazy stream of the guesses left in search mode
         self.one_char = 0            # to keep track of which character we deal with now.
-        self.gauntlet = []           # holds our knowledge about the correct code
+        self.gauntlet = bytearray()  # holds our knowledge about the correct code, as a packed code (knowledge.fixed)
         self.try_mode = False        # mode in which we find the right colors
         self.search_mode = False     # mode in which we find the right place for a correct color
         self.scsa_color_first_mode = False# mode in which we populate a color map with the correct colors and how many of each
         self.scsa_test_color_by_peg_mode = False # after we know colors, loop through them peg by peg to find code
         self.num_of_gems = 0         # number of correct colors with a correct place we discover so far.
-        self.cur_char = '#'          # current character we deal with in try and search mode.
+        self.cur_char = UNKNOWN      # current color (index) we deal with in try and search mode.
         self.scsa_correct_colors = 0      # number of correct colors 
         self.scsa_color_map = []          #generated in color first mode, holds correct colos and how many of each
         self.scsa_color_map_index= 1
@@ -65,7 +70,7 @@ class Endgame(Player):
         self.beta_search_mode = False
         self.correct_colors = []
         self.visited = set()
-        self.current_best = ''
+        self.current_best = b''
         self.threshold = 0
         self.search_index_bit = False
         self.swapped_indexes_history = set()
@@ -77,19 +82,19 @@ class Endgame(Player):
         ##########################################
 
     # Reinitialize member variables
-    def initialize(self, pegs):
-        self.rule_out_dict = []
+    def initialize(self, pegs, num_colors):
+        self.knowledge = KnowledgeBase(pegs, num_colors)
         self.last_guess = None
-        self.queue = []
+        self.queue = iter(())
         self.one_char = 0
-        self.gauntlet = []                                  
+        self.gauntlet = self.knowledge.fixed
         self.try_mode = True
         self.search_mode = False
         self.scsa_color_first_mode = False
         self.scsa_test_color_by_peg_mode = False
         self.num_of_gems = 0   
         self.scsa_correct_colors = 0 
-        self.cur_char = '#'  
+        self.cur_char = UNKNOWN
 
 
         ############ BETA VARIABLES ##############
@@ -98,7 +103,7 @@ class Endgame(Player):
         self.beta_search_mode = False
         self.correct_colors = []
         self.visited = set()
-        self.current_best = ''
+        self.current_best = b''
         self.threshold = ((pegs // 2) // 2) * 2
         self.search_index_bit = False
         self.swapped_indexes_history = set()
@@ -109,24 +114,17 @@ class Endgame(Player):
         self.board_length = pegs
         ##########################################
 
-        for i in range(pegs): # Initialize rule_out_dict array with empty sets.
-            self.rule_out_dict.append(set()) 
-            self.gauntlet.append('#')   
+        for i in range(pegs):
             self.unknown_indexes.append(i)  
 
     # When iterating over the characters of guess,
-    # if the n-th character is in the n-th set of 
-    # rule_out_dict, it returns True, False otherwise.
+    # if the n-th character is excluded at the n-th index
+    # of the knowledge base, it returns True, False otherwise.
     def rule_out(self, guess):
-        for i in range(len(guess)):
-            if guess[i] in self.rule_out_dict[i]:
-                return True
-        return False
+        return self.knowledge.rules_out(guess)
 
     def swap(self, s, i, j):
-        lst = list(s)
-        lst[i], lst[j] = lst[j], lst[i]
-        return ''.join(lst)
+        return swap(s, i, j)
 
     def swap_tuple(self, tu):
         list_x = list(tu)
@@ -137,20 +135,35 @@ class Endgame(Player):
         li_copy = li[:]
         return li_copy
 
+    # Builds a guess from the gauntlet, placing pegs (in order) at the
+    # indexes whose color is not known yet.
+    def fill_gauntlet(self, pegs):
+        guess = bytearray(self.gauntlet)
+        unknown = [i for i in range(len(guess)) if guess[i] == UNKNOWN]
+        for idx, peg in zip(unknown, pegs):
+            guess[idx] = peg
+        return bytes(guess)
+
+    # Builds a guess from the gauntlet, using color at every index
+    # whose color is not known yet.
+    def fill_gauntlet_with(self, color):
+        return bytes(self.gauntlet).replace(bytes([UNKNOWN]), bytes([color]))
+
     def make_guess(
         self,
         board_length: int,
         colors: 'list[str]',
         scsa_name: str,
         last_response: tuple([int, int, int]),
-    ) -> str:
+    ) -> bytes:
 
+        # Guesses are packed codes (see codes.py): color i of colors is the byte i.
         try:
             # First guess
             if last_response[2] == 0:             
-                self.initialize(board_length)
-                guess = 'A' * board_length
-                self.cur_char = 'A' 
+                self.initialize(board_length, len(colors))
+                guess = bytes(board_length)
+                self.cur_char = 0
                 self.one_char += 1
                 if scsa_name == "ABColor" \
                     or scsa_name == "TwoColor" \
@@ -197,22 +210,22 @@ class Endgame(Player):
                     if last_response[0] > 0:
                         self.scsa_correct_colors += last_response[0]
                         self.scsa_color_map.append((self.last_guess[0],last_response[0]))
-                        self.cur_char = chr(65 + (self.one_char % len(colors)))
+                        self.cur_char = self.one_char % len(colors)
                         self.one_char += 1
                         #check if we found all colors after update
                         #if so get ready for next phase
                         if self.scsa_correct_colors == board_length:
                             #reset current char and guess to AAAA, for compatibility with other modes after obtaining color map
-                            self.initialize(board_length)
-                            guess = 'A' * board_length
-                            self.cur_char = 'A'
+                            self.initialize(board_length, len(colors))
+                            guess = bytes(board_length)
+                            self.cur_char = 0
                             self.one_char = 1
                             if scsa_name == "ABColor" or scsa_name == "TwoColor" or scsa_name == "mystery2" or scsa_name == "TwoColorAlternating":
                                 self.try_mode = False 
                                 self.scsa_color_first_mode = False
                                 self.scsa_test_color_by_peg_mode = True
                                 #guess should be homogenous of first color in color map
-                                guess = self.scsa_color_map[0][0]* board_length
+                                guess = bytes([self.scsa_color_map[0][0]]) * board_length
                             else:
                                 self.try_mode = True 
                                 self.scsa_color_first_mode = False
@@ -222,10 +235,10 @@ class Endgame(Player):
                             self.last_guess = guess       
                             return guess
                     else: #color not in code, just go next
-                        self.cur_char = chr(65 + (self.one_char % len(colors)))
+                        self.cur_char = self.one_char % len(colors)
                         self.one_char += 1
                     #update and submit guess
-                    guess = self.cur_char * board_length 
+                    guess = bytes([self.cur_char]) * board_length
                     self.last_guess = guess   
                     return guess
 
@@ -233,11 +246,11 @@ class Endgame(Player):
                 # then move to next peg, and repeat
                 # mystery2 is a repetading 3 color code, hence the unique code block
                 elif self.scsa_test_color_by_peg_mode:
-                    guess = list(self.last_guess) #change guess into list so we can change elements
+                    guess = bytearray(self.last_guess) #change guess into bytearray so we can change elements
                     if scsa_name == "ABColor" or scsa_name == "TwoColor" or (scsa_name == "mystery2" and self.one_char < 3): 
-                        if self.last_guess == self.scsa_color_map[0][0] * board_length: #this is our first guess in test_color_by_peg_mode
+                        if self.last_guess == bytes([self.scsa_color_map[0][0]]) * board_length: #this is our first guess in test_color_by_peg_mode
                             guess[0] = self.scsa_color_map[1][0]
-                            guess = "".join(guess)
+                            guess = bytes(guess)
                             self.one_char = 0 #index of checking 
                             self.num_of_gems = last_response[0]
                             self.last_guess = guess
@@ -248,37 +261,32 @@ class Endgame(Player):
                                 self.one_char += 1 #go to next peg
                                 self.scsa_color_map_index= 1 #reset colormap index for next peg
                                 guess[self.one_char] = self.scsa_color_map[self.scsa_color_map_index][0]
-                                guess = "".join(guess)
+                                guess = bytes(guess)
                             elif self.num_of_gems > last_response[0]:#change was bad, previous was correct
                                 guess[self.one_char] = self.scsa_color_map[self.scsa_color_map_index-1][0] #change it back
                                 self.one_char += 1 #next peg
                                 self.scsa_color_map_index= 1
                                 guess[self.one_char] = self.scsa_color_map[self.scsa_color_map_index][0]
-                                guess = "".join(guess)
+                                guess = bytes(guess)
                             else: #no change in gems, neither previous nor change were right
                                 self.scsa_color_map_index+= 1
                                 guess[self.one_char] = self.scsa_color_map[self.scsa_color_map_index][0] #try next color in colormap at this peg
-                                guess = "".join(guess)
+                                guess = bytes(guess)
                     elif scsa_name == "mystery2": #we are on 3rd or greater index of code, for this one it repeats pattern
-                            guess = list(self.last_guess)
+                            guess = bytearray(self.last_guess)
                             for i in range(3, board_length):
                                 guess[i] = guess[i-3]
                     elif scsa_name == "TwoColorAlternating":
-                        guess = ""
-                        if self.last_guess == self.scsa_color_map[0][0] * board_length:
+                        if self.last_guess == bytes([self.scsa_color_map[0][0]]) * board_length:
                             color1 = self.scsa_color_map[0][0]
                             color2 = self.scsa_color_map[1][0]
                         else: 
                             color1 = self.scsa_color_map[1][0]
                             color2 = self.scsa_color_map[0][0]
-                        for i in range(board_length):
-                            if i % 2 == 0:
-                                guess += color1
-                            else:
-                                guess += color2
+                        guess = (bytes([color1, color2]) * ((board_length + 1) // 2))[:board_length]
                         self.last_guess = guess
                         return guess
-                    guess = "".join(guess)
+                    guess = bytes(guess)
                     self.last_guess = guess
                     return guess      
 
@@ -295,44 +303,30 @@ class Endgame(Player):
                     # characters.
                     if (last_response[0] + last_response[1]) <= self.num_of_gems:    
                         for i in range(len(self.last_guess)):
-                            if self.gauntlet[i] == '#':       
-                                self.rule_out_dict[i].add(self.cur_char)  
-
-                        next_possible = [chr(65 + (self.one_char % len(colors)))] * board_length
-                        for i in range(board_length):
-                            if not self.gauntlet[i] == '#':
-                                next_possible[i] = self.gauntlet[i]
+                            if self.gauntlet[i] == UNKNOWN:       
+                                self.knowledge.exclude(i, self.cur_char)
 
-                        self.queue.append(''.join(map(str, next_possible)))
-                        self.cur_char = chr(65 + (self.one_char % len(colors)))
+                        guess = self.fill_gauntlet_with(self.one_char % len(colors))
+                        self.cur_char = self.one_char % len(colors)
                         self.one_char += 1
 
-                        guess = self.queue.pop(0)
                         self.last_guess = guess 
                         return guess
 
                     # Once we get to know the current character we deal with is in the answer,
-                    # it generates all possible next guesses using multiset permutations.
+                    # it streams all possible next guesses using multiset permutations, inserted into
+                    # the gauntlet and pruned by the knowledge base as they are generated.
                     elif (last_response[0] + last_response[1]) > self.num_of_gems:
                         next_set = [self.cur_char] * (last_response[0] + last_response[1] - self.num_of_gems) \
-                        + [chr(65 + (self.one_char % len(colors)))] * (board_length - (last_response[0] + last_response[1]))
+                        + [self.one_char % len(colors)] * (board_length - (last_response[0] + last_response[1]))
 
                         # next_set = set(itertools.permutations(next_set)) # Standard permutations
-                        next_set = list(unique_permutations(next_set))   # Endgame permutations
+                        self.queue = pruned_permutations(next_set, self.knowledge)   # Endgame permutations
 
-                        for i in next_set:
-                            tmp = list(i)
-                            for idx in range(len(self.gauntlet)):
-                                if not self.gauntlet[idx] == '#':
-                                    tmp.insert(idx, self.gauntlet[idx])
-
-                            self.queue.append(''.join(map(str, tmp)))
-
-                        
                         self.search_mode = True
                         self.try_mode = False
 
-                        guess = self.queue.pop(0)
+                        guess = next(self.queue)
                         self.last_guess = guess 
                         return guess
 
@@ -344,31 +338,23 @@ class Endgame(Player):
                     if last_response[0] == (last_response[0] + last_response[1]) and last_response[1] == 0:
                         for i in range(board_length):
                             if self.last_guess[i] == self.cur_char:
-                                self.gauntlet[i] = self.cur_char
+                                self.knowledge.fix(i, self.cur_char)
                                 self.num_of_gems += 1
-                        self.queue.clear()
+                        self.queue = iter(())
 
-                        next_possible = [chr(65 + (self.one_char % len(colors)))] * board_length
-                        for i in range(board_length):
-                            if not self.gauntlet[i] == '#':
-                                next_possible[i] = self.gauntlet[i]
-
-                        self.queue.append(''.join(map(str, next_possible)))
-                        self.cur_char = chr(65 + (self.one_char % len(colors)))
+                        guess = self.fill_gauntlet_with(self.one_char % len(colors))
+                        self.cur_char = self.one_char % len(colors)
                         self.one_char += 1
 
                         self.search_mode = False
                         self.try_mode = True
 
-                        guess = self.queue.pop(0)
                         self.last_guess = guess 
                         return guess
 
-                    # Try with the next guess in the queue.
-                    guess = self.queue.pop(0)
-                    while self.rule_out(guess) == True:
-                        guess = self.queue.pop(0)
-                    
+                    # Try with the next guess in the queue (ruled out guesses are never generated).
+                    guess = next(self.queue)
+
                     self.last_guess = guess 
                     return guess
                 
@@ -389,7 +375,7 @@ class Endgame(Player):
 
                         else:
                             for i in range(len(self.last_guess)):
-                                self.rule_out_dict[i].add(self.cur_char)  
+                                self.knowledge.exclude(i, self.cur_char)
 
                         if self.num_of_gems == board_length:
                             self.beta_try_mode = False
@@ -400,10 +386,9 @@ class Endgame(Player):
                             return self.get_next_guess_by_shuffle()
 
                         else:
-                            next_possible = [chr(65 + (self.one_char % len(colors)))] * board_length
-                            self.cur_char = chr(65 + (self.one_char % len(colors)))
+                            self.cur_char = self.one_char % len(colors)
                             self.one_char += 1
-                            guess = ''.join(map(str, next_possible))
+                            guess = bytes([self.cur_char]) * board_length
                             self.last_guess = guess
                             return guess
 
@@ -416,8 +401,8 @@ class Endgame(Player):
                         # it means that the last guess it tried was meaningless, so update the knowledge base.
                         if last_response[0] <= self.num_of_gems:    
                             for i in range(len(self.last_guess)):
-                                if self.gauntlet[i] == '#':       
-                                    self.rule_out_dict[i].add(self.last_guess[i])  
+                                if self.gauntlet[i] == UNKNOWN:       
+                                    self.knowledge.exclude(i, self.last_guess[i])
 
                         # While trying to guess with random shuffling, turn on the search_index_bit 
                         # once it finds more correct colors with a correct place than the predefined
@@ -471,9 +456,9 @@ class Endgame(Player):
 
         # If no possible guesses in the queue, start again.
         except:
-            self.initialize(board_length)
-            guess = 'A' * board_length
-            self.cur_char = 'A'
+            self.initialize(board_length, len(colors))
+            guess = bytes(board_length)
+            self.cur_char = 0
             self.one_char = 1
             self.try_mode = True
             self.search_mode = False
@@ -487,11 +472,8 @@ class Endgame(Player):
 
         while True:
             tmp = self.clone(self.correct_colors) # Need a deep-copied list.
-            random.shuffle(tmp)
-            for idx in range(len(self.gauntlet)):  # Update randomly-shuffled next guess with the knowledge base
-                if not self.gauntlet[idx] == '#':
-                    tmp.insert(idx, self.gauntlet[idx])
-            next_guess = ''.join(map(str, tmp))
+            self.rng.shuffle(tmp)
+            next_guess = self.fill_gauntlet(tmp) # Update randomly-shuffled next guess with the knowledge base
 
             if not(next_guess in self.visited):
                 break
@@ -512,9 +494,9 @@ class Endgame(Player):
         limit = (self.board_length - self.num_of_gems) * (self.board_length - self.num_of_gems - 1) 
         cnt = 0
         
-        swapped_indexes = tuple(random.sample(self.unknown_indexes, 2))
+        swapped_indexes = tuple(self.rng.sample(self.unknown_indexes, 2))
         while swapped_indexes in self.swapped_indexes_history:
-            swapped_indexes = tuple(random.sample(self.unknown_indexes, 2))
+            swapped_indexes = tuple(self.rng.sample(self.unknown_indexes, 2))
             cnt += 1
 
             if cnt == limit:
@@ -541,8 +523,8 @@ class Endgame(Player):
         self.swapped_indexes_history.clear()
         
         # Update the gauntlet(knowledge base)
-        self.gauntlet[self.last_swapped_indexes[0]] = self.current_best[self.last_swapped_indexes[0]]
-        self.gauntlet[self.last_swapped_indexes[1]] = self.current_best[self.last_swapped_indexes[1]]
+        self.knowledge.fix(self.last_swapped_indexes[0], self.current_best[self.last_swapped_indexes[0]])
+        self.knowledge.fix(self.last_swapped_indexes[1], self.current_best[self.last_swapped_indexes[1]])
         self.num_of_gems += 2
 
         tmp_cache = self.clone(self.correct_colors)
@@ -561,27 +543,26 @@ class Endgame(Player):
 
 
 
-#Code to obtain unique multiset permutations. standard version includes duplicate permutaions, 
-# this specifies the occurances of each value and returns the unique permutaions via recrusion
-class unique_peg:
-    def __init__(self, value, occurrences):
-        self.value = value
-        self.occurrences = occurrences
-
+# Unique multiset permutations (see multiset.py). The last index varies slowest and values come in set order, so
+# permutations are the reversed permutations of a MultisetPermutations over the values in that order.
 def unique_permutations(pegs):
-    eset = set(pegs)
-    unique_list = [unique_peg(i,pegs.count(i)) for i in eset]
+    engine = MultisetPermutations(pegs, list(set(pegs)))
+    return (perm[::-1] for perm in engine)
+
+# Lazy version of unique_permutations for search mode: permutations are placed at the unknown indexes of the
+# gauntlet as they are generated, and colors the knowledge base excludes at an index are skipped there, so no
+# ruled out guess is built and memory does not grow with the number of permutations.
+# Pegs beyond the unknown indexes are left out of the guess, as in fill_gauntlet.
+def pruned_permutations(pegs, knowledge):
+    guess = bytearray(knowledge.fixed)
+    for i in range(len(guess)):
+        if guess[i] != UNKNOWN and knowledge.is_excluded(i, guess[i]):
+            return
+    slots = [i for i in range(len(guess)) if guess[i] == UNKNOWN]
     l = len(pegs)
-    return unique_permutations_recursive_helper(unique_list, [0] * l, l - 1)
-
-def unique_permutations_recursive_helper(unique_list, result, idx):
-    if idx < 0:
-        yield tuple(result)
-    else:
-        for i in unique_list:
-            if i.occurrences > 0:
-                result[idx]=i.value
-                i.occurrences-=1
-                for g in  unique_permutations_recursive_helper(unique_list,result,idx-1):
-                    yield g
-                i.occurrences+=1
+    excluded = [knowledge.excluded_colors(slots[l - 1 - p]) if l - 1 - p < len(slots) else set() for p in range(l)]
+    engine = MultisetPermutations(pegs, list(set(pegs)))
+    for perm in engine.iter_range(excluded=excluded):
+        for idx, peg in zip(slots, reversed(perm)):
+            guess[idx] = peg
+        yield bytes(guess)
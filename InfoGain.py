@@ -0,0 +1,230 @@
+# File contains a player for large boards choosing guesses by expected information gain over a sample of the codes
+# still consistent with the responses so far.
+# See main.py for example usages.
+
+import math
+import time
+import numpy as np
+import scsa
+from player import Player
+from feedback import batch_feedback, pack_response
+
+
+# Number of consistent codes kept per round.
+SAMPLE_SIZE = 256
+
+# Number of codes the sampler improves at once.
+POPULATION_SIZE = 256
+
+# Steps a code of the sampler may go without getting closer to consistent before it restarts from a new code.
+STALE_STEPS = 60
+
+# Seconds spent at most per guess, sampling then scoring proposals.
+GUESS_BUDGET = 0.02
+
+# Share of the budget spent refreshing the sample, the rest scores proposals.
+SAMPLE_SHARE = 0.7
+
+# Number of proposals scored at once.
+PROPOSAL_CHUNK = 64
+
+
+class InfoGain(Player):
+    """Mastermind Player that guesses the code whose response is expected to tell the most about the secret code
+
+    Boards like 10 pegs 10 colors are too large to enumerate, so the player keeps a bounded sample of codes consistent
+    with every response so far. The sample is refreshed by a local search run on a whole population of codes at once:
+    each step recolors or swaps pegs and keeps the change unless it breaks more responses (scored with batched
+    feedback). Codes of the sample are then proposed as guesses and scored by the entropy of the partition of the
+    sample by their responses, until the time budget runs out.
+    """
+
+    def __init__(self, budget: float = GUESS_BUDGET, sample_size: int = SAMPLE_SIZE):
+        """Constructor for InfoGain
+
+        Args:
+            budget (float, optional): Seconds spent at most per guess. Defaults to GUESS_BUDGET.
+            sample_size (int, optional): Number of consistent codes kept. Defaults to SAMPLE_SIZE.
+        """
+
+        self.player_name = "InfoGain"
+        self.budget = budget
+        self.sample_size = sample_size
+
+    def new_round(self, board_length: int, num_colors: int, scsa_name: str) -> None:
+        """Starts a round with a sample of codes drawn from the SCSA (every code is consistent before any guess)."""
+
+        self.board_length = board_length
+        self.num_colors = num_colors
+        self.random = np.random.default_rng(self.rng.getrandbits(64))
+        self.guesses = np.zeros((0, board_length), dtype=np.uint8)  # Every guess of the round
+        self.responses = np.zeros((0, 2), dtype=np.int64)  # (exact, other) of every guess
+
+        scsa_class = getattr(scsa, scsa_name, None)
+        self.scsa = scsa_class() if isinstance(scsa_class, type) and issubclass(scsa_class, scsa.SCSA) else None
+        self.sample = self.draw_codes(self.sample_size)
+        self.population = self.draw_codes(POPULATION_SIZE)
+        self.costs = self.cost(self.population)
+        self.stale = np.zeros(POPULATION_SIZE, dtype=np.int64)
+
+    def draw_codes(self, num_codes: int) -> np.ndarray:
+        """Codes drawn from the SCSA of the round (see SCSA.generate_codes_array), uniformly for unknown SCSAs."""
+
+        if self.scsa is not None:
+
+            codes = self.scsa.generate_codes_array(self.board_length, self.num_colors, num_codes, self.random)
+
+            if len(codes) == num_codes:
+
+                return codes
+
+        return self.random.integers(0, self.num_colors, (num_codes, self.board_length), dtype=np.uint8)
+
+    def cost(self, codes: np.ndarray) -> np.ndarray:
+        """Distance of every code from being consistent: sum over the guesses of the differences of the responses."""
+
+        if len(self.guesses) == 0:
+
+            return np.zeros(len(codes), dtype=np.int64)
+
+        exact, other = batch_feedback(codes, self.guesses, self.num_colors)
+        exact = exact.astype(np.int64) - self.responses[:, 0]
+        other = other.astype(np.int64) - self.responses[:, 1]
+
+        return (np.abs(exact) + np.abs(other)).sum(axis=1)
+
+    def step(self) -> None:
+        """Recolors one peg or swaps two pegs of every code of the population, keeping changes that are no worse."""
+
+        size = len(self.population)
+        rows = np.arange(size)
+        proposals = self.population.copy()
+        recolor = self.random.random(size) < 0.5
+
+        positions = self.random.integers(0, self.board_length, size)
+        colors = self.random.integers(0, self.num_colors, size, dtype=np.uint8)
+        proposals[rows[recolor], positions[recolor]] = colors[recolor]
+
+        swapped = rows[~recolor]
+        first = positions[~recolor]
+        second = self.random.integers(0, self.board_length, len(swapped))
+        proposals[swapped, first] = self.population[swapped, second]
+        proposals[swapped, second] = self.population[swapped, first]
+
+        costs = self.cost(proposals)
+        kept = costs <= self.costs
+
+        self.stale = np.where(costs < self.costs, 0, self.stale + 1)
+        self.population[kept] = proposals[kept]
+        self.costs[kept] = costs[kept]
+
+        # Codes stuck on a plateau restart from new codes
+        stuck = np.flatnonzero(self.stale > STALE_STEPS)
+
+        if len(stuck):
+
+            self.population[stuck] = self.draw_codes(len(stuck))
+            self.costs[stuck] = self.cost(self.population[stuck])
+            self.stale[stuck] = 0
+
+    def refresh_sample(self, deadline: float) -> None:
+        """Drops codes of the sample that the last response rules out, and adds consistent codes found by the sampler."""
+
+        self.sample = self.sample[self.cost(self.sample) == 0]
+        self.costs = self.cost(self.population)
+
+        while len(self.sample) < self.sample_size and time.perf_counter() < deadline:
+
+            self.step()
+
+            found = self.population[self.costs == 0]
+
+            if len(found):
+
+                self.sample = np.unique(np.concatenate((self.sample, found)), axis=0)[: self.sample_size]
+
+                # Consistent codes keep searching from a new code, so the sample does not crowd around them
+                restarted = np.flatnonzero(self.costs == 0)
+                self.population[restarted] = self.draw_codes(len(restarted))
+                self.costs[restarted] = self.cost(self.population[restarted])
+
+    def choose_guess(self, deadline: float) -> np.ndarray:
+        """Code of the sample whose responses split the sample with the highest entropy found in time."""
+
+        sample = self.sample
+
+        if len(sample) == 0:
+
+            # Nothing consistent found yet, guess the code closest to consistent
+            return self.population[np.argmin(self.costs)]
+
+        if len(sample) <= 2:
+
+            return sample[0]
+
+        num_responses = (self.board_length + 1) ** 2
+        proposals = sample[self.random.permutation(len(sample))]
+        best_guess = proposals[0]
+        best_entropy = -1.0
+
+        for lo in range(0, len(proposals), PROPOSAL_CHUNK):
+
+            chunk = proposals[lo : lo + PROPOSAL_CHUNK]
+            exact, other = batch_feedback(chunk, sample, self.num_colors)
+            responses = pack_response(exact.astype(np.int64), other.astype(np.int64), self.board_length)
+
+            # Partition sizes of every proposal at once: each row counts its responses in its own range of bins
+            bins = responses + (np.arange(len(chunk)) * num_responses)[:, None]
+            sizes = np.bincount(bins.ravel(), minlength=len(chunk) * num_responses).reshape(len(chunk), num_responses)
+            shares = sizes / len(sample)
+            entropy = -(shares * np.log2(np.where(sizes > 0, shares, 1))).sum(axis=1)
+            idx = int(np.argmax(entropy))
+
+            if entropy[idx] > best_entropy:
+
+                best_guess = chunk[idx]
+                best_entropy = entropy[idx]
+
+            if best_entropy >= math.log2(len(sample)) or time.perf_counter() > deadline:
+
+                break
+
+        return best_guess
+
+    def make_guess(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        last_response: tuple[int, int, int],
+    ) -> bytes:
+        """Makes a guess of the secret code for Mastermind
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            last_response (tuple[int, int, int]): (First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess, the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess, and the third
+                                           element is the number of guesses so far.)
+
+        Returns:
+            bytes: Returns guess as a packed code
+        """
+
+        start = time.perf_counter()
+
+        if last_response[2] == 0:
+
+            self.new_round(board_length, len(colors), scsa_name)
+
+        else:
+
+            self.guesses = np.concatenate((self.guesses, self.last_guess[None, :]))
+            self.responses = np.concatenate((self.responses, [[last_response[0], last_response[1]]]))
+            self.refresh_sample(start + self.budget * SAMPLE_SHARE)
+
+        self.last_guess = self.choose_guess(start + self.budget)
+
+        return self.last_guess.tobytes()
@@ -0,0 +1,209 @@
+# File contains a Knuth-style minimax player, keeping every code still consistent with the responses so far.
+# See main.py for example usages.
+
+import time
+import numpy as np
+import scsa
+from player import Player
+from Endgame import Endgame
+from feedback import all_codes, array_ranks, batch_feedback, pack_response, FeedbackTable
+
+
+# Largest number of codes (num_colors ** board_length) Minimax enumerates, larger games are played by Endgame.
+MAX_CODES = 1 << 17
+
+# Games with at most this many codes look responses up in a feedback table (built once, see feedback.py).
+TABLE_CODES = 1 << 12
+
+# Seconds spent at most choosing a guess, so rounds stay well under Round.time_cutoff.
+GUESS_TIME_CAP = 0.25
+
+# Upper bound on the number of responses computed at once while scoring a chunk of guesses.
+CHUNK_RESPONSES = 1 << 18
+
+
+class Minimax(Player):
+    """Mastermind Player that guesses the code minimizing the largest set of candidates left by any response
+
+    Candidates (codes consistent with every response so far, starting from the codes the SCSA can generate) are kept
+    as an array of ranks (see feedback.code_rank) and filtered with one vectorized comparison per response. Guesses
+    are scored candidates first, so ties go to a guess that can win, until the time cap runs out.
+    """
+
+    __codes = {}  # (board_length, num_colors) -> every code in rank order (see feedback.all_codes)
+    __support = {}  # (board_length, num_colors, scsa_name) -> ranks of the codes the SCSA can generate
+    __first_guess = {}  # (board_length, num_colors, scsa_name) -> rank of the first guess of every round
+
+    def __init__(self, time_cap: float = GUESS_TIME_CAP):
+        """Constructor for Minimax
+
+        Args:
+            time_cap (float, optional): Seconds spent at most choosing a guess. Defaults to GUESS_TIME_CAP.
+        """
+
+        self.player_name = "Minimax"
+        self.time_cap = time_cap
+        self.fallback = None  # Player of games too large to enumerate
+
+    def new_round(self, board_length: int, num_colors: int, scsa_name: str) -> None:
+        """Starts a round with every code the SCSA can generate as candidates."""
+
+        self.board_length = board_length
+        self.num_colors = num_colors
+        self.key = (board_length, num_colors, scsa_name)
+        self.history = []  # (rank of guess, packed response) of every guess of the round
+
+        if (board_length, num_colors) not in Minimax.__codes:
+
+            Minimax.__codes[(board_length, num_colors)] = all_codes(board_length, num_colors)
+
+        self.codes = Minimax.__codes[(board_length, num_colors)]
+        self.table = FeedbackTable.load(board_length, num_colors) if len(self.codes) <= TABLE_CODES else None
+
+        if self.key not in Minimax.__support:
+
+            Minimax.__support[self.key] = self.support(board_length, num_colors, scsa_name)
+
+        self.candidates = Minimax.__support[self.key]
+
+    def support(self, board_length: int, num_colors: int, scsa_name: str) -> np.ndarray:
+        """Ranks of the codes an SCSA can generate (see SCSA.iter_support), every code for unknown SCSAs."""
+
+        scsa_class = getattr(scsa, scsa_name, None)
+
+        if not (isinstance(scsa_class, type) and issubclass(scsa_class, scsa.SCSA)):
+
+            return np.arange(len(self.codes))
+
+        generator = scsa_class()
+
+        if generator.support_size(board_length, num_colors) in (0, len(self.codes)):
+
+            return np.arange(len(self.codes))
+
+        support = b"".join(generator.iter_support(board_length, num_colors))
+        codes = np.frombuffer(support, dtype=np.uint8).reshape(-1, board_length)
+
+        return np.sort(array_ranks(codes, num_colors))
+
+    def responses(self, guesses: np.ndarray, answers: np.ndarray) -> np.ndarray:
+        """Packed responses (see feedback.pack_response) of every guess against every answer, both given as ranks."""
+
+        if self.table is not None:
+
+            return self.table.lookup(guesses[:, None], answers[None, :]).astype(np.int64)
+
+        exact, other = batch_feedback(self.codes[guesses], self.codes[answers], self.num_colors)
+
+        return pack_response(exact.astype(np.int64), other.astype(np.int64), self.board_length)
+
+    def choose_guess(self) -> int:
+        """Rank of the guess whose largest partition of the candidates by response is the smallest found in time."""
+
+        candidates = self.candidates
+
+        if len(candidates) <= 2:
+
+            return int(candidates[0])
+
+        deadline = time.perf_counter() + self.time_cap
+        num_responses = (self.board_length + 1) ** 2
+        shuffle = np.random.default_rng(self.rng.getrandbits(64))
+        others = np.setdiff1d(np.arange(len(self.codes)), candidates, assume_unique=True)
+        pool = np.concatenate((candidates, shuffle.permutation(others)))
+
+        chunk = max(1, CHUNK_RESPONSES // len(candidates))
+        best_guess = int(candidates[0])
+        best_size = len(candidates) + 1
+
+        for lo in range(0, len(pool), chunk):
+
+            guesses = pool[lo : lo + chunk]
+            responses = self.responses(guesses, candidates)
+
+            # Partition sizes of every guess at once: each row counts its responses in its own range of bins
+            bins = responses + (np.arange(len(guesses)) * num_responses)[:, None]
+            sizes = np.bincount(bins.ravel(), minlength=len(guesses) * num_responses)
+            largest = sizes.reshape(len(guesses), num_responses).max(axis=1)
+            idx = int(np.argmin(largest))
+
+            if largest[idx] < best_size:
+
+                best_guess = int(guesses[idx])
+                best_size = int(largest[idx])
+
+            # A candidate leaving at most one code per response can not be beaten
+            if (best_size == 1 and lo < len(candidates)) or time.perf_counter() > deadline:
+
+                break
+
+        return best_guess
+
+    def make_guess(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        last_response: tuple[int, int, int],
+    ) -> bytes:
+        """Makes a guess of the secret code for Mastermind
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            last_response (tuple[int, int, int]): (First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess, the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess, and the third
+                                           element is the number of guesses so far.)
+
+        Returns:
+            bytes: Returns guess as a packed code
+        """
+
+        if len(colors) ** board_length > MAX_CODES:
+
+            if self.fallback is None:
+
+                self.fallback = Endgame()
+
+            self.fallback.rng = self.rng
+
+            return self.fallback.make_guess(board_length, colors, scsa_name, last_response)
+
+        if last_response[2] == 0:
+
+            self.new_round(board_length, len(colors), scsa_name)
+
+        else:
+
+            response = pack_response(last_response[0], last_response[1], board_length)
+            self.history.append((self.last_guess, response))
+            self.candidates = self.candidates[
+                self.responses(np.array([self.last_guess]), self.candidates)[0] == response
+            ]
+
+            if len(self.candidates) == 0:
+
+                # The secret code is outside the support of the SCSA (e.g. a code file), every code is a candidate
+                self.candidates = np.arange(len(self.codes))
+
+                for guess, response in self.history:
+
+                    self.candidates = self.candidates[
+                        self.responses(np.array([guess]), self.candidates)[0] == response
+                    ]
+
+        if last_response[2] == 0:
+
+            if self.key not in Minimax.__first_guess:
+
+                Minimax.__first_guess[self.key] = self.choose_guess()
+
+            self.last_guess = Minimax.__first_guess[self.key]
+
+        else:
+
+            self.last_guess = self.choose_guess()
+
+        return bytes(self.codes[self.last_guess])
@@ -2,7 +2,9 @@
 from abc import ABC, abstractmethod
 from scsa import list_to_str, InsertColors
 #import sys
-import itertools
+import numpy as np
+from player import BatchPlayer
+from knowledge import KnowledgeBase
 
 
 class Player(ABC):
@@ -52,29 +54,22 @@ class Baseline2(Player):
 
         self.player_name ="Baseline2"
         self.iters = None
-        self.rule_out_dict = []
+        self.knowledge = None   # knowledge base (see knowledge.py), colors excluded at every index.
         self.last_guess = None
 
 
-    def late_constructor(self, pegs):
-        self.rule_out_dict = []
-        for i in range(pegs): # Initialize rule_out_dict array with empty sets.
-            self.rule_out_dict.append(set())
+    def late_constructor(self, pegs, num_colors):
+        self.knowledge = KnowledgeBase(pegs, num_colors)
+        # Codes in lexicographic order, each one the next code
+        # whose colors are all still allowed, so ruled out codes
+        # are skipped without being built.
+        self.iters = self.knowledge.iter_allowed()
 
     # When iterating over the characters of guess,
-    # if the n-th character is in the n-th set of 
-    # rule_out_dict, it returns True, False otherwise.
+    # if the n-th character is excluded at the n-th index
+    # of the knowledge base, it returns True, False otherwise.
     def rule_out(self, guess):
-        for i in range(len(guess)):
-            if guess[i] in self.rule_out_dict[i]:
-                return True
-        return False
-    
-    def make_colors(self, color):
-        colors = []
-        for i in range(color):
-            colors.append(chr(i + 65))
-        return colors
+        return self.knowledge.rules_out(guess)
 
     def make_guess(
         self,
@@ -82,44 +77,99 @@ class Baseline2(Player):
         colors: 'list[str]',
         scsa_name: str,
         last_response: tuple([int, int, int]),
-    ) -> str:
+    ) -> bytes:
 
-        # print('----------------')
-        # print(last_response)
+        # Guesses are packed codes (see codes.py): color i of colors is the byte i.
         try:
             if last_response[2] == 0:
-                self.late_constructor(board_length)
-                self.iters = itertools.product(self.make_colors((len(colors))), repeat=int(board_length))
+                self.late_constructor(board_length, len(colors))
 
             if last_response[2] == 0:    
-                guess = ''.join(next(self.iters))
-                # print('initial guess:', guess)
+                guess = next(self.iters)
                 self.last_guess = guess       
                 return guess
 
             else:
                 if last_response[0] == 0 and last_response[1] == 0:                                                                                   
                     for i in range(len(self.last_guess)):       
-                        self.rule_out_dict[i].add(self.last_guess[i])  
-                    # print(self.rule_out_dict)
+                        self.knowledge.exclude(i, self.last_guess[i])
 
-                guess = ''.join(next(self.iters))
-                # print('initial guess:', guess)
-
-                while self.rule_out(guess) == True:
-                    guess = ''.join(next(self.iters))
-                    # print('next guess:', guess)
-                
+                guess = next(self.iters)
                 self.last_guess = guess
                 return guess
 
         except:
-            # print("FILL IT AGAIN")
-            self.iters = itertools.product(self.make_colors((len(colors))), repeat=int(board_length))
-            return ''.join(next(self.iters))
+            # No allowed code left, start again from the first code.
+            self.late_constructor(board_length, len(colors))
+            guess = next(self.iters)
+            self.last_guess = guess
+            return guess
+
 
 
 
+#-------------------------------------------------------------------
+# B2 for many rounds at once: same guesses as Baseline2, every round
+# keeps its last guess as an array of color indices and a mask of
+# the colors still allowed at every position. The next guess of all
+# rounds is found together with NumPy: the smallest code after the
+# last guess whose pegs are all allowed.
+class BatchBaseline2(BatchPlayer):
+    def __init__(self):
+        """Constructor for BatchBaseline2 Player"""
+
+        self.player_name = "Baseline2"
+        self.digits = None   # (rounds, pegs) last guess of every round
+        self.allowed = None  # (rounds, pegs, colors) False where the color was ruled out
+
+
+    def new_batch(self, board_length, colors, scsa_name, num_rounds):
+        self.digits = np.zeros((num_rounds, board_length), dtype=np.int64)
+        self.allowed = np.ones((num_rounds, board_length, len(colors)), dtype=bool)
+
+    # Smallest code after digits whose pegs are all allowed,
+    # the first code (all first color) if there is none left.
+    def next_allowed(self, digits, allowed):
+        rows, pegs, num_colors = allowed.shape
+        r = np.arange(rows)[:, None]
+        pos = np.arange(pegs)[None, :]
+
+        # nxt[i, j, c]: smallest allowed color >= c at position j (num_colors if none).
+        nxt = np.where(allowed, np.arange(num_colors), num_colors)
+        nxt = np.minimum.accumulate(nxt[:, :, ::-1], axis=2)[:, :, ::-1]
+        nxt = np.concatenate((nxt, np.full((rows, pegs, 1), num_colors)), axis=2)
+        fill = nxt[:, :, 0]  # Smallest allowed color of every position
+
+        # Pegs before the first ruled out one can be kept, the code goes up at the
+        # last position where it can, and every later position takes its smallest color.
+        ok = allowed[r, pos, digits]
+        bad = np.where(ok.all(axis=1), pegs, np.argmin(ok, axis=1))[:, None]
+        cand = nxt[r, pos, np.minimum(digits + (pos < bad), num_colors)]
+        later_ok = np.flip(np.logical_and.accumulate(np.flip(fill < num_colors, axis=1), axis=1), axis=1)
+        later_ok = np.concatenate((later_ok[:, 1:], np.ones((rows, 1), dtype=bool)), axis=1)
+        usable = (pos <= bad) & (cand < num_colors) & later_ok
+
+        j = pegs - 1 - np.argmax(usable[:, ::-1], axis=1)[:, None]
+        guess = np.where(pos < j, digits, np.where(pos == j, cand, fill))
+
+        return np.where(usable.any(axis=1)[:, None], guess, 0)
+
+    def make_guesses(self, board_length, colors, scsa_name, states):
+        ids = states[:, 0]
+        first = states[:, 3] == 0
+
+        # A (0, 0) response rules out every peg of the last guess at its position.
+        missed = ids[(states[:, 1] == 0) & (states[:, 2] == 0) & ~first]
+        pegs = np.arange(board_length)
+        self.allowed[missed[:, None], pegs, self.digits[missed]] = False
+
+        rest = ids[~first]
+        self.digits[ids[first]] = 0
+        self.digits[rest] = self.next_allowed(self.digits[rest], self.allowed[rest])
+
+        return self.digits[ids].astype(np.uint8)
+
+
 #------------------------------------IGNORE BELOW-----------------------------------------------
 
 # if __name__=="__main__":
@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
 from ast import While
 import random
+from knowledge import KnowledgeBase
 
 class Player(ABC):
-    """Player for Mastermind"""
+    """Player for Mastermind, random decisions are drawn from rng (set by Mastermind for every round)"""
+
+    rng = random
 
     def __init__(self):
         """Constructor for Player"""
@@ -40,7 +43,7 @@ class Endgame_Beta(Player):
         """Constructor for Own Player"""
         self.player_name ="BETA"
 
-        self.rule_out_dict = []      # knowledge dictionary.
+        self.knowledge = None        # knowledge base (see knowledge.py), colors excluded at every index.
         self.last_guess = None
         self.one_char = 0            # to keep track of which character we deal with now.
         self.gauntlet = []
@@ -63,8 +66,8 @@ class Endgame_Beta(Player):
 
 
     # Reinitialize member variables
-    def initialize(self, pegs):
-        self.rule_out_dict = []
+    def initialize(self, pegs, num_colors):
+        self.knowledge = KnowledgeBase(pegs, num_colors)
         self.last_guess = None
         self.one_char = 0
         self.gauntlet = []                                  
@@ -85,19 +88,20 @@ class Endgame_Beta(Player):
         self.unknown_indexes = []
         self.board_length = pegs
 
-        for i in range(pegs): # Initialize rule_out_dict array with empty sets.
-            self.rule_out_dict.append(set()) 
+        for i in range(pegs):
             self.gauntlet.append('#')   
             self.unknown_indexes.append(i)  
 
+    # Colors are the letters 'A', 'B', ..., the knowledge base
+    # keeps them as color indices.
+    def color_index(self, char):
+        return ord(char) - 65
+
     # When iterating over the characters of guess,
-    # if the n-th character is in the n-th set of 
-    # rule_out_dict, it returns True, False otherwise.
+    # if the n-th character is excluded at the n-th index
+    # of the knowledge base, it returns True, False otherwise.
     def rule_out(self, guess):
-        for i in range(len(guess)):
-            if guess[i] in self.rule_out_dict[i]:
-                return True
-        return False
+        return self.knowledge.rules_out([self.color_index(char) for char in guess])
 
     def swap(self, s, i, j):
         lst = list(s)
@@ -123,7 +127,7 @@ class Endgame_Beta(Player):
 
         # print(last_response, " ,Last_guess: ", self.last_guess, " , best_last_response: ", self.best_last_response, " , gauntlet: ", self.gauntlet, " , threshold: ", self.threshold, " , last_swapped_idx: ", self.last_swapped_indexes, ", num_gems: ", self.num_of_gems)
         if last_response[2] == 0:             
-            self.initialize(board_length)
+            self.initialize(board_length, len(colors))
             guess = 'A' * board_length
             self.cur_char = 'A' 
             self.one_char += 1  
@@ -147,7 +151,7 @@ class Endgame_Beta(Player):
 
                 else:
                     for i in range(len(self.last_guess)):
-                        self.rule_out_dict[i].add(self.cur_char)  
+                        self.knowledge.exclude(i, self.color_index(self.cur_char))
 
                 if self.num_of_gems == board_length:
                     self.try_mode = False
@@ -175,7 +179,7 @@ class Endgame_Beta(Player):
                 if last_response[0] <= self.num_of_gems:    
                     for i in range(len(self.last_guess)):
                         if self.gauntlet[i] == '#':       
-                            self.rule_out_dict[i].add(self.last_guess[i])  
+                            self.knowledge.exclude(i, self.color_index(self.last_guess[i]))
 
                 # While trying to guess with random shuffling, turn on the search_index_bit 
                 # once it finds more correct colors with a correct place than the predefined
@@ -233,7 +237,7 @@ class Endgame_Beta(Player):
 
         while True:
             tmp = self.clone(self.correct_colors) # Need a deep-copied list.
-            random.shuffle(tmp)
+            self.rng.shuffle(tmp)
             for idx in range(len(self.gauntlet)):  # Update randomly-shuffled next guess with the knowledge base
                 if not self.gauntlet[idx] == '#':
                     tmp.insert(idx, self.gauntlet[idx])
@@ -258,9 +262,9 @@ class Endgame_Beta(Player):
         limit = (self.board_length - self.num_of_gems) * (self.board_length - self.num_of_gems - 1) 
         cnt = 0
         
-        swapped_indexes = tuple(random.sample(self.unknown_indexes, 2))
+        swapped_indexes = tuple(self.rng.sample(self.unknown_indexes, 2))
         while swapped_indexes in self.swapped_indexes_history:
-            swapped_indexes = tuple(random.sample(self.unknown_indexes, 2))
+            swapped_indexes = tuple(self.rng.sample(self.unknown_indexes, 2))
             cnt += 1
 
             if cnt == limit:
@@ -0,0 +1,282 @@
+# File contains benchmarks for the scoring engine of Mastermind.
+# Example: python3 benchmark.py --suite feedback
+
+import argparse
+import random
+import timeit
+from operator import eq
+import numpy as np
+from scsa import InsertColors
+from mastermind import Round, Mastermind
+from registry import SCSA_NAMES, str_to_player, str_to_batch_player, str_to_scsa
+from feedback import batch_feedback, codes_to_array
+
+
+BOARDS = [(4, 6), (5, 7), (7, 5), (10, 10), (15, 20), (20, 26)]
+
+
+def make_colors(num_colors: int) -> list:
+
+    return [chr(i) for i in range(65, 91)][:num_colors]
+
+
+def bench_feedback(num_guesses: int = 100, num_answers: int = 100) -> None:
+    """Compares Round.process_guess against batch_feedback for every guess/answer pair
+
+    Args:
+        num_guesses (int, optional): Number of guesses to score. Defaults to 100.
+        num_answers (int, optional): Number of answers to score against. Defaults to 100.
+    """
+
+    scsa = InsertColors()
+
+    print("board   pairs    scalar(s)  batch(s)  speedup")
+
+    for board_length, num_colors in BOARDS:
+
+        colors = make_colors(num_colors)
+        guesses = scsa.generate_codes(board_length, colors, num_guesses)
+        answers = scsa.generate_codes(board_length, colors, num_answers)
+        rounds = [Round(board_length, colors, answer, scsa.name) for answer in answers]
+
+        start = timeit.default_timer()
+
+        scalar = [[r.process_guess(guess) for r in rounds] for guess in guesses]
+
+        scalar_time = timeit.default_timer() - start
+
+        start = timeit.default_timer()
+
+        exact, other = batch_feedback(
+            codes_to_array(guesses, colors), codes_to_array(answers, colors), num_colors
+        )
+
+        batch_time = timeit.default_timer() - start
+
+        assert scalar == [list(zip(e, o)) for e, o in zip(exact.tolist(), other.tolist())]
+
+        print(
+            "{:>2}x{:<4} {:>7}  {:>9.4f}  {:>8.4f}  {:>6.1f}x".format(
+                board_length,
+                num_colors,
+                num_guesses * num_answers,
+                scalar_time,
+                batch_time,
+                scalar_time / batch_time,
+            )
+        )
+
+    return
+
+
+def bench_bitmask(num_guesses: int = 1000) -> None:
+    """Compares the loop and the bitmask profile paths of Round.process_guess as the board grows
+
+    Args:
+        num_guesses (int, optional): Number of guesses to score per board. Defaults to 1000.
+    """
+
+    scsa = InsertColors()
+
+    print("pegs  colors  loop(us)  bitmask(us)")
+
+    crossover = {}
+
+    for num_colors in (2, 6, 26):
+
+        colors = make_colors(num_colors)
+
+        for board_length in (4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096):
+
+            answer = scsa.generate_packed_codes(board_length, num_colors, 1)[0]
+            guesses = scsa.generate_packed_codes(board_length, num_colors, num_guesses)
+            round = Round(board_length, colors, answer, scsa.name)
+            profile = round.profile
+
+            start = timeit.default_timer()
+
+            loop = [
+                (sum(map(eq, guess, answer)), sum(map(min, map(guess.count, profile.colors), profile.counts)))
+                for guess in guesses
+            ]
+
+            loop_time = timeit.default_timer() - start
+
+            start = timeit.default_timer()
+
+            bitmask = [profile.feedback(guess) for guess in guesses]
+
+            bitmask_time = timeit.default_timer() - start
+
+            assert [(e, c - e) for e, c in loop] == bitmask
+
+            # Crossover is the shortest board from which the bitmask path stays faster.
+            if bitmask_time >= loop_time:
+
+                crossover.pop(num_colors, None)
+
+            else:
+
+                crossover.setdefault(num_colors, board_length)
+
+            print(
+                "{:>4}  {:>6}  {:>8.2f}  {:>11.2f}".format(
+                    board_length,
+                    num_colors,
+                    loop_time / num_guesses * 1e6,
+                    bitmask_time / num_guesses * 1e6,
+                )
+            )
+
+    for num_colors, board_length in crossover.items():
+
+        print("Bitmask faster from", board_length, "pegs with", num_colors, "colors")
+
+    return
+
+
+def bench_batch(num_rounds: int = 2000) -> None:
+    """Compares Baseline2 playing one round at a time against its batch version playing rounds in lockstep
+
+    Args:
+        num_rounds (int, optional): Number of rounds per board. Defaults to 2000.
+    """
+
+    scsa = InsertColors()
+
+    print("board   rounds  sequential(s)  batch(s)  speedup")
+
+    for board_length, num_colors in BOARDS[:3]:
+
+        mastermind = Mastermind(board_length, make_colors(num_colors), tournament_time_cutoff=float("inf"))
+
+        start = timeit.default_timer()
+
+        sequential = mastermind.play_tournament(str_to_player("Baseline2"), scsa, num_rounds, seed=0, verbose=False)
+
+        sequential_time = timeit.default_timer() - start
+
+        mastermind.time_used = 0
+        start = timeit.default_timer()
+
+        batch = mastermind.play_batch_tournament(
+            str_to_batch_player("Baseline2"), scsa, num_rounds, seed=0, verbose=False
+        )
+
+        batch_time = timeit.default_timer() - start
+
+        assert str(sequential) == str(batch)
+
+        print(
+            "{:>2}x{:<4} {:>7}  {:>13.3f}  {:>8.3f}  {:>6.1f}x".format(
+                board_length,
+                num_colors,
+                num_rounds,
+                sequential_time,
+                batch_time,
+                sequential_time / batch_time,
+            )
+        )
+
+    return
+
+
+def bench_codes(num_codes: int = 100000) -> None:
+    """Compares generate_packed_codes against generate_codes_array for every SCSA
+
+    Args:
+        num_codes (int, optional): Number of codes to generate per SCSA and board. Defaults to 100000.
+    """
+
+    rng = np.random.default_rng(random.getrandbits(64))
+
+    print("scsa                 board   packed(codes/s)  array(codes/s)  speedup")
+
+    for scsa_name in SCSA_NAMES:
+
+        scsa = str_to_scsa(scsa_name)
+
+        for board_length, num_colors in [(7, 5), (20, 26)]:
+
+            start = timeit.default_timer()
+
+            scsa.generate_packed_codes(board_length, num_colors, num_codes)
+
+            packed_time = timeit.default_timer() - start
+
+            start = timeit.default_timer()
+
+            scsa.generate_codes_array(board_length, num_colors, num_codes, rng)
+
+            array_time = timeit.default_timer() - start
+
+            print(
+                "{:<20} {:>2}x{:<4} {:>15.0f}  {:>14.0f}  {:>6.1f}x".format(
+                    scsa_name,
+                    board_length,
+                    num_colors,
+                    num_codes / packed_time,
+                    num_codes / array_time,
+                    packed_time / array_time,
+                )
+            )
+
+    return
+
+
+def bench_players(num_rounds: int = 200, seed: int = 0) -> None:
+    """Compares Endgame, Endgame_Beta and InfoGain on the same secret codes and the same random streams
+
+    Args:
+        num_rounds (int, optional): Number of rounds per board. Defaults to 200.
+        seed (int, optional): Seed of every tournament (see randomness.py). Defaults to 0.
+    """
+
+    scsa = InsertColors()
+
+    print("board   player    wins  mean guesses  time(s)")
+
+    for board_length, num_colors in BOARDS[:4]:
+
+        for player_name in ["Endgame", "Beta", "InfoGain"]:
+
+            mastermind = Mastermind(board_length, make_colors(num_colors), tournament_time_cutoff=float("inf"))
+
+            start = timeit.default_timer()
+
+            results = mastermind.play_tournament(str_to_player(player_name), scsa, num_rounds, seed=seed, verbose=False)
+
+            elapsed = timeit.default_timer() - start
+
+            print(
+                "{:>2}x{:<4} {:<8} {:>5}  {:>12.2f}  {:>7.3f}".format(
+                    board_length,
+                    num_colors,
+                    player_name,
+                    results.get_number_of_wins(),
+                    results.get_mean_guesses(),
+                    elapsed,
+                )
+            )
+
+    return
+
+
+SUITES = {
+    "feedback": bench_feedback,
+    "bitmask": bench_bitmask,
+    "batch": bench_batch,
+    "codes": bench_codes,
+    "players": bench_players,
+}
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmark the Mastermind scoring engine.")
+    parser.add_argument("--suite", nargs="?", type=str, default="feedback", choices=list(SUITES))
+    parser.add_argument("--seed", nargs="?", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    SUITES[args.suite]()
@@ -0,0 +1,103 @@
+# File contains checkpoints of tournaments, so an interrupted tournament can be resumed where it stopped.
+# See mastermind.py (Mastermind.play_tournament) and main.py (--checkpoint, --resume) for example usages.
+
+import os
+import pickle
+
+
+class Checkpoint:
+    """Snapshot of a tournament saved to a small file every few rounds
+
+    A snapshot holds the index of the last recorded round, the results so far, the time used by the tournament, its
+    seed and the size of its record sink. Players start over every round and every random choice comes from the
+    seed (see randomness.py), so a tournament resumed from a snapshot ends with the same results as one that was
+    never interrupted.
+    """
+
+    def __init__(self, file_name: str, every: int = 1000, resume: bool = False):
+        """Constructor for Checkpoint
+
+        Args:
+            file_name (str): Name of file snapshots are saved to.
+            every (int, optional): Number of rounds between snapshots. Defaults to 1000.
+            resume (bool, optional): Loads the snapshot in file_name, if it exists, to resume from. Defaults to False.
+        """
+
+        self.file_name = file_name
+        self.every = every
+        self.state = None  # Snapshot to resume from
+
+        if resume and os.path.exists(file_name):
+
+            file = open(file_name, "rb")
+            self.state = pickle.load(file)
+            file.close()
+
+    def sink_offset(self) -> int:
+        """Size of the record sink when the snapshot to resume from was saved (None if there is none)."""
+
+        return self.state["sink_offset"] if self.state is not None else None
+
+    def resume(self, key: tuple) -> dict:
+        """Snapshot to resume a tournament from
+
+        Args:
+            key (tuple): Identifies the tournament (game, player, SCSA, number of rounds and seed).
+
+        Raises:
+            ValueError: Raised if the snapshot was saved by another tournament.
+
+        Returns:
+            dict: Returns snapshot, None if there is nothing to resume.
+        """
+
+        if self.state is None:
+
+            return None
+
+        if self.state["key"] != key:
+
+            raise ValueError("Checkpoint " + self.file_name + " was saved by another tournament.")
+
+        return self.state
+
+    def update(
+        self, key: tuple, round_index: int, results, time_used: float, seed: int, sink, finished: bool
+    ) -> None:
+        """Saves a snapshot after recording a round, every few rounds and once the tournament is finished
+
+        Args:
+            key (tuple): Identifies the tournament, see resume.
+            round_index (int): Index of the round just recorded.
+            results (Results): Results of the tournament so far.
+            time_used (float): Time used by the tournament so far in seconds.
+            seed (int): Seed of the tournament.
+            sink (RecordSink): Sink of the tournament, or None.
+            finished (bool): Whether the tournament is over after this round.
+        """
+
+        if not finished and round_index % self.every != 0:
+
+            return
+
+        self.state = {
+            "key": key,
+            "round_index": round_index,
+            "results": results,
+            "time_used": time_used,
+            "seed": seed,
+            "sink_offset": sink.tell() if sink is not None else None,
+            "finished": finished,
+        }
+
+        # Written next to the previous snapshot and swapped in, so a crash never leaves a partial file.
+        tmp_name = self.file_name + ".tmp"
+        file = open(tmp_name, "wb")
+        pickle.dump(self.state, file)
+        file.flush()
+        os.fsync(file.fileno())
+        file.close()
+
+        os.replace(tmp_name, self.file_name)
+
+        return
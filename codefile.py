@@ -0,0 +1,197 @@
+# File contains a packed binary format for files of secret codes, read through a memory map.
+# See mastermind.py (Mastermind.practice_tournament) for example usages.
+# Example (converts every mystery file to mystery/*.codes):
+#   python3 codefile.py mystery/*.txt
+#
+# Format: HEADER_FORMAT (CODE_FILE_MAGIC, board_length, num_colors, SCSA name, number of codes), then the packed
+# codes (see codes.py) back to back, board_length bytes each, so code i is read at a fixed offset.
+
+import argparse
+import mmap
+import os
+import re
+import struct
+import numpy as np
+from gamespec import GameSpec
+
+
+CODE_FILE_MAGIC = b"MMCF"
+
+HEADER_FORMAT = "<4sHH32sQ"
+
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+
+def is_code_file(file_name: str) -> bool:
+    """Whether a file is a packed code file (checked by its magic, so text files of any name are told apart)."""
+
+    file = open(file_name, "rb")
+    magic = file.read(len(CODE_FILE_MAGIC))
+    file.close()
+
+    return magic == CODE_FILE_MAGIC
+
+
+def write_code_file(file_name: str, codes, spec: GameSpec, scsa_name: str = "") -> int:
+    """Writes codes to a packed code file, one code at a time
+
+    Args:
+        file_name (str): Name of file to write, truncated if it exists.
+        codes (iterable): Codes of spec.board_length pegs, as strings or as packed codes.
+        spec (GameSpec): Specification of the game the codes belong to.
+        scsa_name (str, optional): Name of SCSA that generated the codes. Defaults to "" (unknown).
+
+    Raises:
+        ValueError: Raised if a code does not have spec.board_length pegs or uses colors outside the game.
+
+    Returns:
+        int: Returns number of codes written.
+    """
+
+    count = 0
+
+    with open(file_name, "wb") as file:
+
+        file.write(bytes(HEADER_SIZE))  # Header is written once the codes are counted
+
+        for code in codes:
+
+            code = spec.pack(code)
+
+            if not spec.valid(code):
+
+                raise ValueError("Code " + repr(spec.unpack(code)) + " is not a code of this game.")
+
+            file.write(code)
+            count += 1
+
+        file.seek(0)
+        file.write(
+            struct.pack(
+                HEADER_FORMAT, CODE_FILE_MAGIC, spec.board_length, spec.num_colors, scsa_name.encode(), count
+            )
+        )
+
+    return count
+
+
+def convert_text_file(text_name: str, file_name: str, spec: GameSpec, scsa_name: str = "") -> int:
+    """Converts a text file of codes (one per line, see scsa.read_from_file) to a packed code file
+
+    Args:
+        text_name (str): Name of text file to read, a line at a time (blank lines are skipped).
+        file_name (str): Name of packed code file to write.
+        spec (GameSpec): Specification of the game the codes belong to.
+        scsa_name (str, optional): Name of SCSA that generated the codes. Defaults to "" (unknown).
+
+    Returns:
+        int: Returns number of codes converted.
+    """
+
+    with open(text_name, "r") as text:
+
+        return write_code_file(file_name, (line.strip() for line in text if line.strip()), spec, scsa_name)
+
+
+class BinaryCodes:
+    """Codes of a packed code file, memory-mapped and read by index in O(1)"""
+
+    def __init__(self, file_name: str):
+        """Constructor for BinaryCodes
+
+        Args:
+            file_name (str): Name of file written by write_code_file.
+
+        Raises:
+            ValueError: Raised if the file is not a packed code file or is shorter than its header says.
+        """
+
+        self.file_name = file_name
+        file = open(file_name, "rb")
+        header = file.read(HEADER_SIZE)
+
+        if len(header) < HEADER_SIZE or header[: len(CODE_FILE_MAGIC)] != CODE_FILE_MAGIC:
+
+            file.close()
+
+            raise ValueError(file_name + " is not a packed code file.")
+
+        _, self.board_length, self.num_colors, scsa_name, self.count = struct.unpack(HEADER_FORMAT, header)
+        self.scsa_name = scsa_name.rstrip(b"\0").decode()
+
+        if file.seek(0, 2) < HEADER_SIZE + self.count * self.board_length:
+
+            file.close()
+
+            raise ValueError(file_name + " holds fewer codes than its header says.")
+
+        self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        file.close()
+
+    def __reduce__(self):
+        """Pickles the codes as the name of their file, so worker processes map it instead of copying it."""
+
+        return (BinaryCodes, (self.file_name,))
+
+    def __len__(self) -> int:
+
+        return self.count
+
+    def __getitem__(self, idx: int) -> bytes:
+        """Packed code at index idx."""
+
+        if idx < 0:
+
+            idx += self.count
+
+        if not 0 <= idx < self.count:
+
+            raise IndexError("Code index out of range.")
+
+        start = HEADER_SIZE + idx * self.board_length
+
+        return self.map[start : start + self.board_length]
+
+    def __iter__(self):
+
+        return (self[idx] for idx in range(self.count))
+
+    def array(self) -> np.ndarray:
+        """(count, board_length) uint8 view of the codes, without reading them (see feedback.py)."""
+
+        codes = np.frombuffer(self.map, dtype=np.uint8, count=self.count * self.board_length, offset=HEADER_SIZE)
+
+        return codes.reshape(self.count, self.board_length)
+
+
+if __name__ == "__main__":
+
+    from registry import make_colors
+
+    parser = argparse.ArgumentParser(description="Convert text files of codes to packed code files.")
+    parser.add_argument("files", nargs="+", type=str, help="text files of codes, e.g. mystery/mystery1_7_5.txt")
+    parser.add_argument(
+        "--num_colors", nargs="?", type=int, default=None, help="number of colors (default: from NAME_L_C.txt names)"
+    )
+    parser.add_argument("--scsa_name", nargs="?", type=str, default="", help="SCSA that generated the codes")
+    args = parser.parse_args()
+
+    for text_name in args.files:
+
+        # Lengths are read from the first code, numbers of colors from names like mystery1_7_5.txt
+        with open(text_name, "r") as text:
+
+            first = next((line.strip() for line in text if line.strip()), "")
+
+        match = re.search(r"_(\d+)_(\d+)\.txt$", text_name)
+        num_colors = args.num_colors or (int(match.group(2)) if match else None)
+
+        if num_colors is None:
+
+            parser.error("--num_colors is required for " + text_name)
+
+        spec = GameSpec(len(first), make_colors(num_colors))
+        file_name = os.path.splitext(text_name)[0] + ".codes"
+        count = convert_text_file(text_name, file_name, spec, args.scsa_name)
+
+        print(text_name, "->", file_name, "(" + str(count), "codes,", os.path.getsize(file_name), "bytes)")
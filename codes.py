@@ -0,0 +1,111 @@
+# File contains the compact representation of codes used by the Mastermind engine.
+# A packed code is a bytes object holding the index (in the list of colors) of the color of each peg,
+# e.g. "BAD" with colors ["A", "B", "C", "D"] is packed as b"\x01\x00\x03".
+# Strings remain the public representation, pack and unpack convert between the two at C speed.
+
+from functools import lru_cache
+
+
+INVALID = 255  # Packed value of a peg whose color is not one of the colors.
+
+
+@lru_cache(maxsize=None)
+def pack_table(colors: tuple) -> bytes:
+    """Translation table mapping the character code of every color to its index
+
+    Args:
+        colors (tuple[str]): All possible colors that can be used to generate a code.
+
+    Returns:
+        bytes: Returns 256 byte table, characters that are not colors map to INVALID.
+    """
+
+    table = bytearray([INVALID]) * 256
+
+    for idx, color in enumerate(colors):
+
+        table[ord(color)] = idx
+
+    return bytes(table)
+
+
+@lru_cache(maxsize=None)
+def unpack_table(colors: tuple) -> bytes:
+    """Translation table mapping the index of every color to its character code
+
+    Args:
+        colors (tuple[str]): All possible colors that can be used to generate a code.
+
+    Returns:
+        bytes: Returns 256 byte table, indices that are not colors map to "?".
+    """
+
+    table = bytearray(b"?") * 256
+
+    for idx, color in enumerate(colors):
+
+        table[idx] = ord(color)
+
+    return bytes(table)
+
+
+def pack(code, colors) -> bytes:
+    """Converts a code to its packed representation
+
+    Args:
+        code (str or bytes): Code to convert, packed codes are returned unchanged.
+        colors (list[str]): All possible colors that can be used to generate a code.
+
+    Returns:
+        bytes: Returns packed code, pegs that are not one of the colors are packed as INVALID.
+    """
+
+    if isinstance(code, bytes):
+
+        return code
+
+    try:
+
+        raw = code.encode("latin-1")
+
+    except (UnicodeEncodeError, AttributeError):
+
+        return bytes([INVALID]) * len(code)
+
+    return raw.translate(pack_table(tuple(colors)))
+
+
+def unpack(code, colors) -> str:
+    """Converts a packed code to its string representation
+
+    Args:
+        code (bytes or str): Packed code to convert, strings are returned unchanged.
+        colors (list[str]): All possible colors that can be used to generate a code.
+
+    Returns:
+        str: Returns code as a string of colors.
+    """
+
+    if isinstance(code, str):
+
+        return code
+
+    return code.translate(unpack_table(tuple(colors))).decode("latin-1")
+
+
+def swap(code: bytes, i: int, j: int) -> bytes:
+    """Swaps two pegs of a packed code
+
+    Args:
+        code (bytes): Packed code.
+        i (int): Position of first peg.
+        j (int): Position of second peg.
+
+    Returns:
+        bytes: Returns new packed code with pegs i and j swapped.
+    """
+
+    buf = bytearray(code)
+    buf[i], buf[j] = buf[j], buf[i]
+
+    return bytes(buf)
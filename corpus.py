@@ -0,0 +1,130 @@
+# File contains a corpus of secret codes kept in shared memory, so processes playing the same codes share one copy.
+# See mastermind.py (Mastermind.practice_tournament) for example usages.
+
+from multiprocessing import shared_memory
+import numpy as np
+from gamespec import GameSpec
+from scsa import read_from_file
+from codefile import BinaryCodes, is_code_file
+
+
+class CodeCorpus:
+    """Packed codes (see codes.py) of the same length stored back to back in one shared memory block
+
+    The process creating the corpus owns the block. Pickling a corpus only sends the name of its block, so worker
+    processes attach to it (once per process) and read codes by index instead of receiving their own copy.
+    """
+
+    __attached = {}  # Name of block -> corpus attached by this process
+
+    def __init__(self, block: shared_memory.SharedMemory, length: int, count: int, owner: bool):
+        """Constructor for CodeCorpus, see CodeCorpus.create and CodeCorpus.attach
+
+        Args:
+            block (shared_memory.SharedMemory): Block holding the codes.
+            length (int): Number of pegs of every code.
+            count (int): Number of codes.
+            owner (bool): Whether the block was created by this corpus, and is unlinked when it is closed.
+        """
+
+        self.block = block
+        self.length = length
+        self.count = count
+        self.owner = owner
+
+    @classmethod
+    def create(cls, codes, spec: GameSpec):
+        """Copies codes into a new shared memory block
+
+        Args:
+            codes (list[str] or list[bytes]): Codes of spec.board_length pegs, as strings or as packed codes.
+            spec (GameSpec): Specification of the game the codes belong to.
+
+        Raises:
+            ValueError: Raised if a code does not have spec.board_length pegs or uses colors outside the game.
+
+        Returns:
+            CodeCorpus: Returns corpus owning the new block.
+        """
+
+        packed = [spec.pack(code) for code in codes]
+
+        for code in packed:
+
+            if not spec.valid(code):
+
+                raise ValueError("Code " + repr(spec.unpack(code)) + " is not a code of this game.")
+
+        length = spec.board_length
+        block = shared_memory.SharedMemory(create=True, size=max(1, length * len(packed)))
+        block.buf[: length * len(packed)] = b"".join(packed)
+
+        return cls(block, length, len(packed), True)
+
+    @classmethod
+    def from_file(cls, file_name: str, spec: GameSpec):
+        """Copies the codes of a file (packed, see codefile.py, or one code per line) into a new shared memory block."""
+
+        if is_code_file(file_name):
+
+            return cls.create(BinaryCodes(file_name), spec)
+
+        return cls.create(read_from_file(file_name), spec)
+
+    @classmethod
+    def attach(cls, name: str, length: int, count: int):
+        """Attaches to the block of a corpus created by another process."""
+
+        if name not in cls.__attached:
+
+            cls.__attached[name] = cls(shared_memory.SharedMemory(name=name), length, count, False)
+
+        return cls.__attached[name]
+
+    def __reduce__(self):
+        """Pickles the corpus as the name of its block, so worker processes attach to it instead of copying it."""
+
+        return (CodeCorpus.attach, (self.block.name, self.length, self.count))
+
+    def __len__(self) -> int:
+
+        return self.count
+
+    def __getitem__(self, idx: int) -> bytes:
+        """Packed code at index idx."""
+
+        if idx < 0:
+
+            idx += self.count
+
+        if not 0 <= idx < self.count:
+
+            raise IndexError("Code index out of range.")
+
+        return bytes(self.block.buf[idx * self.length : (idx + 1) * self.length])
+
+    def __iter__(self):
+
+        return (self[idx] for idx in range(self.count))
+
+    def array(self) -> np.ndarray:
+        """(count, length) uint8 view of the codes, without copying them (see feedback.py)."""
+
+        return np.ndarray((self.count, self.length), dtype=np.uint8, buffer=self.block.buf)
+
+    def close(self) -> None:
+        """Detaches from the block, and frees it if this corpus created it."""
+
+        self.block.close()
+
+        if self.owner:
+
+            self.block.unlink()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc) -> None:
+
+        self.close()
@@ -0,0 +1,536 @@
+# File contains a vectorized feedback engine for scoring many guesses against many answers at once.
+# See mastermind.py (Round.process_guesses) or benchmark.py for example usages.
+
+import os
+from functools import lru_cache
+from operator import eq
+import numpy as np
+from codes import INVALID
+from gamespec import GameSpec
+
+
+# Upper bound on the number of elements in any temporary array built while scoring a chunk of guesses.
+CHUNK_ELEMENTS = 1 << 24
+
+# Largest guess x answer table (in entries) FeedbackTable is allowed to build.
+MAX_TABLE_ENTRIES = 1 << 30
+
+# Directory where feedback tables are cached, can be overriden with the MASTERMIND_TABLE_DIR environment variable.
+TABLE_DIR = os.environ.get(
+    "MASTERMIND_TABLE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".feedback_tables"),
+)
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+PACKED_DIGITS = bytes(ord(DIGITS[idx % len(DIGITS)]) for idx in range(256))  # Color index -> digit
+
+
+def codes_to_array(codes, colors) -> np.ndarray:
+    """Converts codes to an array of color indices
+
+    Args:
+        codes (list[str] or list[bytes]): Codes to convert, as strings (or sequences of colors) or as packed codes,
+                                          all of the same length.
+        colors (list[str] or list[int]): All possible colors that can be used to generate a code.
+
+    Raises:
+        ValueError: Raised if a code that is not packed uses a peg that is not one of the colors.
+
+    Returns:
+        np.ndarray: Returns (number of codes, code length) uint8 array where each peg is replaced by the
+                    index of its color in colors.
+    """
+
+    if isinstance(codes, np.ndarray):
+
+        return codes.astype(np.uint8, copy=False)
+
+    if isinstance(codes, (str, bytes)):
+
+        codes = [codes]
+
+    if codes and isinstance(codes[0], bytes):
+
+        return np.frombuffer(b"".join(codes), dtype=np.uint8).reshape(len(codes), len(codes[0]))
+
+    # Only packs codes, the number of pegs of the spec is not used
+    spec = GameSpec.of(0, tuple(colors))
+    packed = [spec.pack(code) for code in codes]
+
+    if any(INVALID in code for code in packed):
+
+        raise ValueError("Codes must only use the colors given.")
+
+    return codes_to_array(packed, colors) if packed else np.zeros((0, 0), dtype=np.uint8)
+
+
+def array_to_codes(array: np.ndarray, colors) -> list:
+    """Converts an array of color indices back to codes
+
+    Args:
+        array (np.ndarray): (number of codes, code length) array of color indices.
+        colors (list[str]): All possible colors that can be used to generate a code.
+
+    Returns:
+        list[str]: Returns codes represented by the rows of array.
+    """
+
+    lookup = np.array([ord(color) for color in colors], dtype=np.uint8)
+
+    return [row.tobytes().decode("latin-1") for row in lookup[array]]
+
+
+def color_histograms(codes: np.ndarray, num_colors: int) -> np.ndarray:
+    """Counts number of occurences for each color in every code
+
+    Args:
+        codes (np.ndarray): (number of codes, code length) array of color indices.
+        num_colors (int): Number of possible colors.
+
+    Returns:
+        np.ndarray: Returns (number of codes, num_colors) array of color counts, pegs that are not one of the
+                    colors (e.g. INVALID) are not counted, as in Round.process_guess.
+    """
+
+    num_codes = codes.shape[0]
+    width = num_colors + 1  # One more bin per code collects the pegs that are not one of the colors
+    pegs = np.minimum(codes.astype(np.int64), num_colors)
+    offsets = pegs + (np.arange(num_codes, dtype=np.int64) * width)[:, None]
+
+    counts = np.bincount(offsets.ravel(), minlength=num_codes * width)
+
+    return counts.reshape(num_codes, width)[:, :num_colors]
+
+
+def batch_feedback(guesses: np.ndarray, answers: np.ndarray, num_colors: int):
+    """Determines number of exactly correct pegs and partially correct pegs for every guess against every answer
+
+    Scoring follows the same rules as Round.process_guess.
+
+    Args:
+        guesses (np.ndarray): (number of guesses, code length) array of color indices.
+        answers (np.ndarray): (number of answers, code length) array of color indices.
+        num_colors (int): Number of possible colors.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (number of guesses, number of answers) matrices of
+                                       (pegs that match exactly with the answer,
+                                       pegs that are the right color, but in the wrong location).
+    """
+
+    guesses = np.atleast_2d(guesses)
+    answers = np.atleast_2d(answers)
+
+    num_guesses, length = guesses.shape
+    num_answers = answers.shape[0]
+    dtype = np.min_scalar_type(length)
+
+    exact = np.empty((num_guesses, num_answers), dtype=dtype)
+    other = np.empty((num_guesses, num_answers), dtype=dtype)
+
+    guess_counts = color_histograms(guesses, num_colors)
+    answer_counts = color_histograms(answers, num_colors)
+
+    # Score a few guesses at a time so the broadcast temporaries stay bounded.
+    chunk = max(1, CHUNK_ELEMENTS // max(1, num_answers * max(length, num_colors)))
+
+    for lo in range(0, num_guesses, chunk):
+
+        hi = min(lo + chunk, num_guesses)
+
+        matches = (guesses[lo:hi, None, :] == answers[None, :, :]).sum(axis=2)
+        common = np.minimum(guess_counts[lo:hi, None, :], answer_counts[None, :, :]).sum(axis=2)
+
+        exact[lo:hi] = matches
+        other[lo:hi] = common - matches
+
+    return (exact, other)
+
+
+def paired_feedback(guesses: np.ndarray, answers: np.ndarray, num_colors: int):
+    """Determines number of exactly correct pegs and partially correct pegs for every guess against its own answer
+
+    Scoring follows the same rules as Round.process_guess.
+
+    Args:
+        guesses (np.ndarray): (number of rounds, code length) array of color indices.
+        answers (np.ndarray): (number of rounds, code length) array of color indices, row i answers guess i.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (pegs that match exactly with the answer,
+                                       pegs that are the right color, but in the wrong location) of every round.
+    """
+
+    exact = (guesses == answers).sum(axis=1)
+    common = np.minimum(color_histograms(guesses, num_colors), color_histograms(answers, num_colors)).sum(axis=1)
+
+    return (exact, common - exact)
+
+
+@lru_cache(maxsize=None)
+def digit_table(colors: tuple) -> dict:
+    """Translation table mapping every color to its digit in base len(colors)."""
+
+    return str.maketrans(dict(zip(colors, DIGITS)))
+
+
+def code_rank(code: str, colors) -> int:
+    """Computes the position of a code in lexicographic order of all codes (i.e. its base len(colors) value)
+
+    Args:
+        code (str or bytes): Code to rank, as a string or as a packed code.
+        colors (list[str]): All possible colors that can be used to generate a code.
+
+    Returns:
+        int: Returns rank of code, the first peg being the most significant digit.
+    """
+
+    num_colors = len(colors)
+
+    if num_colors <= len(DIGITS) and num_colors > 1:
+
+        if isinstance(code, bytes):
+
+            return int(code.translate(PACKED_DIGITS), num_colors)
+
+        return int(code.translate(digit_table(tuple(colors))), num_colors)
+
+    index = {color: idx for idx, color in enumerate(colors)}
+    rank = 0
+
+    for peg in code:
+
+        rank = rank * num_colors + (peg if isinstance(peg, int) else index[peg])
+
+    return rank
+
+
+def array_ranks(codes: np.ndarray, num_colors: int) -> np.ndarray:
+    """Computes ranks of codes given as an array of color indices
+
+    Args:
+        codes (np.ndarray): (number of codes, code length) array of color indices.
+        num_colors (int): Number of possible colors.
+
+    Returns:
+        np.ndarray: Returns rank of every code.
+    """
+
+    length = codes.shape[1]
+    powers = num_colors ** np.arange(length - 1, -1, -1, dtype=np.int64)
+
+    return codes.astype(np.int64) @ powers
+
+
+def all_codes(board_length: int, num_colors: int) -> np.ndarray:
+    """Enumerates every code in rank order
+
+    Args:
+        board_length (int): Number of pegs.
+        num_colors (int): Number of possible colors.
+
+    Returns:
+        np.ndarray: Returns (num_colors ** board_length, board_length) uint8 array of color indices.
+    """
+
+    ranks = np.arange(num_colors**board_length, dtype=np.int64)
+    codes = np.empty((ranks.size, board_length), dtype=np.uint8)
+
+    for i in range(board_length - 1, -1, -1):
+
+        ranks, codes[:, i] = np.divmod(ranks, num_colors)
+
+    return codes
+
+
+def pack_response(exact, other, board_length: int):
+    """Packs (exact, other) into a single integer exact * (board_length + 1) + other."""
+
+    return exact * (board_length + 1) + other
+
+
+def unpack_response(packed, board_length: int):
+    """Unpacks an integer created by pack_response into (exact, other)."""
+
+    return divmod(packed, board_length + 1)
+
+
+class FeedbackTable:
+    """Precomputed packed responses of every guess against every answer for a small game
+
+    The table lives in a memory-mapped .npy file keyed by (board_length, num_colors), so it is built once
+    and shared by every process that loads it.
+    """
+
+    __loaded: dict = {}  # Tables already mapped by this process, keyed by (board_length, num_colors, directory).
+
+    def __init__(self, board_length: int, num_colors: int, table: np.ndarray, directory: str = None):
+        """Constructor for FeedbackTable
+
+        Args:
+            board_length (int): Number of pegs.
+            num_colors (int): Number of possible colors.
+            table (np.ndarray): (num_colors ** board_length, num_colors ** board_length) packed responses.
+            directory (str, optional): Directory of the cached table. Defaults to None (TABLE_DIR).
+        """
+
+        self.board_length = board_length
+        self.num_colors = num_colors
+        self.table = table
+        self.directory = directory
+
+    def __reduce__(self):
+        """Pickles the table as a reference to its cached file, so worker processes map it instead of copying it."""
+
+        return (FeedbackTable.load, (self.board_length, self.num_colors, self.directory))
+
+    @staticmethod
+    def fits(board_length: int, num_colors: int, max_entries: int = MAX_TABLE_ENTRIES) -> bool:
+        """Checks whether a table for the game is small enough to be built."""
+
+        return (num_colors**board_length) ** 2 <= max_entries
+
+    @staticmethod
+    def path(board_length: int, num_colors: int, directory: str = None) -> str:
+        """Name of the file caching the table for a game."""
+
+        return os.path.join(
+            directory or TABLE_DIR,
+            "feedback_" + str(board_length) + "_" + str(num_colors) + ".npy",
+        )
+
+    @classmethod
+    def build(cls, board_length: int, num_colors: int, file_name: str) -> None:
+        """Builds the table for a game and writes it to file_name
+
+        Args:
+            board_length (int): Number of pegs.
+            num_colors (int): Number of possible colors.
+            file_name (str): Name of file to write the table to.
+        """
+
+        codes = all_codes(board_length, num_colors)
+        num_codes = codes.shape[0]
+        dtype = np.uint8 if (board_length + 1) ** 2 <= 256 else np.uint16
+
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+
+        # Write to a temporary file first so other processes never map a partially built table.
+        tmp_name = file_name + "." + str(os.getpid()) + ".tmp"
+        table = np.lib.format.open_memmap(tmp_name, mode="w+", dtype=dtype, shape=(num_codes, num_codes))
+
+        chunk = max(1, CHUNK_ELEMENTS // (num_codes * max(board_length, num_colors)))
+
+        for lo in range(0, num_codes, chunk):
+
+            hi = min(lo + chunk, num_codes)
+            exact, other = batch_feedback(codes[lo:hi], codes, num_colors)
+            table[lo:hi] = pack_response(exact.astype(dtype), other.astype(dtype), board_length)
+
+        table.flush()
+        del table
+
+        os.replace(tmp_name, file_name)
+
+        return
+
+    @classmethod
+    def load(
+        cls,
+        board_length: int,
+        num_colors: int,
+        directory: str = None,
+        max_entries: int = MAX_TABLE_ENTRIES,
+    ):
+        """Loads the table for a game, building and caching it on disk first if needed
+
+        Args:
+            board_length (int): Number of pegs.
+            num_colors (int): Number of possible colors.
+            directory (str, optional): Directory of cached tables. Defaults to TABLE_DIR.
+            max_entries (int, optional): Largest table allowed. Defaults to MAX_TABLE_ENTRIES.
+
+        Returns:
+            FeedbackTable: Returns table, or None if the game is too large for a table.
+        """
+
+        key = (board_length, num_colors, directory)
+
+        if key in cls.__loaded:
+
+            return cls.__loaded[key]
+
+        if not cls.fits(board_length, num_colors, max_entries):
+
+            return None
+
+        file_name = cls.path(board_length, num_colors, directory)
+
+        if not os.path.exists(file_name):
+
+            cls.build(board_length, num_colors, file_name)
+
+        table = cls(board_length, num_colors, np.load(file_name, mmap_mode="r"), directory)
+        cls.__loaded[key] = table
+
+        return table
+
+    def lookup(self, guess_ranks, answer_ranks):
+        """Looks up packed responses of guesses against answers (elementwise, with NumPy broadcasting)."""
+
+        return self.table[guess_ranks, answer_ranks]
+
+    def feedback(self, guess_rank: int, answer_rank: int):
+        """Looks up (exact, other) for a single guess against a single answer."""
+
+        return unpack_response(int(self.table[guess_rank, answer_rank]), self.board_length)
+
+
+@lru_cache(maxsize=None)
+def lane_masks(length: int) -> tuple:
+    """Masks repeating 0x0F, 0x33, 0x55 and 0x01 in each of the length bytes of an int."""
+
+    return tuple(int.from_bytes(bytes([byte]) * length, "little") for byte in (0x0F, 0x33, 0x55, 0x01))
+
+
+class AnswerProfile:
+    """Bitmasks and histogram of a packed answer, computed once per round
+
+    The answer is kept as an int with one byte lane per peg, i.e. the per-color position masks of every color
+    interleaved in a single int. XOR with a packed guess leaves a zero lane exactly where the colors match,
+    so the exact matches are the popcount of the folded zero-lane mask, which takes a few big-int operations
+    instead of a Python loop over the pegs. Other is taken from the minimums of the color histograms.
+    """
+
+    def __init__(self, answer: bytes):
+        """Constructor for AnswerProfile
+
+        Args:
+            answer (bytes): Packed answer (see codes.py).
+        """
+
+        self.length = len(answer)
+        self.lanes = int.from_bytes(answer, "little")
+        self.colors = bytes(sorted(set(answer)))  # Colors used in the answer
+        self.counts = [answer.count(color) for color in self.colors]
+
+    def feedback(self, guess: bytes):
+        """Determines number of exactly correct pegs and partially correct pegs for a packed guess
+
+        Args:
+            guess (bytes): Packed guess of secret code, of the same length as the answer.
+
+        Returns:
+            tuple[int,int]: (number of pegs that match exactly with the answer,
+                            number of pegs that are the right color, but in the wrong location)
+        """
+
+        mask_0f, mask_33, mask_55, mask_01 = lane_masks(self.length)
+
+        # Fold every lane onto its lowest bit, which is then set only for pegs that differ.
+        diff = int.from_bytes(guess, "little") ^ self.lanes
+        diff |= (diff >> 4) & mask_0f
+        diff |= (diff >> 2) & mask_33
+        diff |= (diff >> 1) & mask_55
+
+        exact = self.length - (diff & mask_01).bit_count()
+
+        # Colors not used in the answer can not contribute.
+        common = sum(map(min, map(guess.count, self.colors), self.counts))
+
+        return (exact, common - exact)
+
+
+class IncrementalScorer:
+    """Keeps the response of a reference guess against an answer to score small changes of that guess
+
+    Scoring a guess that differs from the reference in k pegs takes O(k) instead of O(pegs + colors).
+    """
+
+    def __init__(self, answer: bytes, guess: bytes, num_colors: int):
+        """Constructor for IncrementalScorer
+
+        Args:
+            answer (bytes): Packed answer (see codes.py).
+            guess (bytes): Packed reference guess, of the same length as the answer.
+            num_colors (int): Number of possible colors.
+        """
+
+        self.answer = answer
+        self.guess = bytearray(guess)
+        self.answer_counts = [answer.count(color) for color in range(num_colors)]
+        self.guess_counts = [guess.count(color) for color in range(num_colors)]
+        self.exact = sum(map(eq, guess, answer))
+        self.common = sum(map(min, self.guess_counts, self.answer_counts))  # Exact and other together
+
+    def response(self):
+        """Response (exact, other) of the reference guess."""
+
+        return (self.exact, self.common - self.exact)
+
+    def score(self, changes, commit: bool = False):
+        """Determines the response of the reference guess with some pegs changed
+
+        Args:
+            changes (iterable[tuple[int, int]]): (position, new color) of every changed peg, a position may repeat,
+                                                 the last change wins.
+            commit (bool, optional): Makes the changed guess the new reference. Defaults to False.
+
+        Returns:
+            tuple[int,int]: (number of pegs that match exactly with the answer,
+                            number of pegs that are the right color, but in the wrong location)
+        """
+
+        exact = self.exact
+        common = self.common
+        pegs = {}  # Changed pegs so far, position -> color
+        counts = {}  # Changed guess color counts so far, color -> count
+
+        for position, color in changes:
+
+            old = pegs.get(position, self.guess[position])
+
+            if old == color:
+
+                continue
+
+            pegs[position] = color
+            correct = self.answer[position]
+            exact += (color == correct) - (old == correct)
+
+            # A removed peg was matched iff the guess did not have more of its color than the answer.
+            old_count = counts.get(old, self.guess_counts[old])
+
+            if old_count <= self.answer_counts[old]:
+
+                common -= 1
+
+            counts[old] = old_count - 1
+
+            new_count = counts.get(color, self.guess_counts[color])
+
+            if new_count < self.answer_counts[color]:
+
+                common += 1
+
+            counts[color] = new_count + 1
+
+        if commit:
+
+            for position, color in pegs.items():
+
+                self.guess[position] = color
+
+            for color, count in counts.items():
+
+                self.guess_counts[color] = count
+
+            self.exact = exact
+            self.common = common
+
+        return (exact, common - exact)
+
+    def swap(self, i: int, j: int, commit: bool = False):
+        """Determines the response of the reference guess with pegs i and j swapped."""
+
+        return self.score(((i, self.guess[j]), (j, self.guess[i])), commit)
@@ -0,0 +1,154 @@
+# File contains the specification of a game of Mastermind, compiled once per tournament.
+# See mastermind.py for example usages.
+
+from functools import lru_cache
+from codes import INVALID, pack_table, unpack_table
+
+
+class GameSpec:
+    """Compiled specification of a game: number of pegs, colors and scoring constants
+
+    Colors (tokens) can be single characters (e.g. "A"), fixed width strings (e.g. "A1") or integers, up to
+    INVALID (255) of them. Codes are converted to packed codes (see codes.py) by precomputed tables, so checking
+    that a guess is valid is a single C-level pass over it.
+    """
+
+    def __init__(self, board_length: int, colors):
+        """Constructor for GameSpec
+
+        Args:
+            board_length (int): Number of pegs.
+            colors (list[str] or list[int]): All possible colors that can be used to generate a code.
+
+        Raises:
+            ValueError: Raised if there are too many colors, duplicates, or string colors of different widths.
+        """
+
+        colors = tuple(colors)
+
+        if len(colors) >= INVALID:
+
+            raise ValueError("At most " + str(INVALID - 1) + " colors are supported.")
+
+        if len(set(colors)) != len(colors):
+
+            raise ValueError("Colors must be unique.")
+
+        self.board_length = board_length
+        self.colors = colors
+        self.num_colors = len(colors)
+        self.index = {color: idx for idx, color in enumerate(colors)}  # Color -> packed value
+        self.indices = bytes(range(self.num_colors))  # Every valid packed value
+
+        # Scoring constant of a tournament: a win scores score_scale * (5 * guesses ** (-0.5)),
+        # a failure costs 2 * score_scale.
+        self.score_scale = board_length * self.num_colors
+
+        self.integer_tokens = all(isinstance(color, int) for color in colors)
+        self.token_width = 0
+
+        if not self.integer_tokens:
+
+            widths = set(len(str(color)) for color in colors)
+
+            if len(widths) > 1:
+
+                raise ValueError("String colors must all have the same width.")
+
+            self.token_width = widths.pop() if widths else 1
+
+        self.single_char = self.token_width == 1 and all(ord(color) < 256 for color in colors)
+
+        if self.single_char:
+
+            self.pack_table = pack_table(colors)
+            self.unpack_table = unpack_table(colors)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def of(board_length: int, colors: tuple):
+        """Cached GameSpec for a number of pegs and a tuple of colors."""
+
+        return GameSpec(board_length, colors)
+
+    def pack(self, code) -> bytes:
+        """Converts a code to its packed representation
+
+        Args:
+            code (str, bytes or sequence of colors): Code to convert, packed codes are returned unchanged.
+
+        Returns:
+            bytes: Returns packed code, pegs that are not one of the colors are packed as INVALID.
+        """
+
+        if isinstance(code, bytes):
+
+            return code
+
+        if isinstance(code, str):
+
+            if self.single_char:
+
+                try:
+
+                    return code.encode("latin-1").translate(self.pack_table)
+
+                except UnicodeEncodeError:
+
+                    return bytes([INVALID]) * len(code)
+
+            width = self.token_width
+
+            if width == 0:
+
+                # Integer colors have no string form, every peg of a string code is invalid
+                return bytes([INVALID]) * len(code)
+
+            code = [code[i : i + width] for i in range(0, len(code), width)]
+
+        index = self.index
+
+        return bytes([index.get(peg, INVALID) for peg in code])
+
+    def unpack(self, code):
+        """Converts a packed code to its representation with colors
+
+        Args:
+            code (bytes): Packed code to convert.
+
+        Returns:
+            str or tuple[int]: Returns code as a string of colors, or as a tuple of integer colors.
+        """
+
+        if not isinstance(code, bytes):
+
+            return code
+
+        if self.single_char:
+
+            return code.translate(self.unpack_table).decode("latin-1")
+
+        if self.integer_tokens:
+
+            return tuple(self.colors[peg] for peg in code)
+
+        return "".join([self.colors[peg] for peg in code])
+
+    def valid(self, code) -> bool:
+        """Checks whether a code is valid
+
+        Args:
+            code (str, bytes or sequence of colors): Code to check.
+
+        Returns:
+            bool: Returns True if code has board_length pegs and uses only possible colors, False otherwise.
+        """
+
+        if isinstance(code, str) and len(code) != self.board_length * self.token_width:
+
+            return False
+
+        code = self.pack(code)
+
+        # Deleting every valid packed value leaves nothing iff the code only uses possible colors.
+        return len(code) == self.board_length and not code.translate(None, self.indices)
@@ -0,0 +1,223 @@
+# File contains a compact binary trace of every guess of a tournament, written through a memory map.
+# See mastermind.py (Round.play_round) for example usages and replay.py to replay and query traces.
+#
+# Format: HEADER_FORMAT (TRACE_MAGIC, board_length, num_colors, seed or -1, SCSA name), then one record per guess:
+# RECORD_FORMAT (round id, guess number, exact, other, latency in nanoseconds) followed by the packed guess.
+# Guess numbers start at 1, so records of zeros (the unused end of an unfinished trace) are ignored by readers.
+
+import mmap
+import struct
+import numpy as np
+from codes import INVALID
+from gamespec import GameSpec
+
+
+TRACE_MAGIC = b"MMTR"
+
+HEADER_FORMAT = "<4sHHq32s"
+
+RECORD_FORMAT = "<IHHHQ"
+
+# The trace file grows by at least this many records at a time.
+TRACE_CHUNK = 1 << 16
+
+# Readers scan traces this many records at a time.
+READ_CHUNK = 1 << 20
+
+
+def trace_dtype(board_length: int) -> np.dtype:
+    """NumPy dtype of a trace record (see RECORD_FORMAT)."""
+
+    return np.dtype(
+        [
+            ("round", "<u4"),
+            ("guess_number", "<u2"),
+            ("exact", "<u2"),
+            ("other", "<u2"),
+            ("latency", "<u8"),
+            ("guess", "u1", (board_length,)),
+        ]
+    )
+
+
+class TraceBuffer:
+    """Trace records kept in memory, e.g. by a worker process before they are appended to a TraceWriter"""
+
+    def __init__(self, board_length: int):
+        """Constructor for TraceBuffer
+
+        Args:
+            board_length (int): Number of pegs of every guess.
+        """
+
+        self.board_length = board_length
+        self.record_struct = struct.Struct(RECORD_FORMAT)
+        self.data = bytearray()
+
+    def write_bytes(self, data: bytes) -> None:
+
+        self.data += data
+
+    def record(self, round_id: int, guess_number: int, guess: bytes, exact: int, other: int, latency: int) -> None:
+        """Appends the record of a guess
+
+        Args:
+            round_id (int): Index of the round in the tournament.
+            guess_number (int): Number of the guess in the round, starting at 1.
+            guess (bytes): Packed guess, padded with INVALID or cut to board_length pegs.
+            exact (int): Number of pegs that match exactly with the answer.
+            other (int): Number of pegs that are the right color, but in the wrong location.
+            latency (int): Duration of make_guess in nanoseconds.
+        """
+
+        if len(guess) != self.board_length:
+
+            guess = (guess + bytes([INVALID]) * self.board_length)[: self.board_length]
+
+        self.write_bytes(self.record_struct.pack(round_id, guess_number, exact, other, latency) + guess)
+
+
+class TraceWriter(TraceBuffer):
+    """Appends trace records to a file through a memory map, grown TRACE_CHUNK records at a time"""
+
+    def __init__(self, file_name: str, spec: GameSpec, scsa_name: str, seed: int = None):
+        """Constructor for TraceWriter
+
+        Args:
+            file_name (str): Name of file to write trace to, truncated if it exists.
+            spec (GameSpec): Specification of the game.
+            scsa_name (str): Name of SCSA used to generate secret codes.
+            seed (int, optional): Seed of the tournament, see set_seed. Defaults to None.
+        """
+
+        super().__init__(spec.board_length)
+
+        self.spec = spec
+        self.scsa_name = scsa_name
+        self.file = open(file_name, "w+b")
+        self.map = None
+        self.capacity = 0
+        self.header_size = struct.calcsize(HEADER_FORMAT)
+        self.size = self.header_size  # Bytes written so far
+
+        self.grow(self.size + TRACE_CHUNK * (self.record_struct.size + self.board_length))
+        self.set_seed(seed)
+
+    def set_seed(self, seed: int) -> None:
+        """Records the seed of the tournament in the header, so rounds can be replayed with the same random state."""
+
+        self.map[: self.header_size] = struct.pack(
+            HEADER_FORMAT,
+            TRACE_MAGIC,
+            self.board_length,
+            self.spec.num_colors,
+            -1 if seed is None else seed,
+            self.scsa_name.encode(),
+        )
+
+    def grow(self, needed: int) -> None:
+        """Extends the file and its memory map to hold at least needed bytes."""
+
+        capacity = max(needed, 2 * self.capacity)
+
+        if self.map is not None:
+
+            self.map.close()
+
+        self.file.truncate(capacity)
+        self.map = mmap.mmap(self.file.fileno(), capacity)
+        self.capacity = capacity
+
+    def write_bytes(self, data: bytes) -> None:
+
+        end = self.size + len(data)
+
+        if end > self.capacity:
+
+            self.grow(end)
+
+        self.map[self.size : end] = data
+        self.size = end
+
+    def close(self) -> None:
+        """Flushes the trace and cuts the file to the records written."""
+
+        self.map.flush()
+        self.map.close()
+        self.file.truncate(self.size)
+        self.file.close()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc) -> None:
+
+        self.close()
+
+
+def read_header(file_name: str) -> dict:
+    """Reads the header of a trace
+
+    Args:
+        file_name (str): Name of file written by TraceWriter.
+
+    Raises:
+        ValueError: Raised if the file is not a trace.
+
+    Returns:
+        dict: Returns header with keys board_length, num_colors, seed (None if unknown) and scsa_name.
+    """
+
+    file = open(file_name, "rb")
+    data = file.read(struct.calcsize(HEADER_FORMAT))
+    file.close()
+
+    if len(data) < struct.calcsize(HEADER_FORMAT) or data[:4] != TRACE_MAGIC:
+
+        raise ValueError(file_name + " is not a trace.")
+
+    _, board_length, num_colors, seed, scsa_name = struct.unpack(HEADER_FORMAT, data)
+
+    return {
+        "board_length": board_length,
+        "num_colors": num_colors,
+        "seed": None if seed == -1 else seed,
+        "scsa_name": scsa_name.rstrip(b"\0").decode(),
+    }
+
+
+def open_trace(file_name: str) -> np.ndarray:
+    """Maps the records of a trace without reading them
+
+    Args:
+        file_name (str): Name of file written by TraceWriter, possibly still being written.
+
+    Returns:
+        np.memmap: Returns read-only array of records (see trace_dtype).
+    """
+
+    header = read_header(file_name)
+    dtype = trace_dtype(header["board_length"])
+    offset = struct.calcsize(HEADER_FORMAT)
+    file = open(file_name, "rb")
+    file.seek(0, 2)
+    count = (file.tell() - offset) // dtype.itemsize
+    file.close()
+
+    if count == 0:
+
+        return np.zeros(0, dtype=dtype)
+
+    return np.memmap(file_name, dtype=dtype, mode="r", offset=offset, shape=(count,))
+
+
+def iter_chunks(records: np.ndarray):
+    """Yields records READ_CHUNK at a time, skipping the unused end of an unfinished trace."""
+
+    for lo in range(0, len(records), READ_CHUNK):
+
+        chunk = records[lo : lo + READ_CHUNK]
+        used = chunk["guess_number"] != 0
+
+        yield chunk if used.all() else chunk[used]
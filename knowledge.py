@@ -0,0 +1,118 @@
+# File contains a compact knowledge base of what a player knows about the secret code of a round.
+# See Endgame.py, baselines/Endgame_beta.py and baselines/Endgame_B2.py for example usages.
+#
+# Every position holds an int bitmask of the colors excluded there (bit c set if color c can not be at the position),
+# and the gauntlet holds the pegs whose color is known (UNKNOWN elsewhere). Colors are color indices, as in packed
+# codes (see codes.py).
+
+from codes import INVALID
+
+UNKNOWN = INVALID  # Gauntlet value of a peg whose color is not known yet.
+
+
+class KnowledgeBase:
+    """Colors excluded at every position and pegs fixed by the gauntlet"""
+
+    def __init__(self, board_length: int, num_colors: int):
+        """Constructor for KnowledgeBase, knowing nothing
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            num_colors (int): Number of possible colors.
+        """
+
+        self.board_length = board_length
+        self.num_colors = num_colors
+        self.excluded = [0] * board_length  # Bitmask of the colors excluded at every position
+        self.fixed = bytearray([UNKNOWN]) * board_length  # Gauntlet, color of the pegs known
+
+    def exclude(self, position: int, color: int) -> None:
+        """Records that color is not at position."""
+
+        self.excluded[position] |= 1 << color
+
+    def is_excluded(self, position: int, color: int) -> bool:
+
+        return (self.excluded[position] >> color) & 1 == 1
+
+    def fix(self, position: int, color: int) -> None:
+        """Records that color is at position (the peg joins the gauntlet)."""
+
+        self.fixed[position] = color
+
+    def allowed(self, position: int) -> list:
+        """Colors still allowed at position, in increasing order (only its color once the peg is fixed)."""
+
+        if self.fixed[position] != UNKNOWN:
+
+            return [self.fixed[position]]
+
+        mask = self.excluded[position]
+
+        return [color for color in range(self.num_colors) if not (mask >> color) & 1]
+
+    def excluded_colors(self, position: int) -> set:
+        """Colors excluded at position, e.g. for MultisetPermutations.iter_range (see multiset.py)."""
+
+        mask = self.excluded[position]
+
+        return {color for color in range(self.num_colors) if (mask >> color) & 1}
+
+    def rules_out(self, code) -> bool:
+        """Whether a code places a color at a position the color is excluded from (one shift per peg)."""
+
+        excluded = self.excluded
+
+        for i in range(len(code)):
+
+            if (excluded[i] >> code[i]) & 1:
+
+                return True
+
+        return False
+
+    def next_allowed(self, code: bytes = None) -> bytes:
+        """Smallest code after code (in lexicographic order of color indices) whose pegs are all allowed
+
+        Args:
+            code (bytes, optional): Packed code to start after. Defaults to None (the smallest allowed code).
+
+        Returns:
+            bytes: Returns packed code, None if no allowed code comes after code.
+        """
+
+        allowed = [self.allowed(i) for i in range(self.board_length)]
+
+        if not all(allowed):
+
+            return None
+
+        if code is None:
+
+            return bytes(colors[0] for colors in allowed)
+
+        # Pegs before the first excluded one can be kept, the code goes up at the last position where it can
+        # and every later position takes its smallest allowed color.
+        bad = next((i for i in range(self.board_length) if code[i] not in allowed[i]), self.board_length)
+
+        for j in range(min(bad, self.board_length - 1), -1, -1):
+
+            higher = [color for color in allowed[j] if color > code[j]]
+
+            if higher:
+
+                return bytes(code[:j]) + bytes([higher[0]]) + bytes(colors[0] for colors in allowed[j + 1 :])
+
+        return None
+
+    def iter_allowed(self):
+        """Allowed codes in lexicographic order, each found from what is known when it is asked for (so colors
+        excluded along the way are skipped without building the codes they rule out)."""
+
+        code = self.next_allowed()
+
+        while code is not None:
+
+            yield code
+
+            code = self.next_allowed(code)
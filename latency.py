@@ -0,0 +1,126 @@
+# File contains a compact log-bucketed histogram for latencies measured in nanoseconds.
+# See mastermind.py (Results) for example usages.
+
+import numpy as np
+
+
+SUB_BUCKET_BITS = 5  # Each power of two is split into 2 ** (SUB_BUCKET_BITS - 1) buckets, about 3% relative error.
+
+
+def bucket_of(value: int) -> int:
+    """Index of the bucket holding a non negative integer value."""
+
+    shift = max(0, value.bit_length() - SUB_BUCKET_BITS)
+
+    return (shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+
+def bucket_bounds(bucket: int) -> tuple:
+    """Lowest and highest values held by a bucket."""
+
+    half = 1 << (SUB_BUCKET_BITS - 1)
+
+    if bucket < 2 * half:
+
+        return (bucket, bucket)
+
+    shift = (bucket >> (SUB_BUCKET_BITS - 1)) - 1
+    lo = (bucket - (shift << (SUB_BUCKET_BITS - 1))) << shift
+
+    return (lo, lo + (1 << shift) - 1)
+
+
+class LatencyHistogram:
+    """Histogram of latencies in nanoseconds, with buckets growing logarithmically (HDR-style)
+
+    Only non-empty buckets are stored, so a histogram of millions of values takes a few hundred entries.
+    """
+
+    def __init__(self):
+        """Constructor for LatencyHistogram"""
+
+        self.buckets = {}  # Bucket index -> number of values
+        self.count = 0
+        self.total = 0  # Sum of all values
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        """Records a latency in nanoseconds."""
+
+        bucket = bucket_of(value)
+
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def record_array(self, values: np.ndarray) -> None:
+        """Records many latencies in nanoseconds at once (values below 2 ** 53)."""
+
+        values = np.asarray(values, dtype=np.int64)
+
+        if values.size == 0:
+
+            return
+
+        bit_lengths = np.frexp(values.astype(np.float64))[1]
+        shifts = np.maximum(0, bit_lengths - SUB_BUCKET_BITS)
+        buckets, counts = np.unique((shifts << (SUB_BUCKET_BITS - 1)) + (values >> shifts), return_counts=True)
+
+        for bucket, count in zip(buckets.tolist(), counts.tolist()):
+
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+
+        self.count += values.size
+        self.total += int(values.sum())
+        self.max = max(self.max, int(values.max()))
+
+    def merge(self, other) -> None:
+        """Adds every value recorded by another histogram."""
+
+        for bucket, count in other.buckets.items():
+
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> int:
+        """Value below which percent of the recorded values are (upper bound of its bucket, at most max)."""
+
+        if self.count == 0:
+
+            return 0
+
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+
+        for bucket in sorted(self.buckets):
+
+            seen += self.buckets[bucket]
+
+            if seen >= rank:
+
+                return min(bucket_bounds(bucket)[1], self.max)
+
+        return self.max
+
+    def mean(self) -> float:
+
+        return self.total / self.count if self.count else 0.0
+
+    def __str__(self) -> str:
+        """String representation of a LatencyHistogram, in milliseconds."""
+
+        return (
+            "{p50: "
+            + format(self.percentile(50) / 1e6, ".3f")
+            + " ms, p90: "
+            + format(self.percentile(90) / 1e6, ".3f")
+            + " ms, p99: "
+            + format(self.percentile(99) / 1e6, ".3f")
+            + " ms, max: "
+            + format(self.max / 1e6, ".3f")
+            + " ms}"
+        )
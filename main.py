@@ -2,26 +2,19 @@
 # See example.ipynb for other ways to use the Mastermind representation.
 
 import argparse
-from scsa import *
-from player import *
 from mastermind import *
-from Endgame_B1 import *
-from Endgame_B2 import *
-#from Endgame_d3_2 import *
-#from Endgame_d3 import *
-from Endgame_d3_all_combined import *
+from records import open_sink
+from checkpoint import Checkpoint
+from gametrace import TraceWriter
+from registry import PLAYER_NAMES, LETTER_PLAYER_NAMES, SCSA_NAMES, make_colors, str_to_player, str_to_batch_player, str_to_scsa
 import timeit
 
-## TEST
-from Endgame_beta import *
-## END
-
 start = timeit.default_timer()
 
 parser = argparse.ArgumentParser(description="Play a game of Mastermind.")
 parser.add_argument("--board_length", nargs="?", type=int, required=True)
 parser.add_argument(
-    "--num_colors", nargs="?", type=int, required=True, choices=range(1, 27)
+    "--num_colors", nargs="?", type=int, required=True, choices=range(1, 255)
 )
 
 parser.add_argument(
@@ -29,7 +22,7 @@ parser.add_argument(
     nargs="?",
     type=str,
     required=True,
-    choices=["RandomFolks", "Boring", "Baseline1", "Baseline2", "Endgame", "Beta"],
+    choices=PLAYER_NAMES,
 )
 
 parser.add_argument(
@@ -37,70 +30,82 @@ parser.add_argument(
     nargs="?",
     type=str,
     required=True,
-    choices=[
-        "InsertColors",
-        "TwoColor",
-        "ABColor",
-        "TwoColorAlternating",
-        "OnlyOnce",
-        "FirstLast",
-        "UsuallyFewer",
-        "PreferFewer",
-    ],
+    choices=SCSA_NAMES,
 )
 
-parser.add_argument("--num_rounds", nargs="?", type=int, required=True)
+parser.add_argument("--num_rounds", nargs="?", type=int, default=None)
+parser.add_argument(
+    "--code_file", nargs="?", type=str, default=None, help="play every code of this file instead of generated codes"
+)
+parser.add_argument("--feedback_table", action="store_true")
+parser.add_argument("--jobs", nargs="?", type=int, default=1)
+parser.add_argument("--seed", nargs="?", type=int, default=None)
+parser.add_argument(
+    "--records", nargs="?", type=str, default=None, help="file to stream round records to (.jsonl or binary)"
+)
+parser.add_argument("--checkpoint", nargs="?", type=str, default=None, help="file to save the tournament to")
+parser.add_argument("--checkpoint_every", nargs="?", type=int, default=1000)
+parser.add_argument("--resume", action="store_true", help="resume from --checkpoint if it exists")
+parser.add_argument("--trace", nargs="?", type=str, default=None, help="file to trace every guess to")
+parser.add_argument(
+    "--batch_size", nargs="?", type=int, default=None, help="play rounds in lockstep with the batch version of the player"
+)
 args = parser.parse_args()
 
-def str_to_player(player_name: str) -> Player:
-    if player_name == "RandomFolks":
-        player = RandomFolks()
-    elif player_name == "Boring":
-        player = Boring()
-    elif player_name == "Baseline1":
-        player = Baseline1()
-    elif player_name == "Baseline2":
-        player = Baseline2()
-    elif player_name == "Endgame":
-        player = Endgame()     
-    elif player_name == "Beta":
-        player = Endgame_Beta()   
-    else:
-        raise ValueError("Unrecognized Player.")
-    return player
-
-
-def str_to_scsa(scsa_name: str) -> SCSA:
-    if scsa_name == "InsertColors":
-        scsa = InsertColors()
-    elif scsa_name == "TwoColor":
-        scsa = TwoColor()
-    elif scsa_name == "ABColor":
-        scsa = ABColor()
-    elif scsa_name == "TwoColorAlternating":
-        scsa = TwoColorAlternating()
-    elif scsa_name == "OnlyOnce":
-        scsa = OnlyOnce()
-    elif scsa_name == "FirstLast":
-        scsa = FirstLast()
-    elif scsa_name == "UsuallyFewer":
-        scsa = UsuallyFewer()
-    elif scsa_name == "PreferFewer":
-        scsa = PreferFewer()
-    else:
-        raise ValueError("Unrecognized SCSA.")
-    return scsa
+if args.num_rounds is None and args.code_file is None:
+
+    parser.error("--num_rounds is required unless --code_file is given")
+
+if args.player_name in LETTER_PLAYER_NAMES and args.num_colors > 26:
+
+    parser.error(args.player_name + " plays games of up to 26 colors")
 
 player = str_to_player(args.player_name)
 scsa = str_to_scsa(args.scsa_name)
-colors = [chr(i) for i in range(65, 91)][: args.num_colors]
-mastermind = Mastermind(args.board_length, colors)
+colors = make_colors(args.num_colors)
+table = FeedbackTable.load(args.board_length, args.num_colors) if args.feedback_table else None
+mastermind = Mastermind(args.board_length, colors, feedback_table=table)
+
+checkpoint = Checkpoint(args.checkpoint, args.checkpoint_every, args.resume) if args.checkpoint else None
+sink_offset = checkpoint.sink_offset() if checkpoint is not None else None
+sink = open_sink(args.records, mastermind.spec, sink_offset) if args.records else None
+trace = TraceWriter(args.trace, mastermind.spec, scsa.name) if args.trace else None
+
+if args.code_file:
+
+    # Codes are read from the file as the rounds are played (by the parent when playing in parallel).
+    mastermind.practice_tournament(
+        player,
+        scsa.name,
+        args.code_file,
+        sink=sink,
+        workers=args.jobs,
+        trace=trace,
+        checkpoint=checkpoint,
+        seed=args.seed,
+    )
+
+elif args.batch_size:
+
+    mastermind.play_batch_tournament(
+        str_to_batch_player(args.player_name), scsa, args.num_rounds, args.batch_size, args.seed, sink=sink
+    )
+
+else:
+
+    mastermind.play_tournament(
+        player, scsa, args.num_rounds, args.jobs, args.seed, sink=sink, checkpoint=checkpoint, trace=trace
+    ) # for regular scsas
+
+if sink is not None:
+
+    sink.close()
 
-mastermind.play_tournament(player, scsa, args.num_rounds) # for regular scsas
+if trace is not None:
 
-#mastermind.practice_tournament(player, scsa, "mystery5_7_5.txt") # for 
+    trace.close()
 
 stop = timeit.default_timer()
 execution_time = stop - start
 
-print("Program Executed in "+str(execution_time)+" seconds") # It returns time in seconds
\ No newline at end of file
+print("Program Executed in "+str(execution_time)+" seconds") # It returns time in seconds
@@ -2,9 +2,42 @@
 # See main.py or examples.ipynb for example usages.
 
 import time
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
+from operator import eq
+import numpy as np
 from scsa import *
 from player import *
+from gamespec import GameSpec
+from latency import LatencyHistogram
+from records import RoundRecord, RecordSink
+from checkpoint import Checkpoint
+from corpus import CodeCorpus
+from codefile import BinaryCodes, is_code_file
+from gametrace import TraceBuffer
+from sources import CodeSource, SCSASource, FileSource, IndexedSource, STREAM_PART
+from randomness import RandomStream, as_stream
+from feedback import (
+    batch_feedback,
+    paired_feedback,
+    codes_to_array,
+    code_rank,
+    array_ranks,
+    unpack_response,
+    FeedbackTable,
+    AnswerProfile,
+    IncrementalScorer,
+)
+
+
+# Boards at least this long are scored with the answer's bitmask profile instead of a loop over the pegs.
+# See "python3 benchmark.py --suite bitmask" for the crossover point.
+BITMASK_MIN_LENGTH = 32
+
+# Parallel tournaments split the rounds into this many shards per worker, to balance rounds of uneven length.
+SHARDS_PER_WORKER = 4
 
 
 def letter_to_num(letter: str) -> int:
@@ -40,15 +73,33 @@ class Results:
             Result.FAILURE: 0,
         }  # Private field used to keep track of the result of a round.
         self.score = 0  # Public field used to keep track of score.
+        self.guesses = 0  # Public field used to keep track of the number of guesses of all rounds.
+        self.guesses_per_round: dict[int, int] = {}  # Number of guesses -> number of rounds
+        self.guess_latency = LatencyHistogram()  # Nanoseconds per make_guess call
+        self.round_latency = LatencyHistogram()  # Nanoseconds per round
 
-    def record_result(self, result: Result) -> None:
+    def record_result(self, result: Result, guesses: int = 0) -> None:
         """Records result.
 
         Args:
             result (Result): Records a Result.WIN, Result.LOSS, or Result.FAILURE.
+            guesses (int, optional): Number of guesses of the round. Defaults to 0.
         """
 
         self.__results[result] += 1
+        self.guesses += guesses
+        self.guesses_per_round[guesses] = self.guesses_per_round.get(guesses, 0) + 1
+
+    def record_latency(self, round_latency: int, guess_latency: LatencyHistogram) -> None:
+        """Records latencies of a round.
+
+        Args:
+            round_latency (int): Duration of the round in nanoseconds.
+            guess_latency (LatencyHistogram): Latencies of the make_guess calls of the round in nanoseconds.
+        """
+
+        self.round_latency.record(round_latency)
+        self.guess_latency.merge(guess_latency)
 
     def get_number_of_wins(self) -> int:
 
@@ -75,6 +126,48 @@ class Results:
             + self.get_number_of_failures()
         )
 
+    def get_mean_guesses(self) -> float:
+        """Get mean number of guesses per round recorded.
+
+        Returns:
+            float: Number of guesses of all rounds divided by number of rounds (0 if there are no rounds).
+        """
+
+        rounds = self.get_number_of_rounds()
+
+        return self.guesses / rounds if rounds else 0.0
+
+    def get_guesses_per_second(self) -> float:
+        """Get number of guesses made per second spent in make_guess.
+
+        Returns:
+            float: Number of make_guess calls recorded divided by their total duration (0 if there are none).
+        """
+
+        if self.guess_latency.total == 0:
+
+            return 0.0
+
+        return self.guess_latency.count / (self.guess_latency.total / 1e9)
+
+    def latency_report(self) -> str:
+        """Latency statistics of the recorded rounds.
+
+        Returns:
+            str: Percentiles of make_guess and round latencies, guesses per second and guesses per round distribution.
+        """
+
+        return (
+            "make_guess: "
+            + str(self.guess_latency)
+            + ", round: "
+            + str(self.round_latency)
+            + ", guesses/s: "
+            + format(self.get_guesses_per_second(), ".1f")
+            + ", guesses per round: "
+            + str(dict(sorted(self.guesses_per_round.items())))
+        )
+
     def compute_old_score(self) -> int:
         """Computes score using old score function for a tournament
 
@@ -111,117 +204,136 @@ class Round:
         scsa_name: str,
         guess_cutoff: int = 100,
         time_cutoff: int = 5,
+        feedback_table: FeedbackTable = None,
+        spec: GameSpec = None,
     ):
         """Constuctor for Round
 
         Args:
             board_length (int): Number of pegs.
-            colors (list[str]): All possible colors that can be used to generate a code.
-            answer (string): Answer for the round that the player is trying to guess.
+            colors (list[str] or list[int]): All possible colors that can be used to generate a code.
+            answer (str or bytes): Answer for the round that the player is trying to guess, as a string or as a packed code.
             scsa_name (str): Name of SCSA used to generate secret code.
             guess_cutoff (int, optional): Number of guesses allowed per round. Defaults to 100.
             time_cutoff (int, optional): Amount of time in seconds allowed for the round. Defaults to 5.
+            feedback_table (FeedbackTable, optional): Precomputed responses used to score guesses. Defaults to None.
+            spec (GameSpec, optional): Compiled specification of the game. Defaults to GameSpec(board_length, colors).
         """
 
+        self.spec = spec if spec is not None else GameSpec.of(board_length, tuple(colors))
         self.board_length = board_length
         self.colors = colors
-        self.answer = answer
+        self.answer = self.spec.pack(answer)  # Packed code, see codes.py
+        self.profile = AnswerProfile(self.answer)
         self.scsa_name = scsa_name
         self.guesses = 0
         self.guess_cutoff = guess_cutoff
         self.time_cutoff = time_cutoff
         self.time_buffer = 0.1  # Seconds
         self.time_used = 0
+        self.guess_latency = LatencyHistogram()  # Nanoseconds per make_guess call
+        self.feedback_table = feedback_table
+
+        if feedback_table is not None:
 
-    def valid_guess(self, guess: str) -> bool:
+            self.answer_rank = code_rank(self.answer, colors)
+
+    def valid_guess(self, guess) -> bool:
         """Checks whether a guess is valid
 
         Args:
-            guess (str): Guess of secret code.
+            guess (str or bytes): Guess of secret code, as a string or as a packed code.
 
         Returns:
             bool: Returns True if guess is valid (correct length and uses only possible colors) and False otherwise.
         """
 
-        if len(guess) != self.board_length:
-
-            return False
+        return self.spec.valid(guess)
 
-        for peg in guess:
-
-            if peg not in self.colors:
-
-                return False
-
-        return True
-
-    def count_colors(self, guess: str):
+    def count_colors(self, guess):
         """Counts number of occurences for each color
 
         Args:
-            guess (str): Guess of secret code.
+            guess (str or bytes): Guess of secret code, as a string or as a packed code.
 
         Returns:
             list[int]: Returns list of number of occurences for each color in self.color.
         """
 
-        counts = [0] * len(self.colors)
-
-        for peg in guess:
-
-            idx = letter_to_num(peg) - 1
+        guess = self.spec.pack(guess)
 
-            counts[idx] += 1
+        return [guess.count(idx) for idx in range(self.spec.num_colors)]
 
-        return counts
-
-    def process_guess(self, guess: str):
+    def process_guess(self, guess):
         """Determines number of exactly correct pegs and partially correct pegs for a guess
 
         Args:
-            guess (str): Guess of secret code.
+            guess (str or bytes): Guess of secret code, as a string or as a packed code.
 
         Returns:
             tuple[int,int]: (number of pegs that match exactly with the answer,
                             number of pegs that are the right color, but in the wrong location)
         """
 
-        guess_color_count = self.count_colors(guess)
-        answer_color_count = self.count_colors(self.answer)
+        guess = self.spec.pack(guess)
 
-        exact = 0
-        other = 0
+        if self.feedback_table is not None:
 
-        for i in range(self.board_length):
+            return self.feedback_table.feedback(code_rank(guess, self.colors), self.answer_rank)
 
-            if guess[i] == self.answer[i]:
+        if self.board_length >= BITMASK_MIN_LENGTH:
 
-                exact += 1
+            return self.profile.feedback(guess)
 
-                # Decrease color counts
-                guess_color_count[letter_to_num(guess[i]) - 1] -= 1
-                answer_color_count[letter_to_num(self.answer[i]) - 1] -= 1
+        exact = sum(map(eq, guess, self.answer))
 
-        for i in range(len(self.colors)):
+        # Pegs of the right color regardless of position, minus the ones that are exact matches.
+        # Only colors used in the answer can contribute.
+        other = sum(map(min, map(guess.count, self.profile.colors), self.profile.counts)) - exact
 
-            if answer_color_count[i] <= guess_color_count[i]:
+        return (exact, other)
 
-                other += answer_color_count[i]
+    def process_guesses(self, guesses):
+        """Determines number of exactly correct pegs and partially correct pegs for many guesses at once
 
-            elif (
-                guess_color_count[i] < answer_color_count[i]
-                and guess_color_count[i] > 0
-            ):
+        Args:
+            guesses (list[str], list[bytes] or np.ndarray): Guesses of secret code, as strings, packed codes or
+                                                            an array of color indices.
 
-                other += guess_color_count[i]
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (number of pegs that match exactly with the answer for each guess,
+                                           number of pegs that are the right color, but in the wrong location for each guess)
+        """
 
-        return (exact, other)
+        if not isinstance(guesses, np.ndarray):
+
+            guesses = [self.spec.pack(guess) for guess in guesses]
 
-    def respond_to_guess(self, guess: str) -> tuple[Result, int, int, int]:
+        exact, other = batch_feedback(
+            codes_to_array(guesses, self.colors),
+            codes_to_array([self.answer], self.colors),
+            self.spec.num_colors,
+        )
+
+        return (exact[:, 0], other[:, 0])
+
+    def incremental_scorer(self, guess) -> IncrementalScorer:
+        """Creates a scorer for guesses that differ from guess in only a few pegs
+
+        Args:
+            guess (str or bytes): Reference guess, as a string or as a packed code.
+
+        Returns:
+            IncrementalScorer: Returns scorer keeping the response of guess against the answer.
+        """
+
+        return IncrementalScorer(self.answer, self.spec.pack(guess), self.spec.num_colors)
+
+    def respond_to_guess(self, guess) -> tuple[Result, int, int, int]:
         """Responds with correctness of player's guess.
 
         Args:
-            guess (str): Guess of secret code.
+            guess (str or bytes): Guess of secret code, as a string or as a packed code.
 
         Returns:
             tuple[Result, int, int, int]: (result of round (WIN, LOSS, VALID, or FAILURE),
@@ -236,7 +348,9 @@ class Round:
             
             return (Result.LOSS, 0, 0, self.guesses)
 
-        elif guess == self.answer:
+        guess = self.spec.pack(guess)
+
+        if guess == self.answer:
 
             response = (Result.WIN, self.board_length, 0, self.guesses)
 
@@ -252,11 +366,13 @@ class Round:
 
         return response
 
-    def play_round(self, player: Player) -> tuple[Result, int]:
+    def play_round(self, player: Player, trace: TraceBuffer = None, round_id: int = 0) -> tuple[Result, int]:
         """Plays out a round of Mastermind.
 
         Args:
             player (Player): Player to guess secret code.
+            trace (TraceBuffer, optional): Trace every guess and response is recorded to. Defaults to None.
+            round_id (int, optional): Id of the round in the trace. Defaults to 0.
 
         Returns:
             tuple[Result, int]: (result of round (WIN, LOSS, or FAILURE)
@@ -264,25 +380,31 @@ class Round:
         """
 
         self.guesses = 0
+        self.guess_latency = LatencyHistogram()
         player_response = (0, 0, 0)
 
         while self.guesses < self.guess_cutoff:
 
-            start = time.time()
+            start = time.perf_counter_ns()
             guess = player.make_guess(
                 self.board_length, self.colors, self.scsa_name, player_response
             )
-            end = time.time()
+            end = time.perf_counter_ns()
 
             duration = end - start
 
-            self.time_used += duration
+            self.guess_latency.record(duration)
+            self.time_used += duration / 1e9
 
             response = self.respond_to_guess(guess)
             player_response = response[1:]  # Remove result element
 
             # print("Response:", response, "Time:", self.time_used)
 
+            if trace is not None:
+
+                trace.record(round_id, self.guesses, self.spec.pack(guess), response[1], response[2], duration)
+
             if response[0] != Result.VALID:
 
                 return (response[0], self.guesses)
@@ -300,17 +422,20 @@ class Mastermind:
         guess_cutoff: int = 100,
         round_time_cutoff: int = 5,
         tournament_time_cutoff: int = 300,
+        feedback_table: FeedbackTable = None,
     ):
         """Constructor for Mastermind.
 
         Args:
             board_length (int, optional): Number of pegs. Defaults to 4.
-            colors (list[str], optional): List of colors that can be used to generate a secret code. Defaults to [chr(i) for i in range(65,91)].
+            colors (list[str] or list[int], optional): List of colors that can be used to generate a secret code. Defaults to [chr(i) for i in range(65,91)].
             guess_cutoff (int, optional): Number of guesses allowed per round. Defaults to 100.
             round_time_cutoff (int, optional):  Amount of time in seconds allowed for the round. Defaults to 5.
             tournament_time_cutoff (int, optional): Amount of time in seconds allowed for the round. Defaults to 300.
+            feedback_table (FeedbackTable, optional): Precomputed responses used to score guesses. Defaults to None.
         """
 
+        self.spec = GameSpec(board_length, colors)
         self.board_length = board_length
         self.colors = colors
         self.num_colors = len(colors)
@@ -318,6 +443,7 @@ class Mastermind:
         self.round_time_cutoff = round_time_cutoff
         self.tournament_time_cutoff = tournament_time_cutoff
         self.time_used = 0
+        self.feedback_table = feedback_table
 
     def print_results(
         self, player: Player, scsa_name: str, results: Results, num_rounds: int
@@ -336,122 +462,521 @@ class Mastermind:
         print("Game:", self.board_length, "Pegs", self.num_colors, "Colors")
         print("Rounds:", results.get_number_of_rounds(), "out of", num_rounds)
         print("Results:", results)
+        print("Latency:", results.latency_report())
 
         return
 
-    def play_tournament(self, player: Player, scsa: SCSA, num_rounds: int) -> None:
+    def make_code(self, scsa: SCSA, round_index: int, rng: RandomStream) -> bytes:
+        """Generates the secret code of a round of a tournament
+
+        Args:
+            scsa (SCSA): SCSA used to generate secret codes for player to guess.
+            round_index (int): Index of the round in the tournament, starting at 1.
+            rng (RandomStream): Stream of the tournament, the code is drawn from rng.code_stream(round_index).
+
+        Returns:
+            bytes: Returns packed secret code.
+        """
+
+        return scsa.generate_packed_codes(self.board_length, self.num_colors, 1, rng.code_stream(round_index))[0]
+
+    def make_round(self, scsa: SCSA, round_index: int, rng: RandomStream) -> Round:
+        """Creates a round of a tournament with a newly generated secret code
+
+        Args:
+            scsa (SCSA): SCSA used to generate secret codes for player to guess.
+            round_index (int): Index of the round in the tournament, starting at 1.
+            rng (RandomStream): Stream of the tournament, see make_code.
+
+        Returns:
+            Round: Returns round ready to be played.
+        """
+
+        return Round(
+            self.board_length,
+            self.colors,
+            self.make_code(scsa, round_index, rng),
+            scsa.name,
+            self.guess_cutoff,
+            self.round_time_cutoff,
+            self.feedback_table,
+            self.spec,
+        )
+
+    def record_round(self, results: Results, record: RoundRecord, sink: RecordSink = None) -> bool:
+        """Records a round in the results of a tournament
+
+        Args:
+            results (Results): Results of the tournament so far.
+            record (RoundRecord): Record of the round.
+            sink (RecordSink, optional): Sink the record is written to once counted in results. Defaults to None.
+
+        Returns:
+            bool: Returns True if the tournament continues after this round and False otherwise.
+        """
+
+        self.time_used += record.time
+
+        if self.time_used > self.tournament_time_cutoff:
+
+            return False
+
+        results.record_result(record.result, record.guesses)
+        results.record_latency(int(record.time * 1e9), record.guess_latency or LatencyHistogram())
+
+        if sink is not None:
+
+            sink.write(record)
+
+        if record.result == Result.WIN:
+
+            results.score += self.spec.score_scale * (5 * record.guesses ** (-0.5))
+
+        elif record.result == Result.FAILURE:
+
+            results.score -= 2 * self.spec.score_scale
+
+            return False
+
+        return True
+
+    def play_tournament(
+        self,
+        player: Player,
+        scsa: SCSA,
+        num_rounds: int,
+        workers: int = 1,
+        seed: int = None,
+        verbose: bool = True,
+        sink: RecordSink = None,
+        checkpoint: Checkpoint = None,
+        trace: TraceBuffer = None,
+    ) -> Results:
         """Plays a tournament of Mastermind
 
         Args:
             player (Player): Player who plays in tournament, making guesses.
             scsa (SCSA): SCSA used to generate secret codes for player to guess.
             num_rounds (int): Number of rounds of Mastermind to play.
+            workers (int, optional): Number of processes playing rounds in parallel. Defaults to 1.
+            seed (int or RandomStream, optional): Seed of the tournament, making every round reproducible (see
+                                                  randomness.py). Defaults to None (a random seed).
+            verbose (bool, optional): Prints the results at the end of the tournament. Defaults to True.
+            sink (RecordSink, optional): Sink every recorded round is written to, in round order. Defaults to None.
+            checkpoint (Checkpoint, optional): Checkpoint the tournament is saved to every few rounds, and resumed
+                                               from if it holds a snapshot of this tournament. Defaults to None.
+            trace (TraceWriter, optional): Trace every guess is recorded to, in round order. Defaults to None.
+
+        Returns:
+            Results: Returns results of the tournament.
+        """
+
+        if seed is None and checkpoint is not None and checkpoint.state is not None:
+
+            # A tournament without a seed drew a random one when it started, resuming it takes the same one.
+            seed = checkpoint.state["seed"]
+
+        rng = as_stream(seed)
+        source = SCSASource(scsa, self.board_length, self.num_colors, num_rounds, rng)
+
+        return self.run_tournament(player, scsa.name, source, workers, verbose, sink, checkpoint, trace, rng)
+
+    def run_tournament(
+        self,
+        player: Player,
+        scsa_name: str,
+        source: CodeSource,
+        workers: int = 1,
+        verbose: bool = True,
+        sink: RecordSink = None,
+        checkpoint: Checkpoint = None,
+        trace: TraceBuffer = None,
+        rng: RandomStream = None,
+    ) -> Results:
+        """Plays a tournament of Mastermind with the secret codes of a source, read as the rounds are played
+
+        Args:
+            player (Player): Player who plays in tournament, making guesses.
+            scsa_name (str): Name of SCSA used to generate codes in tournament.
+            source (CodeSource): Source of the secret codes (see sources.py).
+            workers (int, optional): Number of processes playing rounds in parallel. Defaults to 1.
+            verbose (bool, optional): Prints the results at the end of the tournament. Defaults to True.
+            sink (RecordSink, optional): Sink every recorded round is written to, in round order. Defaults to None.
+            checkpoint (Checkpoint, optional): Checkpoint the tournament is saved to every few rounds, and resumed
+                                               from if it holds a snapshot of this tournament. Defaults to None.
+            trace (TraceWriter, optional): Trace every guess is recorded to, in round order. Defaults to None.
+            rng (RandomStream, optional): Stream of the tournament, the player of round i draws its random decisions
+                                          from rng.player_stream(i). Defaults to None (a random seed, or the seed of
+                                          the tournament being resumed).
+
+        Returns:
+            Results: Returns results of the tournament.
         """
 
+        if rng is None:
+
+            resumed = checkpoint is not None and checkpoint.state is not None
+            rng = as_stream(checkpoint.state["seed"] if resumed else None)
+
         results = Results()
+        seed = rng.root_seed
+        key = (self.board_length, self.colors, player.player_name, scsa_name) + source.key
+        state = checkpoint.resume(key) if checkpoint is not None else None
+        played = [0]  # Index of the last round recorded
+        playing = True
 
-        for round in range(1, num_rounds + 1):
+        if state is not None:
 
-            code = scsa.generate_codes(self.board_length, self.colors, 1)[0]
+            results = state["results"]
+            self.time_used = state["time_used"]
+            played[0] = state["round_index"]
+            playing = not state["finished"]
+            source.skip(state["round_index"])
 
-            round = Round(
-                self.board_length,
-                self.colors,
-                code,
-                scsa.name,
-                self.guess_cutoff,
-                self.round_time_cutoff,
+        if trace is not None:
+
+            trace.set_seed(seed)
+
+        def record_round(record: RoundRecord) -> bool:
+
+            playing = self.record_round(results, record, sink)
+            played[0] = record.round_index
+
+            if checkpoint is not None:
+
+                finished = not playing or record.round_index == source.length()
+                checkpoint.update(key, record.round_index, results, self.time_used, seed, sink, finished)
+
+            return playing
+
+        if playing and workers <= 1:
+
+            for round_index, code in source:
+
+                if not record_round(self.play_code_round(player, scsa_name, round_index, code, trace, rng)):
+
+                    break
+
+        elif playing:
+
+            # Parts of the source are played in order, a few at a time, and recorded with the same rules as above.
+            length = source.length()
+            part_size = STREAM_PART
+
+            if length is not None:
+
+                part_size = max(1, (length - source.first + 1) // (workers * SHARDS_PER_WORKER))
+
+            with ProcessPoolExecutor(workers) as pool:
+
+                shards = deque()
+                parts = source.split(part_size)
+
+                while playing:
+
+                    for part in itertools.islice(parts, 2 * workers - len(shards)):
+
+                        shards.append(
+                            pool.submit(play_source_shard, self, player, scsa_name, part, trace is not None, rng)
+                        )
+
+                    if not shards:
+
+                        break
+
+                    records, trace_data = shards.popleft().result()
+
+                    if trace is not None:
+
+                        trace.write_bytes(trace_data)
+
+                    playing = all(record_round(record) for record in records)
+
+                pool.shutdown(cancel_futures=True)
+
+        if checkpoint is not None and played[0] and source.length() is None:
+
+            # The last round of a source of unknown length is only known once it is read.
+            checkpoint.update(key, played[0], results, self.time_used, seed, sink, True)
+
+        if verbose:
+
+            self.print_results(player, scsa_name, results, source.length() or played[0])
+
+        return results
+
+    def score_batch(self, guesses: np.ndarray, answers: np.ndarray):
+        """Determines (exact, other) of every guess against its own answer, from the feedback table if there is one
+
+        Args:
+            guesses (np.ndarray): (number of rounds, board_length) array of valid color indices.
+            answers (np.ndarray): (number of rounds, board_length) array of color indices.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (pegs that match exactly with the answer,
+                                           pegs that are the right color, but in the wrong location) of every round.
+        """
+
+        if self.feedback_table is not None:
+
+            packed = self.feedback_table.lookup(
+                array_ranks(guesses, self.num_colors), array_ranks(answers, self.num_colors)
             )
 
-            start = time.time()
-            result, guesses = round.play_round(player)
-            end = time.time()
+            return unpack_response(packed.astype(np.int64), self.board_length)
 
-            duration = end - start
+        return paired_feedback(guesses, answers, self.num_colors)
 
-            self.time_used += duration
+    def play_batch(self, player: BatchPlayer, scsa: SCSA, lo: int, hi: int, rng: RandomStream) -> list:
+        """Plays rounds lo to hi - 1 of a tournament in lockstep, every call of make_guesses advancing all of them
 
-            if self.time_used > self.tournament_time_cutoff:
-                
-                break
+        Rounds follow the same rules as Round.play_round, and drop out of the batch once they are over. The time of
+        every call of make_guesses is shared evenly by the rounds it advanced.
+
+        Args:
+            player (BatchPlayer): Player who plays in tournament, making guesses.
+            scsa (SCSA): SCSA used to generate secret codes for player to guess.
+            lo (int): Index of the first round to play.
+            hi (int): Index after the last round to play.
+            rng (RandomStream): Stream of the tournament, see make_code.
+
+        Returns:
+            list[RoundRecord]: Returns record of every round played.
+        """
+
+        num_rounds = hi - lo
+        length = self.board_length
+        codes = [self.make_code(scsa, round, rng) for round in range(lo, hi)]
+        answers = np.frombuffer(b"".join(codes), dtype=np.uint8).reshape(num_rounds, length)
+
+        outcomes = [Result.LOSS] * num_rounds
+        guesses_made = np.zeros(num_rounds, dtype=np.int64)
+        time_used = np.zeros(num_rounds)
+
+        states = np.zeros((num_rounds, 4), dtype=np.int64)  # Round number in batch, exact, other, guesses so far
+        states[:, 0] = np.arange(num_rounds)
+
+        player.new_batch(length, self.colors, scsa.name, num_rounds)
+
+        while len(states):
+
+            ids = states[:, 0]
+
+            start = time.perf_counter_ns()
+            guesses = np.asarray(player.make_guesses(length, self.colors, scsa.name, states))
+            end = time.perf_counter_ns()
+
+            time_used[ids] += (end - start) / 1e9 / len(ids)
+            guesses_made[ids] += 1
+
+            if guesses.shape == (len(ids), length):
 
-            # print("Round:", round, "|",  "Result:", result, "|", "Guesses:", guesses)
+                valid = (guesses >= 0).all(axis=1) & (guesses < self.num_colors).all(axis=1)
 
-            results.record_result(result)
+            else:
 
-            if result == Result.WIN:
+                valid = np.zeros(len(ids), dtype=bool)
+                guesses = np.zeros((len(ids), length), dtype=np.uint8)
 
-                results.score += (
-                    self.board_length * len(self.colors) * (5 * guesses ** (-0.5))
-                )
-                
+            guesses = np.where(valid[:, None], guesses, 0)
+            exact, other = self.score_batch(guesses, answers[ids])
 
-            elif result == Result.FAILURE:
+            timed_out = time_used[ids] > self.round_time_cutoff + 0.1  # Same buffer as Round.time_buffer
+            won = valid & (exact == length) & ~timed_out
+            failed = ~valid & ~timed_out
+            playing = valid & ~won & ~timed_out & (guesses_made[ids] < self.guess_cutoff)
+
+            for idx in ids[won]:
+
+                outcomes[idx] = Result.WIN
+
+            for idx in ids[failed]:
+
+                outcomes[idx] = Result.FAILURE
+
+            states = np.stack(
+                (ids[playing], exact[playing], other[playing], guesses_made[ids[playing]]), axis=1
+            )
+
+        return [
+            RoundRecord(lo + idx, codes[idx], outcomes[idx], int(guesses_made[idx]), float(time_used[idx]))
+            for idx in range(num_rounds)
+        ]
+
+    def play_batch_tournament(
+        self,
+        player: BatchPlayer,
+        scsa: SCSA,
+        num_rounds: int,
+        batch_size: int = 1024,
+        seed: int = None,
+        verbose: bool = True,
+        sink: RecordSink = None,
+    ) -> Results:
+        """Plays a tournament of Mastermind with a batch player, batch_size rounds at a time (see play_batch)
+
+        Args:
+            player (BatchPlayer): Player who plays in tournament, making guesses.
+            scsa (SCSA): SCSA used to generate secret codes for player to guess.
+            num_rounds (int): Number of rounds of Mastermind to play.
+            batch_size (int, optional): Number of rounds played in lockstep. Defaults to 1024.
+            seed (int or RandomStream, optional): Seed of the tournament, giving the same secret codes as
+                                                  play_tournament. Defaults to None (a random seed).
+            verbose (bool, optional): Prints the results at the end of the tournament. Defaults to True.
+            sink (RecordSink, optional): Sink every recorded round is written to, in round order. Defaults to None.
+
+        Returns:
+            Results: Returns results of the tournament.
+        """
+
+        results = Results()
+        rng = as_stream(seed)
+
+        for lo in range(1, num_rounds + 1, batch_size):
+
+            records = self.play_batch(player, scsa, lo, min(lo + batch_size, num_rounds + 1), rng)
+
+            # Rounds are recorded in order, with the same rules as play_tournament.
+            if not all(self.record_round(results, record, sink) for record in records):
 
-                results.score -= 2 * self.board_length * len(self.colors)
                 break
 
-        self.print_results(player, scsa.name, results, num_rounds)
+        if verbose:
 
-        return
+            self.print_results(player, scsa.name, results, num_rounds)
+
+        return results
+
+    def play_code_round(
+        self,
+        player: Player,
+        scsa_name: str,
+        round_index: int,
+        code,
+        trace: TraceBuffer = None,
+        rng: RandomStream = None,
+    ) -> RoundRecord:
+        """Plays one round of a tournament with a pregenerated secret code
+
+        Args:
+            player (Player): Player who plays in tournament, making guesses.
+            scsa_name (str): Name of SCSA used to generate codes in tournament.
+            round_index (int): Index of the round in the tournament, starting at 1.
+            code (str or bytes): Secret code, as a string or as a packed code.
+            trace (TraceBuffer, optional): Trace every guess of the round is recorded to. Defaults to None.
+            rng (RandomStream, optional): Stream of the tournament, the player draws its random decisions from
+                                          rng.player_stream(round_index). Defaults to None (player.rng left as is).
+
+        Returns:
+            RoundRecord: Returns record of the round.
+        """
+
+        if rng is not None:
+
+            player.rng = rng.player_stream(round_index)
+
+        round = Round(
+            self.board_length,
+            self.colors,
+            code,
+            scsa_name,
+            self.guess_cutoff,
+            self.round_time_cutoff,
+            self.feedback_table,
+            self.spec,
+        )
+
+        start = time.perf_counter_ns()
+        result, guesses = round.play_round(player, trace, round_index)
+        end = time.perf_counter_ns()
+
+        return RoundRecord(round_index, round.answer, result, guesses, (end - start) / 1e9, round.guess_latency)
 
     def practice_tournament(
-        self, player: Player, scsa_name: str, code_file: str
-    ) -> None:
+        self,
+        player: Player,
+        scsa_name: str,
+        code_file,
+        verbose: bool = True,
+        sink: RecordSink = None,
+        workers: int = 1,
+        trace: TraceBuffer = None,
+        checkpoint: Checkpoint = None,
+        seed: int = None,
+    ) -> Results:
         """Plays a tournament of Mastermind using pregenerated codes from file
 
         Args:
             player (Player): Player who plays in tournament, making guesses.
             scsa_name (str): Name of SCSA used to generate codes in tournament.
-            code_file (str): Name of file to read secret codes from.
+            code_file (str, CodeCorpus or CodeSource): Name of file to read secret codes from (a packed code file, see
+                                                       codefile.py, or one code per line, optionally gzip or xz
+                                                       compressed), corpus or source of secret codes.
+            verbose (bool, optional): Prints the results at the end of the tournament. Defaults to True.
+            sink (RecordSink, optional): Sink every recorded round is written to. Defaults to None.
+            workers (int, optional): Number of processes playing rounds in parallel. Defaults to 1.
+            trace (TraceWriter, optional): Trace every guess is recorded to, in round order. Defaults to None.
+            checkpoint (Checkpoint, optional): Checkpoint the tournament is saved to, see run_tournament. Defaults to None.
+            seed (int or RandomStream, optional): Seed of the random decisions of the player. Defaults to None.
+
+        Returns:
+            Results: Returns results of the tournament.
         """
 
-        codes = read_from_file(code_file)
-        num_rounds = len(codes)
-        results = Results()
-        cur_round = 0
+        if isinstance(code_file, CodeSource):
 
-        for code in codes:
+            source = code_file
 
-            cur_round += 1
+        elif isinstance(code_file, (CodeCorpus, BinaryCodes)):
 
-            round = Round(
-                self.board_length,
-                self.colors,
-                code,
-                scsa_name,
-                self.guess_cutoff,
-                self.round_time_cutoff,
-            )
+            source = IndexedSource(code_file)
 
-            start = time.time()
-            result, guesses = round.play_round(player)
-            end = time.time()
+        elif is_code_file(code_file):
 
-            duration = end - start
+            codes = BinaryCodes(code_file)
 
-            self.time_used += duration
+            if codes.board_length != self.board_length or codes.num_colors > self.num_colors:
 
-            if self.time_used > self.tournament_time_cutoff:
+                raise ValueError(code_file + " holds codes of another game.")
 
-                break
+            source = IndexedSource(codes)
+
+        else:
 
-            # print("Round:", cur_round, "|", "Result:", result, "|", "Guesses:", guesses)
+            source = FileSource(code_file)
 
-            results.record_result(result)
+        rng = as_stream(seed) if seed is not None else None
 
-            if result == Result.WIN:
+        return self.run_tournament(player, scsa_name, source, workers, verbose, sink, checkpoint, trace, rng)
 
-                results.score += (
-                    self.board_length * len(self.colors) * (5 * guesses ** (-0.5))
-                )
 
-            elif result == Result.FAILURE:
+def play_source_shard(
+    mastermind: Mastermind,
+    player: Player,
+    scsa_name: str,
+    source: CodeSource,
+    traced: bool = False,
+    rng: RandomStream = None,
+) -> tuple:
+    """Plays the rounds of a part of a source (see CodeSource.split) in a worker process
 
-                results.score -= 2 * self.board_length * len(self.colors)
+    Every round is charged only for its own time, the tournament time limit is applied when recording the rounds.
 
-                break
+    Args:
+        mastermind (Mastermind): Game the tournament is played on.
+        player (Player): Player who plays in tournament, making guesses.
+        scsa_name (str): Name of SCSA used to generate codes in tournament.
+        source (CodeSource): Part of the source of the tournament.
+        traced (bool, optional): Traces every guess of the rounds. Defaults to False.
+        rng (RandomStream, optional): Stream of the tournament, see Mastermind.play_code_round. Defaults to None.
 
-        self.print_results(player, scsa_name, results, num_rounds)
+    Returns:
+        tuple[list[RoundRecord], bytes]: Returns (record of every round played, trace records of their guesses).
+    """
 
-        return
+    trace = TraceBuffer(mastermind.board_length) if traced else None
+    records = [
+        mastermind.play_code_round(player, scsa_name, round_index, code, trace, rng) for round_index, code in source
+    ]
+
+    return (records, bytes(trace.data) if traced else b"")
@@ -0,0 +1,270 @@
+# File contains an iterative engine for the distinct permutations of a multiset, ranked in lexicographic order.
+# See Endgame.py (unique_permutations) for example usages.
+#
+# Permutations are ordered lexicographically by the order of the values given to the engine, so permutation i can be
+# built directly (unrank), the space can be cut into contiguous ranges of ranks for worker processes (shards), and
+# permutations can be sampled uniformly without rejection (sample).
+
+import random
+
+
+class MultisetPermutations:
+    """Distinct permutations of a multiset, kept as one count per distinct value"""
+
+    def __init__(self, pegs, values: list = None):
+        """Constructor for MultisetPermutations
+
+        Args:
+            pegs (iterable): Multiset to permute, e.g. [0, 0, 1, 1, 1].
+            values (list, optional): Distinct values of pegs, in the order permutations are ranked by.
+                                     Defaults to None (sorted values).
+        """
+
+        pegs = list(pegs)
+
+        self.values = sorted(set(pegs)) if values is None else list(values)
+        self.counts = [pegs.count(value) for value in self.values]
+        self.length = len(pegs)
+        self.index = {value: v for v, value in enumerate(self.values)}
+
+    def count(self) -> int:
+        """Number of distinct permutations, the multinomial coefficient length! / (count_1! ... count_k!)."""
+
+        total = 1
+        placed = 0
+
+        for count in self.counts:
+
+            for i in range(1, count + 1):
+
+                placed += 1
+                total = total * placed // i
+
+        return total
+
+    def __len__(self) -> int:
+
+        return self.count()
+
+    def rank(self, perm) -> int:
+        """Rank of a permutation, its number of permutations coming before it
+
+        Args:
+            perm (iterable): Permutation of the multiset.
+
+        Raises:
+            ValueError: Raised if perm is not a permutation of the multiset.
+
+        Returns:
+            int: Returns rank, from 0 to count() - 1.
+        """
+
+        perm = list(perm)
+
+        if len(perm) != self.length:
+
+            raise ValueError("Permutation does not have " + str(self.length) + " pegs.")
+
+        counts = list(self.counts)
+        size = self.count()  # Number of permutations of the pegs left
+        rank = 0
+
+        for p in range(self.length):
+
+            left = self.length - p
+            v = self.index.get(perm[p], -1)
+
+            if v < 0 or counts[v] == 0:
+
+                raise ValueError("Permutation is not a permutation of the multiset.")
+
+            # Permutations starting with a smaller value at this position come first
+            for smaller in range(v):
+
+                rank += size * counts[smaller] // left
+
+            size = size * counts[v] // left
+            counts[v] -= 1
+
+        return rank
+
+    def unrank(self, rank: int) -> tuple:
+        """Permutation of rank rank (see rank), built one position at a time without enumerating
+
+        Raises:
+            IndexError: Raised if rank is not between 0 and count() - 1.
+        """
+
+        size = self.count()
+
+        if not 0 <= rank < size:
+
+            raise IndexError("Permutation rank out of range.")
+
+        counts = list(self.counts)
+        perm = []
+
+        for p in range(self.length):
+
+            left = self.length - p
+
+            for v in range(len(counts)):
+
+                sub = size * counts[v] // left  # Permutations with value v at this position
+
+                if rank < sub:
+
+                    break
+
+                rank -= sub
+
+            perm.append(self.values[v])
+            counts[v] -= 1
+            size = sub
+
+        return tuple(perm)
+
+    def sample(self, rng: random.Random = None) -> tuple:
+        """Permutation drawn uniformly (unrank of a random rank), rng defaults to random."""
+
+        rng = random if rng is None else rng
+
+        return self.unrank(rng.randrange(self.count()))
+
+    def shards(self, num_shards: int) -> list:
+        """Contiguous ranges (lo, hi) of ranks of about the same size covering every permutation, e.g. for workers."""
+
+        total = self.count()
+        bounds = [total * i // num_shards for i in range(num_shards + 1)]
+
+        return [(lo, hi) for lo, hi in zip(bounds, bounds[1:]) if lo < hi]
+
+    def __iter__(self):
+
+        return self.iter_range()
+
+    def iter_range(self, lo: int = 0, hi: int = None, excluded: list = None):
+        """Permutations of ranks lo to hi - 1 in rank order, iteratively (one counts array, no recursion)
+
+        Args:
+            lo (int, optional): Rank of the first permutation. Defaults to 0.
+            hi (int, optional): Rank after the last permutation. Defaults to None (count()).
+            excluded (list[set], optional): Values excluded at every position. Branches placing an excluded value
+                                            are skipped as a whole, without building their permutations.
+                                            Defaults to None (nothing excluded).
+
+        Yields:
+            tuple: Permutation of the multiset.
+        """
+
+        n = self.length
+        k = len(self.counts)
+        values = self.values
+        value_of = values.__getitem__
+        total = self.count()
+        hi = total if hi is None else min(hi, total)
+
+        if lo >= hi:
+
+            return
+
+        counts = list(self.counts)
+        perm = [0] * n  # Index of the value at every position
+        sizes = [0] * (n + 1)  # sizes[p]: number of permutations sharing the first p positions of perm
+        sizes[0] = total
+
+        # Walks down to permutation lo, or to the first excluded branch on the way
+        rank = lo
+        offset = lo  # Rank of permutation lo among the permutations sharing the first p positions of perm
+        p = 0
+        start = 0  # First value index to try at position p
+
+        while p < n:
+
+            left = n - p
+
+            for v in range(k):
+
+                sub = sizes[p] * counts[v] // left
+
+                if offset < sub:
+
+                    break
+
+                offset -= sub
+
+            if excluded is not None and values[v] in excluded[p]:
+
+                rank = lo - offset + sub  # First rank after the excluded branch
+                start = v + 1
+
+                break
+
+            perm[p] = v
+            counts[v] -= 1
+            sizes[p + 1] = sub
+            p += 1
+
+        # Depth-first walk: the next value at position p is tried from start
+        while rank < hi:
+
+            if start == 0 and sizes[p] == 1:
+
+                # One permutation left under perm[:p]: the pegs left all have the same value, filled at once
+                if p < n:
+
+                    v = counts.index(n - p)
+                    perm[p:] = [v] * (n - p)
+
+                if excluded is None or not any(values[perm[q]] in excluded[q] for q in range(p, n)):
+
+                    yield tuple(map(value_of, perm))
+
+                rank += 1
+                p -= 1
+
+                if p < 0:
+
+                    return
+
+                counts[perm[p]] += 1
+                start = perm[p] + 1
+
+                continue
+
+            left = n - p
+            v = start
+
+            while v < k:
+
+                if counts[v]:
+
+                    sub = sizes[p] * counts[v] // left
+
+                    if excluded is None or values[v] not in excluded[p]:
+
+                        break
+
+                    rank += sub  # Skips every permutation of the excluded branch
+
+                v += 1
+
+            if v < k:
+
+                perm[p] = v
+                counts[v] -= 1
+                sizes[p + 1] = sub
+                p += 1
+                start = 0
+
+            else:
+
+                # Every branch at p is done, back to the previous position
+                p -= 1
+
+                if p < 0:
+
+                    return
+
+                counts[perm[p]] += 1
+                start = perm[p] + 1
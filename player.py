@@ -2,12 +2,19 @@
 # See main.py or examples.ipynb for example usages.
 
 import random
+import numpy as np
 from abc import ABC, abstractmethod
 from scsa import list_to_str, InsertColors
 
 
 class Player(ABC):
-    """Player for Mastermind"""
+    """Player for Mastermind
+
+    Guesses may be returned as strings or as packed codes (see codes.py). Random decisions are drawn from rng, which
+    Mastermind sets to the stream of every round (see randomness.py).
+    """
+
+    rng = random
 
     def __init__(self):
         """Constructor for Player"""
@@ -40,6 +47,49 @@ class Player(ABC):
         raise NotImplementedError
 
 
+class BatchPlayer(ABC):
+    """Player for Mastermind advancing many independent rounds in lockstep (see Mastermind.play_batch_tournament)
+
+    Guesses are arrays of color indices, one row per round, like packed codes (see codes.py).
+    """
+
+    def __init__(self):
+        """Constructor for BatchPlayer"""
+
+        self.player_name = ""
+
+    def new_batch(self, board_length: int, colors: list[str], scsa_name: str, num_rounds: int) -> None:
+        """Starts a batch of new rounds, numbered 0 to num_rounds - 1
+
+        Args:
+            board_length (int): Number of pegs of secret codes.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret codes.
+            num_rounds (int): Number of rounds of the batch.
+        """
+
+        pass
+
+    @abstractmethod
+    def make_guesses(
+        self, board_length: int, colors: list[str], scsa_name: str, states: np.ndarray
+    ) -> np.ndarray:
+        """Makes a guess for every round of the batch still being played
+
+        Args:
+            board_length (int): Number of pegs of secret codes.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret codes.
+            states (np.ndarray): (number of rounds still played, 4) array, one row (round number in batch, exact, other,
+                                 number of guesses so far) per round, the last three being the last response of the round.
+
+        Raises:
+            NotImplementedError: Function must be implemented by subclasses.
+        """
+
+        raise NotImplementedError
+
+
 class RandomFolks(Player):
     """Mastermind Player that makes random guesses"""
 
@@ -72,7 +122,7 @@ class RandomFolks(Player):
 
         scsa = InsertColors()
 
-        guess = scsa.generate_codes(board_length, colors)[0]
+        guess = scsa.generate_codes(board_length, colors, rng=self.rng)[0]
 
         return guess
 
@@ -107,7 +157,7 @@ class Boring(Player):
             str: Returns guess
         """
 
-        color = random.sample(colors, k=1)
+        color = self.rng.sample(colors, k=1)
 
         guess = list_to_str(color * board_length)
 
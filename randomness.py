@@ -0,0 +1,69 @@
+# File contains splittable random streams, so tournaments replay the same secret codes and random decisions.
+# See mastermind.py (Mastermind.run_tournament) for example usages.
+#
+# A tournament has one root stream. Round i draws its secret code from rng.code_stream(i) and the player draws its
+# random decisions from rng.player_stream(i), so every round plays out the same way whichever process plays it and
+# whatever rounds were played before it.
+
+import random
+import numpy as np
+
+
+def round_seed(seed, *keys) -> str:
+    """Seed of a stream split from the stream seeded with seed, independent of the streams split with other keys
+
+    Args:
+        seed (int or str): Seed of the stream being split.
+        keys: Keys identifying the new stream, e.g. the index of a round.
+
+    Returns:
+        str: Returns seed for random.seed (strings are hashed with SHA-512 by random.seed).
+    """
+
+    return ":".join(str(key) for key in (seed,) + keys)
+
+
+class RandomStream(random.Random):
+    """random.Random that remembers its seed, so it can be split into independent streams and pickled cheaply"""
+
+    def __init__(self, seed=None):
+        """Constructor for RandomStream
+
+        Args:
+            seed (int or str, optional): Seed of the stream. Defaults to None (a seed drawn from random, so seeding
+                                         random still makes the stream reproducible).
+        """
+
+        self.root_seed = random.randrange(2**32) if seed is None else seed
+
+        super().__init__(self.root_seed)
+
+    def __reduce__(self):
+
+        return (RandomStream, (self.root_seed,), self.getstate())
+
+    def split(self, *keys):
+        """Independent stream identified by keys (e.g. split("worker", 3)), the same one every time it is split."""
+
+        return RandomStream(round_seed(self.root_seed, *keys))
+
+    def code_stream(self, round_index: int):
+        """Stream the secret code of round round_index is drawn from (random.seed(round_seed(seed, round_index)))."""
+
+        return self.split(round_index)
+
+    def player_stream(self, round_index: int):
+        """Stream the player draws its random decisions from in round round_index."""
+
+        return self.split(round_index, "player")
+
+    def numpy(self) -> np.random.Generator:
+        """NumPy generator seeded from the stream, e.g. for SCSA.generate_codes_array."""
+
+        return np.random.default_rng(self.getrandbits(128))
+
+
+def as_stream(seed) -> RandomStream:
+    """Stream of a tournament from its seed (int, None for a random one, or a RandomStream already made)."""
+
+    return seed if isinstance(seed, RandomStream) else RandomStream(seed)
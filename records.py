@@ -0,0 +1,211 @@
+# File contains per-round records of a tournament and sinks writing them to file as the tournament runs.
+# See mastermind.py (Mastermind.play_tournament) and main.py (--records) for example usages.
+#
+# JSON lines: one {"round": int, "code": str or [colors], "result": str, "guesses": int, "time": seconds} per line.
+# Binary: RECORD_MAGIC, board_length (uint16), then one RECORD_FORMAT struct followed by the packed code per round.
+
+import json
+import struct
+import time
+from abc import ABC, abstractmethod
+from typing import NamedTuple
+from gamespec import GameSpec
+from latency import LatencyHistogram
+
+
+RECORD_MAGIC = b"MMRR"
+
+HEADER_FORMAT = "<4sH"  # Magic, board_length
+
+RECORD_FORMAT = "<IBHd"  # Round index, result value, guesses, time in seconds
+
+# Sinks flush at most this often (seconds), so records can be read while the tournament runs.
+FLUSH_INTERVAL = 1.0
+
+
+class RoundRecord(NamedTuple):
+    """Outcome of one round of a tournament."""
+
+    round_index: int  # Index of the round in the tournament, starting at 1
+    code: bytes  # Packed secret code (see codes.py)
+    result: object  # Result of the round (see mastermind.py)
+    guesses: int  # Number of guesses made
+    time: float  # Duration of the round in seconds
+    guess_latency: LatencyHistogram = None  # Latencies of the make_guess calls in nanoseconds, not written by sinks
+
+
+class RecordSink(ABC):
+    """Destination of the records of a tournament, written one round at a time"""
+
+    def __init__(self, file_name: str, spec: GameSpec, offset: int = None):
+        """Constructor for RecordSink
+
+        Args:
+            file_name (str): Name of file to write records to.
+            spec (GameSpec): Specification of the game, used to convert packed codes.
+            offset (int, optional): Size of the file when resuming a tournament (see checkpoint.py), records after it
+                                    are dropped and new ones appended. Defaults to None (file is truncated).
+        """
+
+        self.spec = spec
+        self.last_flush = time.monotonic()
+
+        if offset is None:
+
+            self.file = open(file_name, "wb")
+            self.write_header()
+
+        else:
+
+            self.file = open(file_name, "r+b")
+            self.file.truncate(offset)
+            self.file.seek(offset)
+
+    def write_header(self) -> None:
+
+        pass
+
+    @abstractmethod
+    def write_record(self, record: RoundRecord) -> None:
+
+        pass
+
+    def write(self, record: RoundRecord) -> None:
+        """Writes a record, flushing the file if FLUSH_INTERVAL has passed since the last flush."""
+
+        self.write_record(record)
+
+        now = time.monotonic()
+
+        if now - self.last_flush >= FLUSH_INTERVAL:
+
+            self.file.flush()
+            self.last_flush = now
+
+    def tell(self) -> int:
+        """Flushes the file and returns its size."""
+
+        self.file.flush()
+        self.last_flush = time.monotonic()
+
+        return self.file.tell()
+
+    def close(self) -> None:
+
+        self.file.close()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc) -> None:
+
+        self.close()
+
+
+class JsonlSink(RecordSink):
+    """Writes one JSON object per round"""
+
+    def write_record(self, record: RoundRecord) -> None:
+
+        code = self.spec.unpack(record.code)
+
+        self.file.write(
+            json.dumps(
+                {
+                    "round": record.round_index,
+                    "code": code if isinstance(code, str) else list(code),
+                    "result": record.result.name,
+                    "guesses": record.guesses,
+                    "time": record.time,
+                }
+            ).encode()
+            + b"\n"
+        )
+
+
+class BinarySink(RecordSink):
+    """Writes fixed size records: RECORD_FORMAT followed by the board_length bytes of the packed code"""
+
+    def __init__(self, file_name: str, spec: GameSpec, offset: int = None):
+
+        self.record_struct = struct.Struct(RECORD_FORMAT)
+
+        super().__init__(file_name, spec, offset)
+
+    def write_header(self) -> None:
+
+        self.file.write(struct.pack(HEADER_FORMAT, RECORD_MAGIC, self.spec.board_length))
+
+    def write_record(self, record: RoundRecord) -> None:
+
+        self.file.write(
+            self.record_struct.pack(record.round_index, record.result.value, record.guesses, record.time)
+            + record.code
+        )
+
+
+def open_sink(file_name: str, spec: GameSpec, offset: int = None) -> RecordSink:
+    """Opens a JSON lines sink if file_name ends with .jsonl, a binary sink otherwise (see RecordSink for offset)."""
+
+    if file_name.endswith(".jsonl"):
+
+        return JsonlSink(file_name, spec, offset)
+
+    return BinarySink(file_name, spec, offset)
+
+
+def read_records(file_name: str):
+    """Reads the records of a file written by a sink, including one still being written
+
+    Args:
+        file_name (str): Name of file written by JsonlSink or BinarySink.
+
+    Yields:
+        dict: Record with keys round, code (str or list of colors for JSON lines, packed bytes for binary),
+              result (name for JSON lines, value for binary), guesses and time.
+    """
+
+    file = open(file_name, "rb")
+    header = file.read(struct.calcsize(HEADER_FORMAT))
+
+    if header[:4] != RECORD_MAGIC:
+
+        file.seek(0)
+
+        for line in file:
+
+            # A partially written last line is left for the next read.
+            if line.endswith(b"\n"):
+
+                yield json.loads(line)
+
+        file.close()
+
+        return
+
+    board_length = struct.unpack(HEADER_FORMAT, header)[1]
+    record_struct = struct.Struct(RECORD_FORMAT)
+    size = record_struct.size + board_length
+
+    while True:
+
+        data = file.read(size)
+
+        if len(data) < size:
+
+            break
+
+        round_index, result, guesses, duration = record_struct.unpack_from(data)
+
+        yield {
+            "round": round_index,
+            "code": data[record_struct.size :],
+            "result": result,
+            "guesses": guesses,
+            "time": duration,
+        }
+
+    file.close()
+
+    return
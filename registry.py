@@ -0,0 +1,104 @@
+# File contains the lookup of players and SCSAs by name, shared by the command-line tools.
+# See main.py or sweep.py for example usages.
+
+import os
+import sys
+
+# The baseline players live in baselines/, root modules take precedence over them.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines"))
+
+from scsa import *
+from player import *
+from Endgame_B1 import *
+from Endgame_B2 import *
+#from Endgame_d3_2 import *
+#from Endgame_d3 import *
+from Endgame import *
+from Minimax import *
+from InfoGain import *
+
+## TEST
+from Endgame_beta import *
+## END
+
+
+PLAYER_NAMES = ["RandomFolks", "Boring", "Baseline1", "Baseline2", "Endgame", "Beta", "Minimax", "InfoGain"]
+
+# Players guessing strings of the letters A to Z, so they only play games of up to 26 colors (see make_colors).
+LETTER_PLAYER_NAMES = ["Boring", "Baseline1", "Beta"]
+
+# Players with a batch version (see BatchPlayer), played with Mastermind.play_batch_tournament.
+BATCH_PLAYER_NAMES = ["Baseline2"]
+
+SCSA_NAMES = [
+    "InsertColors",
+    "TwoColor",
+    "ABColor",
+    "TwoColorAlternating",
+    "OnlyOnce",
+    "FirstLast",
+    "UsuallyFewer",
+    "PreferFewer",
+]
+
+
+def make_colors(num_colors: int) -> list:
+    """Colors of a game: letters for up to 26 colors, integer colors beyond that."""
+
+    if num_colors <= 26:
+
+        return [chr(i) for i in range(65, 91)][:num_colors]
+
+    return list(range(num_colors))
+
+
+def str_to_player(player_name: str) -> Player:
+    if player_name == "RandomFolks":
+        player = RandomFolks()
+    elif player_name == "Boring":
+        player = Boring()
+    elif player_name == "Baseline1":
+        player = Baseline1()
+    elif player_name == "Baseline2":
+        player = Baseline2()
+    elif player_name == "Endgame":
+        player = Endgame()     
+    elif player_name == "Beta":
+        player = Endgame_Beta()   
+    elif player_name == "Minimax":
+        player = Minimax()
+    elif player_name == "InfoGain":
+        player = InfoGain()
+    else:
+        raise ValueError("Unrecognized Player.")
+    return player
+
+
+def str_to_batch_player(player_name: str) -> BatchPlayer:
+    if player_name == "Baseline2":
+        player = BatchBaseline2()
+    else:
+        raise ValueError("Unrecognized batch Player.")
+    return player
+
+
+def str_to_scsa(scsa_name: str) -> SCSA:
+    if scsa_name == "InsertColors":
+        scsa = InsertColors()
+    elif scsa_name == "TwoColor":
+        scsa = TwoColor()
+    elif scsa_name == "ABColor":
+        scsa = ABColor()
+    elif scsa_name == "TwoColorAlternating":
+        scsa = TwoColorAlternating()
+    elif scsa_name == "OnlyOnce":
+        scsa = OnlyOnce()
+    elif scsa_name == "FirstLast":
+        scsa = FirstLast()
+    elif scsa_name == "UsuallyFewer":
+        scsa = UsuallyFewer()
+    elif scsa_name == "PreferFewer":
+        scsa = PreferFewer()
+    else:
+        raise ValueError("Unrecognized SCSA.")
+    return scsa
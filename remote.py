@@ -0,0 +1,324 @@
+# File contains a line-delimited JSON protocol to run players in separate processes, and an asyncio tournament
+# driver keeping many rounds in flight across several player processes.
+#
+# Every request and reply is one JSON object per line.
+#   engine -> player: {"id": round, "board_length": int, "colors": [...], "scsa_name": str, "last_response": [exact, other, guesses]}
+#   player -> engine: {"id": round, "guess": str or [colors], "elapsed": seconds spent in make_guess}
+#   engine -> player: {"id": round, "end": true}  (round is over, the player process forgets it)
+# A new round starts whenever last_response[2] is 0, the player process then creates a new player for it. The first
+# request of a round also holds "seed", the seed of the tournament: the player draws its random decisions from
+# RandomStream(seed).player_stream(round), as in Mastermind.run_tournament.
+#
+# Example:
+#   python3 remote.py play --board_length 7 --num_colors 5 --player_name Endgame --scsa_name InsertColors \
+#       --num_rounds 1000 --processes 4 --in_flight 64 --seed 1
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from mastermind import Mastermind, Result, Results
+from randomness import RandomStream, as_stream
+from records import RoundRecord, RecordSink, open_sink
+from registry import PLAYER_NAMES, SCSA_NAMES, make_colors, str_to_player, str_to_scsa
+
+
+def serve(player_name: str, stdin=sys.stdin, stdout=sys.stdout) -> None:
+    """Answers guess requests for any number of interleaved rounds until stdin is closed
+
+    Args:
+        player_name (str): Name of player to play with (see registry.py).
+        stdin (file, optional): Stream of requests. Defaults to sys.stdin.
+        stdout (file, optional): Stream of replies. Defaults to sys.stdout.
+    """
+
+    players = {}  # Round id -> player of that round
+
+    for line in stdin:
+
+        request = json.loads(line)
+        round_id = request["id"]
+
+        if request.get("end"):
+
+            players.pop(round_id, None)
+
+            continue
+
+        last_response = tuple(request["last_response"])
+
+        if last_response[2] == 0 or round_id not in players:
+
+            players[round_id] = str_to_player(player_name)
+
+            if "seed" in request:
+
+                players[round_id].rng = RandomStream(request["seed"]).player_stream(round_id)
+
+        colors = request["colors"]
+
+        start = time.perf_counter()
+        guess = players[round_id].make_guess(
+            request["board_length"], colors, request["scsa_name"], last_response
+        )
+        elapsed = time.perf_counter() - start
+
+        if isinstance(guess, bytes):
+
+            guess = [colors[peg] for peg in guess]
+
+            if all(isinstance(color, str) for color in colors):
+
+                guess = "".join(guess)
+
+        stdout.write(json.dumps({"id": round_id, "guess": guess, "elapsed": elapsed}) + "\n")
+        stdout.flush()
+
+    return
+
+
+class RemotePlayer:
+    """Connection to a player process speaking the protocol of this file"""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        """Constructor for RemotePlayer
+
+        Args:
+            process (asyncio.subprocess.Process): Player process, with pipes for stdin and stdout.
+        """
+
+        self.process = process
+        self.pending = {}  # Round id -> future of the reply to its outstanding request
+        self.reader = asyncio.ensure_future(self.read_replies())
+
+    @classmethod
+    async def start(cls, command: list):
+        """Starts a player process running command."""
+
+        process = await asyncio.create_subprocess_exec(
+            *command, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE
+        )
+
+        return cls(process)
+
+    async def read_replies(self) -> None:
+        """Resolves the future of every reply as it arrives."""
+
+        while True:
+
+            line = await self.process.stdout.readline()
+
+            if not line:
+
+                break
+
+            reply = json.loads(line)
+            self.pending.pop(reply["id"]).set_result(reply)
+
+        for future in self.pending.values():
+
+            future.set_exception(EOFError("Player process exited."))
+
+        return
+
+    def send(self, message: dict) -> None:
+
+        self.process.stdin.write((json.dumps(message) + "\n").encode())
+
+    async def make_guess(
+        self, round_id: int, board_length: int, colors: list, scsa_name: str, last_response: tuple, seed=None
+    ) -> tuple:
+        """Requests a guess for a round, seed (the seed of the tournament) is sent with the first request of a round
+
+        Returns:
+            tuple[str or list, float, float]: (guess, seconds spent in make_guess by the player,
+                                               seconds of protocol overhead around it).
+        """
+
+        future = asyncio.get_running_loop().create_future()
+        self.pending[round_id] = future
+
+        start = time.perf_counter()
+
+        request = {
+            "id": round_id,
+            "board_length": board_length,
+            "colors": colors,
+            "scsa_name": scsa_name,
+            "last_response": list(last_response),
+        }
+
+        if last_response[2] == 0 and seed is not None:
+
+            request["seed"] = seed
+
+        self.send(request)
+        await self.process.stdin.drain()
+
+        reply = await future
+        round_trip = time.perf_counter() - start
+
+        return (reply["guess"], reply["elapsed"], max(0.0, round_trip - reply["elapsed"]))
+
+    def end_round(self, round_id: int) -> None:
+
+        self.send({"id": round_id, "end": True})
+
+    async def close(self) -> None:
+
+        self.process.stdin.close()
+        await self.process.wait()
+        await self.reader
+
+
+async def play_remote_round(
+    mastermind: Mastermind, remote: RemotePlayer, scsa, round_index: int, rng: RandomStream, overhead: list
+) -> tuple:
+    """Plays one round against a player process
+
+    Only the time the player spends in make_guess is charged to the round, the protocol overhead is added to
+    overhead[0] instead.
+
+    Returns:
+        RoundRecord: Returns record of the round, its time is the time charged to the player.
+    """
+
+    round = mastermind.make_round(scsa, round_index, rng)
+    colors = list(round.colors)
+    player_response = (0, 0, 0)
+    result = Result.LOSS
+
+    while round.guesses < round.guess_cutoff:
+
+        guess, elapsed, protocol = await remote.make_guess(
+            round_index, round.board_length, colors, round.scsa_name, player_response, rng.root_seed
+        )
+
+        round.time_used += elapsed
+        round.guess_latency.record(int(elapsed * 1e9))
+        overhead[0] += protocol
+
+        if isinstance(guess, list):
+
+            guess = tuple(guess)
+
+        response = round.respond_to_guess(guess)
+        player_response = response[1:]  # Remove result element
+
+        if response[0] != Result.VALID:
+
+            result = response[0]
+
+            break
+
+    remote.end_round(round_index)
+
+    return RoundRecord(round_index, round.answer, result, round.guesses, round.time_used, round.guess_latency)
+
+
+async def play_remote_tournament(
+    mastermind: Mastermind,
+    command: list,
+    scsa,
+    num_rounds: int,
+    processes: int = 2,
+    in_flight: int = 16,
+    seed: int = None,
+    sink: RecordSink = None,
+) -> tuple:
+    """Plays a tournament against player processes, keeping many rounds in flight at once
+
+    Rounds are recorded in order with the same rules as Mastermind.play_tournament, each charged only with the
+    time its player spent in make_guess.
+
+    Args:
+        mastermind (Mastermind): Game the tournament is played on.
+        command (list[str]): Command starting a player process (e.g. python3 remote.py serve --player_name Endgame).
+        scsa (SCSA): SCSA used to generate secret codes for player to guess.
+        num_rounds (int): Number of rounds of Mastermind to play.
+        processes (int, optional): Number of player processes. Defaults to 2.
+        in_flight (int, optional): Number of rounds played at once across all processes. Defaults to 16.
+        seed (int or RandomStream, optional): Seed of the secret codes of the tournament. Defaults to None.
+        sink (RecordSink, optional): Sink every recorded round is written to, in round order. Defaults to None.
+
+    Returns:
+        tuple[Results, float]: (results of the tournament, total protocol overhead in seconds).
+    """
+
+    remotes = [await RemotePlayer.start(command) for _ in range(processes)]
+    slots = asyncio.Semaphore(in_flight)
+    overhead = [0.0]
+    results = Results()
+    finished = {}  # Round index -> record of a round finished before an earlier one
+    rng = as_stream(seed)
+    progress = {"next": 1, "recording": True}
+
+    async def play(round_index: int) -> None:
+
+        async with slots:
+
+            remote = remotes[round_index % processes]
+            finished[round_index] = await play_remote_round(mastermind, remote, scsa, round_index, rng, overhead)
+
+        # Rounds are recorded in order as soon as every earlier round is done.
+        while progress["recording"] and progress["next"] in finished:
+
+            record = finished.pop(progress["next"])
+            progress["recording"] = mastermind.record_round(results, record, sink)
+            progress["next"] += 1
+
+    await asyncio.gather(*[play(round) for round in range(1, num_rounds + 1)])
+
+    for remote in remotes:
+
+        await remote.close()
+
+    return (results, overhead[0])
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Run Mastermind players in separate processes.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="answer guess requests on stdin/stdout")
+    serve_parser.add_argument("--player_name", nargs="?", type=str, required=True, choices=PLAYER_NAMES)
+
+    play_parser = subparsers.add_parser("play", help="play a tournament against player processes")
+    play_parser.add_argument("--board_length", nargs="?", type=int, required=True)
+    play_parser.add_argument("--num_colors", nargs="?", type=int, required=True, choices=range(1, 255))
+    play_parser.add_argument("--player_name", nargs="?", type=str, required=True, choices=PLAYER_NAMES)
+    play_parser.add_argument("--scsa_name", nargs="?", type=str, required=True, choices=SCSA_NAMES)
+    play_parser.add_argument("--num_rounds", nargs="?", type=int, required=True)
+    play_parser.add_argument("--processes", nargs="?", type=int, default=2)
+    play_parser.add_argument("--in_flight", nargs="?", type=int, default=16)
+    play_parser.add_argument("--seed", nargs="?", type=int, default=None)
+    play_parser.add_argument("--records", nargs="?", type=str, default=None, help="file to stream round records to")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+
+        serve(args.player_name)
+
+    else:
+
+        mastermind = Mastermind(args.board_length, make_colors(args.num_colors))
+        scsa = str_to_scsa(args.scsa_name)
+        command = [sys.executable, __file__, "serve", "--player_name", args.player_name]
+
+        sink = open_sink(args.records, mastermind.spec) if args.records else None
+
+        results, overhead = asyncio.run(
+            play_remote_tournament(
+                mastermind, command, scsa, args.num_rounds, args.processes, args.in_flight, args.seed, sink
+            )
+        )
+
+        if sink is not None:
+
+            sink.close()
+
+        mastermind.print_results(str_to_player(args.player_name), scsa.name, results, args.num_rounds)
+        print("Protocol overhead:", overhead, "seconds summed over all requests (not charged to the player)")
@@ -0,0 +1,179 @@
+# File contains tools to query game traces (see gametrace.py) and to replay a traced round with a player.
+# Examples:
+#   python3 main.py --board_length 7 --num_colors 5 --player_name Endgame --scsa_name InsertColors --num_rounds 1000 \
+#       --seed 1 --trace games.trace
+#   python3 replay.py stats games.trace
+#   python3 replay.py show games.trace --round 42
+#   python3 replay.py replay games.trace --round 42 --player_name Endgame
+
+import argparse
+import numpy as np
+from gametrace import read_header, open_trace, iter_chunks
+from gamespec import GameSpec
+from latency import LatencyHistogram
+from randomness import RandomStream
+from registry import PLAYER_NAMES, make_colors, str_to_player
+
+
+def trace_stats(file_name: str) -> dict:
+    """Computes statistics of every guess of a trace, reading it a chunk at a time
+
+    Args:
+        file_name (str): Name of file written by TraceWriter.
+
+    Returns:
+        dict: Returns statistics with keys rounds, guesses, wins, mean_guesses, rounds_by_guesses
+              (number of guesses -> number of rounds), exact (exact -> number of guesses) and latency (LatencyHistogram).
+    """
+
+    header = read_header(file_name)
+    board_length = header["board_length"]
+    latency = LatencyHistogram()
+    guess_numbers = np.zeros(0, dtype=np.int64)  # guess_numbers[k] = number of rounds with a guess k
+    exact = np.zeros(board_length + 1, dtype=np.int64)
+
+    for chunk in iter_chunks(open_trace(file_name)):
+
+        counts = np.bincount(chunk["guess_number"])
+
+        if len(counts) > len(guess_numbers):
+
+            guess_numbers = np.concatenate((guess_numbers, np.zeros(len(counts) - len(guess_numbers), dtype=np.int64)))
+
+        guess_numbers[: len(counts)] += counts
+        exact += np.bincount(np.minimum(chunk["exact"], board_length), minlength=board_length + 1)
+        latency.record_array(chunk["latency"])
+
+    rounds = int(guess_numbers[1]) if len(guess_numbers) > 1 else 0
+
+    # Rounds of exactly k guesses have a guess k but no guess k + 1.
+    ending = guess_numbers - np.append(guess_numbers[1:], 0)
+
+    return {
+        "rounds": rounds,
+        "guesses": latency.count,
+        "wins": int(exact[board_length]),
+        "mean_guesses": latency.count / rounds if rounds else 0.0,
+        "rounds_by_guesses": {k: int(n) for k, n in enumerate(ending) if k > 0 and n > 0},
+        "exact": {k: int(n) for k, n in enumerate(exact) if n > 0},
+        "latency": latency,
+    }
+
+
+def round_records(file_name: str, round_id: int) -> np.ndarray:
+    """Records of every guess of a round, in guess order."""
+
+    found = [chunk[chunk["round"] == round_id] for chunk in iter_chunks(open_trace(file_name))]
+    records = np.concatenate(found) if found else np.zeros(0)
+
+    return records[np.argsort(records["guess_number"], kind="stable")] if len(records) else records
+
+
+def replay_round(file_name: str, round_id: int, player_name: str) -> tuple:
+    """Feeds the recorded responses of a round to a new player and compares its guesses with the recorded ones
+
+    If the trace knows the seed of the tournament, the player draws from the stream it drew from when the round was
+    played (see randomness.py), so it makes the same random decisions.
+
+    Args:
+        file_name (str): Name of file written by TraceWriter.
+        round_id (int): Id of the round to replay.
+        player_name (str): Name of player to replay with (see registry.py).
+
+    Returns:
+        tuple[int, list]: Returns (number of the first guess that differs, 0 if none,
+                                   list of (guess number, recorded guess, replayed guess)).
+    """
+
+    header = read_header(file_name)
+    board_length = header["board_length"]
+    colors = make_colors(header["num_colors"])
+    spec = GameSpec(board_length, colors)
+    records = round_records(file_name, round_id)
+
+    player = str_to_player(player_name)
+
+    if header["seed"] is not None:
+
+        player.rng = RandomStream(header["seed"]).player_stream(round_id)
+    player_response = (0, 0, 0)
+    guesses = []
+    first_difference = 0
+
+    for record in records:
+
+        guess = spec.pack(player.make_guess(board_length, colors, header["scsa_name"], player_response))
+        recorded = record["guess"].tobytes()
+        guesses.append((int(record["guess_number"]), recorded, guess))
+
+        if guess != recorded and first_difference == 0:
+
+            first_difference = int(record["guess_number"])
+
+        player_response = (int(record["exact"]), int(record["other"]), int(record["guess_number"]))
+
+    return (first_difference, guesses)
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Query and replay Mastermind game traces.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    stats_parser = subparsers.add_parser("stats", help="statistics of every guess of a trace")
+    stats_parser.add_argument("trace", type=str)
+
+    show_parser = subparsers.add_parser("show", help="guesses and responses of a round")
+    show_parser.add_argument("trace", type=str)
+    show_parser.add_argument("--round", nargs="?", type=int, required=True)
+
+    replay_parser = subparsers.add_parser("replay", help="replay a round with a player")
+    replay_parser.add_argument("trace", type=str)
+    replay_parser.add_argument("--round", nargs="?", type=int, required=True)
+    replay_parser.add_argument("--player_name", nargs="?", type=str, required=True, choices=PLAYER_NAMES)
+
+    args = parser.parse_args()
+    header = read_header(args.trace)
+    spec = GameSpec(header["board_length"], make_colors(header["num_colors"]))
+
+    print("Game:", header["board_length"], "Pegs", header["num_colors"], "Colors")
+    print("SCSA Name:", header["scsa_name"], "| Seed:", header["seed"])
+
+    if args.command == "stats":
+
+        stats = trace_stats(args.trace)
+
+        print("Rounds:", stats["rounds"], "| Guesses:", stats["guesses"], "| Wins:", stats["wins"])
+        print("Mean guesses:", format(stats["mean_guesses"], ".3f"))
+        print("Rounds by guesses:", stats["rounds_by_guesses"])
+        print("Guesses by exact:", stats["exact"])
+        print("make_guess:", stats["latency"])
+
+    elif args.command == "show":
+
+        for record in round_records(args.trace, args.round):
+
+            print(
+                record["guess_number"],
+                spec.unpack(record["guess"].tobytes()),
+                record["exact"],
+                record["other"],
+                format(record["latency"] / 1e6, ".3f"),
+                "ms",
+            )
+
+    else:
+
+        first_difference, guesses = replay_round(args.trace, args.round, args.player_name)
+
+        for guess_number, recorded, replayed in guesses:
+
+            print(guess_number, spec.unpack(recorded), spec.unpack(replayed), "" if recorded == replayed else "<-")
+
+        if first_difference:
+
+            print("Guesses differ from guess", first_difference)
+
+        else:
+
+            print("All", len(guesses), "guesses are identical")
@@ -1,8 +1,12 @@
 # File contains implementation of the secret code generating algorithms.
 # See main.py or examples.ipynb for example usage.
 
+import math
 import random
+import numpy as np
 from abc import ABC, abstractmethod
+from gamespec import GameSpec
+from codefile import write_code_file
 
 
 def list_to_str(arr: list[str]) -> str:
@@ -43,8 +47,107 @@ def read_from_file(file_name: str) -> list[str]:
     return codes
 
 
+def sample_colors(rng: np.random.Generator, num_codes: int, num_colors: int, k: int) -> np.ndarray:
+    """Picks k different colors at random for every code, like random.sample(range(num_colors), k) per code
+
+    The j-th color is drawn among the num_colors - j colors left, then moved past the colors already picked.
+
+    Args:
+        rng (np.random.Generator): Generator to draw from.
+        num_codes (int): Number of codes.
+        num_colors (int): Number of colors that can be picked.
+        k (int): Number of colors to pick per code, at most num_colors.
+
+    Returns:
+        np.ndarray: Returns (num_codes, k) uint8 array of color indices.
+    """
+
+    picked = np.empty((num_codes, k), dtype=np.int64)
+
+    for j in range(k):
+
+        color = rng.integers(0, num_colors - j, num_codes)
+
+        for previous in np.sort(picked[:, :j], axis=1).T:
+
+            color += previous <= color
+
+        picked[:, j] = color
+
+    return picked.astype(np.uint8)
+
+
+def sample_positions(rng: np.random.Generator, num_codes: int, length: int) -> tuple:
+    """Picks two different positions at random for every code, like random.sample(range(length), k=2) per code."""
+
+    first = rng.integers(0, length, num_codes)
+    second = (first + rng.integers(1, length, num_codes)) % length
+
+    return (first, second)
+
+
+def digits_rank(pegs, base: int) -> int:
+    """Value of pegs as digits in base base, the first peg being the most significant (see feedback.code_rank)."""
+
+    rank = 0
+
+    for peg in pegs:
+
+        rank = rank * base + peg
+
+    return rank
+
+
+def digits_unrank(rank: int, length: int, base: int) -> list:
+    """Inverse of digits_rank, the length digits in base base of rank."""
+
+    pegs = [0] * length
+
+    for i in range(length - 1, -1, -1):
+
+        rank, pegs[i] = divmod(rank, base)
+
+    return pegs
+
+
+def log_mixture(terms: list) -> float:
+    """Logarithm of sum(weight * exp(log_p)) for every (weight, log_p) of terms, without underflow."""
+
+    logs = [math.log(weight) + log_p for weight, log_p in terms if weight > 0 and log_p > -math.inf]
+
+    if not logs:
+
+        return -math.inf
+
+    top = max(logs)
+
+    return top + math.log(sum(math.exp(value - top) for value in logs))
+
+
+def subset_log_prior(code: bytes, num_colors: int, k: int) -> float:
+    """Log probability of code when k different colors are picked at random and every peg picks one of them."""
+
+    used = len(set(code))
+
+    if used > k:
+
+        return -math.inf
+
+    # Picked colors must include the used ones
+    picked = math.log(math.comb(num_colors - used, k - used)) - math.log(math.comb(num_colors, k))
+
+    return picked - len(code) * math.log(k)
+
+
 class SCSA(ABC):
-    """Secret-code selection algorithm"""
+    """Secret-code selection algorithm
+
+    Besides generating codes, every SCSA describes its support (the codes it can generate): support_size in closed
+    form, rank and unrank between codes and 0 .. support_size - 1, iter_support in rank order and log_prior, the log
+    probability of generating a code. Codes are packed codes (see codes.py).
+    """
+
+    min_colors = 1  # Fewest colors the SCSA generates codes with
 
     def __init__(self):
         """Constructor for SCSA"""
@@ -52,21 +155,172 @@ class SCSA(ABC):
         self.name = ""
 
     @abstractmethod
+    def generate_packed_codes(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: random.Random = None
+    ) -> list[bytes]:
+        """Generate packed codes (see codes.py) based on secret-code selection algorithm
+
+        Args:
+            length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that can be used to generate a code.
+            num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            rng (random.Random, optional): Stream to draw from (see randomness.py). Defaults to None (random).
+
+        Raises:
+            NotImplementedError: Function must be implemented by children classes.
+        """
+
+        raise NotImplementedError
+
     def generate_codes(
-        self, length: int, colors: list[str], num_codes: int = 1
+        self, length: int, colors: list[str], num_codes: int = 1, rng: random.Random = None
     ) -> list[str]:
         """Generate codes based on secret-code selection algorithm
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
-            colors (list[str]): All possible colors that can be used to generate a code.
+            colors (list[str], list[int] or GameSpec): All possible colors that can be used to generate a code.
             num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            rng (random.Random, optional): Stream to draw from (see randomness.py). Defaults to None (random).
+
+        Returns:
+            list[str]: Returns code(s) generated from SCSA (tuples of colors for integer colors).
+        """
+
+        spec = colors if isinstance(colors, GameSpec) else GameSpec.of(length, tuple(colors))
+
+        return [
+            spec.unpack(code)
+            for code in self.generate_packed_codes(length, spec.num_colors, num_codes, rng)
+        ]
+
+    def generate_codes_array(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Generate codes as an array of color indices, drawn from the same distribution as generate_packed_codes
+
+        Children classes draw every code at once with NumPy, this version stacks generate_packed_codes.
+
+        Args:
+            length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that can be used to generate a code.
+            num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            rng (np.random.Generator, optional): Generator to draw from, e.g. RandomStream.numpy(). Defaults to None
+                                                 (a new unseeded generator).
+
+        Returns:
+            np.ndarray: Returns (num_codes, length) uint8 array, one packed code per row (no rows if the SCSA can not
+                        generate codes with num_colors colors).
+        """
+
+        codes = self.generate_packed_codes(length, num_colors, num_codes)
+
+        return np.frombuffer(b"".join(codes), dtype=np.uint8).reshape(len(codes), length)
+
+    def support_size(self, length: int, num_colors: int) -> int:
+        """Number of different codes the SCSA can generate
+
+        Every code of length pegs here, children classes with fewer codes override it (with rank and unrank).
+
+        Args:
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that can be used to generate a code.
+
+        Returns:
+            int: Returns number of codes in the support.
+        """
+
+        return num_colors**length if num_colors >= self.min_colors else 0
+
+    def check_code(self, code: bytes, num_colors: int) -> bytes:
+        """Raises ValueError if code uses colors outside the game or the game has too few colors for the SCSA."""
+
+        code = bytes(code)
+
+        if num_colors < self.min_colors or any(peg >= num_colors for peg in code):
+
+            raise ValueError("Code " + repr(code) + " can not be generated by " + self.name + ".")
+
+        return code
+
+    def rank(self, code: bytes, num_colors: int) -> int:
+        """Position of a code in the support of the SCSA
+
+        Args:
+            code (bytes): Packed code.
+            num_colors (int): Number of colors that can be used to generate a code.
 
         Raises:
-            NotImplementedError: Function must be implemented by children classes.
+            ValueError: Raised if the SCSA can not generate code.
+
+        Returns:
+            int: Returns rank of code, between 0 and support_size - 1.
         """
 
-        raise NotImplementedError
+        return digits_rank(self.check_code(code, num_colors), num_colors)
+
+    def unrank(self, rank: int, length: int, num_colors: int) -> bytes:
+        """Code at a position of the support of the SCSA, inverse of rank
+
+        Args:
+            rank (int): Position of the code, between 0 and support_size - 1.
+            length (int): The length of the code (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that can be used to generate a code.
+
+        Raises:
+            ValueError: Raised if rank is outside the support.
+
+        Returns:
+            bytes: Returns packed code.
+        """
+
+        if not 0 <= rank < self.support_size(length, num_colors):
+
+            raise ValueError("Rank " + str(rank) + " is outside the support of " + self.name + ".")
+
+        return bytes(digits_unrank(rank, length, num_colors))
+
+    def iter_support(self, length: int, num_colors: int, start: int = 0, stop: int = None):
+        """Lazily enumerates the support of the SCSA in rank order
+
+        Args:
+            length (int): The length of the codes (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that can be used to generate a code.
+            start (int, optional): Rank of the first code. Defaults to 0.
+            stop (int, optional): Rank after the last code. Defaults to None (support_size).
+
+        Yields:
+            bytes: Packed code.
+        """
+
+        size = self.support_size(length, num_colors)
+
+        for rank in range(start, size if stop is None else min(stop, size)):
+
+            yield self.unrank(rank, length, num_colors)
+
+    def log_prior(self, code: bytes, num_colors: int) -> float:
+        """Natural logarithm of the probability that the SCSA generates a code
+
+        Uniform over the support here, children classes with another distribution override it.
+
+        Args:
+            code (bytes): Packed code.
+            num_colors (int): Number of colors that can be used to generate a code.
+
+        Returns:
+            float: Returns log probability of code, -inf if the SCSA can not generate it.
+        """
+
+        try:
+
+            self.rank(code, num_colors)
+
+        except ValueError:
+
+            return -math.inf
+
+        return -math.log(self.support_size(len(code), num_colors))
 
     def write_to_file(self, codes: list[str], length: int, num_colors: int) -> None:
         """Writes codes to a file
@@ -89,6 +343,21 @@ class SCSA(ABC):
 
         return
 
+    def write_to_code_file(self, codes: list[bytes], length: int, num_colors: int) -> None:
+        """Writes packed codes (e.g. from generate_packed_codes) to a packed code file (see codefile.py)
+
+        Args:
+            codes (list[bytes]): List of packed codes to write to file.
+            length (int): The length of the generated codes (same as number of pegs for an instance of Mastermind).
+            num_colors (int): Number of colors that could be used to generate a code.
+        """
+
+        file_name = self.name + "_" + str(length) + "_" + str(num_colors) + ".codes"
+
+        write_code_file(file_name, codes, GameSpec.of(length, tuple(range(num_colors))), self.name)
+
+        return
+
     def generate_and_write_to_file(
         self, length: int, colors: list[str], num_codes: int = 100
     ) -> None:
@@ -119,20 +388,25 @@ class InsertColors(SCSA):
 
         self.name = "InsertColors"
 
-    def generate_codes(
-        self, length: int, colors: list[str], num_codes: int = 1
-    ) -> list[str]:
-        """Generate codes based on InsertColors SCSA
+    def generate_packed_codes(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: random.Random = None
+    ) -> list[bytes]:
+        """Generate packed codes based on InsertColors SCSA
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
-            colors (list[str]): All possible colors that can be used to generate a code.
+            num_colors (int): Number of colors that can be used to generate a code.
             num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            rng (random.Random, optional): Stream to draw from. Defaults to None (random).
 
         Returns:
-            list[str]: Returns code(s) generated from SCSA.
+            list[bytes]: Returns packed code(s) generated from SCSA.
         """
 
+        rng = random if rng is None else rng
+
+        colors = range(num_colors)  # Packed codes store the index of each color
+
         if len(colors) < 1:
 
             return []
@@ -141,33 +415,53 @@ class InsertColors(SCSA):
 
         for _ in range(num_codes):
 
-            codes.append(list_to_str(random.choices(colors, k=length)))
+            codes.append(bytes(rng.choices(colors, k=length)))
 
         return codes
 
+    def generate_codes_array(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Generate codes based on InsertColors SCSA as an array, see SCSA.generate_codes_array"""
+
+        rng = np.random.default_rng() if rng is None else rng
+
+        if num_colors < 1:
+
+            return np.zeros((0, length), dtype=np.uint8)
+
+        return rng.integers(0, num_colors, (num_codes, length), dtype=np.uint8)
+
 
 class TwoColor(SCSA):
     """SCSA that generates codes containing only two randomly chosen colors"""
 
+    min_colors = 2
+
     def __init__(self):
         """Constructor for TwoColor"""
 
         self.name = "TwoColor"
 
-    def generate_codes(
-        self, length: int, colors: list[str], num_codes: int = 1
-    ) -> list[str]:
-        """Generate codes based on TwoColor SCSA
+    def generate_packed_codes(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: random.Random = None
+    ) -> list[bytes]:
+        """Generate packed codes based on TwoColor SCSA
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
-            colors (list[str]): All possible colors that can be used to generate a code.
+            num_colors (int): Number of colors that can be used to generate a code.
             num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            rng (random.Random, optional): Stream to draw from. Defaults to None (random).
 
         Returns:
-            list[str]: Returns code(s) generated from SCSA.
+            list[bytes]: Returns packed code(s) generated from SCSA.
         """
 
+        rng = random if rng is None else rng
+
+        colors = range(num_colors)  # Packed codes store the index of each color
+
         if len(colors) < 2:
 
             return []
@@ -176,13 +470,13 @@ class TwoColor(SCSA):
 
         for _ in range(num_codes):
 
-            usable_colors = random.sample(colors, k=2)
+            usable_colors = rng.sample(colors, k=2)
 
             # Create 'uninitialized' code as list
-            code = [0] * length
+            code = [None] * length
 
             # Randomly pick two spots in string
-            indicies = random.sample(range(0, length), k=2)
+            indicies = rng.sample(range(0, length), k=2)
 
             # Set those two spots in the string to the two colors
             # This guarantees both colors are used at least once
@@ -192,48 +486,137 @@ class TwoColor(SCSA):
             # Set rest of spots in code to one of the two colors randomly
             for i in range(length):
 
-                if code[i] == 0:
+                if code[i] is None:
 
-                    code[i] = random.choice(usable_colors)
+                    code[i] = rng.choice(usable_colors)
 
-            codes.append(list_to_str(code))
+            codes.append(bytes(code))
 
         return codes
 
+    def generate_codes_array(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Generate codes based on TwoColor SCSA as an array, see SCSA.generate_codes_array"""
+
+        rng = np.random.default_rng() if rng is None else rng
+
+        if num_colors < 2:
+
+            return np.zeros((0, length), dtype=np.uint8)
+
+        usable_colors = sample_colors(rng, num_codes, num_colors, 2)
+
+        rows = np.arange(num_codes)
+        first, second = sample_positions(rng, num_codes, length)
+
+        # Every peg picks one of the two colors, the two positions guarantee both colors are used at least once
+        picks = rng.integers(0, 2, (num_codes, length))
+        picks[rows, first] = 0
+        picks[rows, second] = 1
+
+        return usable_colors[rows[:, None], picks]
+
+    def support_size(self, length: int, num_colors: int) -> int:
+        """Pairs of colors times patterns of two colors both used, see SCSA.support_size"""
+
+        return math.comb(num_colors, 2) * (2**length - 2) if num_colors >= 2 and length >= 2 else 0
+
+    def rank(self, code: bytes, num_colors: int) -> int:
+        """Rank of the pair of colors, then of the pattern of the second color, see SCSA.rank"""
+
+        code = self.check_code(code, num_colors)
+        pair = sorted(set(code))
+
+        if len(pair) != 2:
+
+            raise ValueError("Code " + repr(code) + " can not be generated by " + self.name + ".")
+
+        low, high = pair
+        pair_rank = math.comb(num_colors, 2) - math.comb(num_colors - low, 2) + high - low - 1
+        pattern = digits_rank([peg == high for peg in code], 2)
+
+        return pair_rank * (2 ** len(code) - 2) + pattern - 1
+
+    def unrank(self, rank: int, length: int, num_colors: int) -> bytes:
+
+        if not 0 <= rank < self.support_size(length, num_colors):
+
+            raise ValueError("Rank " + str(rank) + " is outside the support of " + self.name + ".")
+
+        pair_rank, pattern = divmod(rank, 2**length - 2)
+        low = 0
+
+        # Pairs starting with color low come after the pairs starting with a lower color
+        while pair_rank >= num_colors - low - 1:
+
+            pair_rank -= num_colors - low - 1
+            low += 1
+
+        high = low + 1 + pair_rank
+
+        return bytes(high if bit else low for bit in digits_unrank(pattern + 1, length, 2))
+
+    def log_prior(self, code: bytes, num_colors: int) -> float:
+        """Log probability of code, higher for codes using both colors about as often (see generate_packed_codes)"""
+
+        try:
+
+            self.rank(code, num_colors)
+
+        except ValueError:
+
+            return -math.inf
+
+        length = len(code)
+        count = code.count(code[0])
+
+        # Both picked positions (one per color, in either order) must hold their color, every other peg has two choices.
+        return (
+            math.log(2 * count * (length - count))
+            - math.log(length * (length - 1))
+            - (length - 2) * math.log(2) - math.log(num_colors * (num_colors - 1))
+        )
+
 
 class ABColor(SCSA):
     """SCSA that generates codes containing only "A"s and "B"s"""
 
+    min_colors = 2
+
     def __init__(self):
         """Constructor for ABColor"""
 
         self.name = "ABColor"
 
-    def generate_codes(
-        self, length: int, colors: list[str], num_codes: int = 1
-    ) -> list[str]:
-        """Generate codes based on ABColor SCSA
+    def generate_packed_codes(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: random.Random = None
+    ) -> list[bytes]:
+        """Generate packed codes based on ABColor SCSA
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
-            colors (list[str]): All possible colors that can be used to generate a code.
+            num_colors (int): Number of colors that can be used to generate a code.
             num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            rng (random.Random, optional): Stream to draw from. Defaults to None (random).
 
         Returns:
-            list[str]: Returns code(s) generated from SCSA.
+            list[bytes]: Returns packed code(s) generated from SCSA.
         """
 
-        usable_colors = ["A", "B"]
+        rng = random if rng is None else rng
+
+        usable_colors = [0, 1]  # "A" and "B"
 
         codes = []
 
         for _ in range(num_codes):
 
             # Create 'uninitialized' code as list
-            code = [0] * length
+            code = [None] * length
 
             # Randomly pick two spots in string
-            indicies = random.sample(range(0, length), k=2)
+            indicies = rng.sample(range(0, length), k=2)
 
             # Set those two spots in the string to the two colors
             # This guarantees both colors are used at least once
@@ -243,37 +626,108 @@ class ABColor(SCSA):
             # Set rest of spots in code to one of the two colors randomly
             for i in range(length):
 
-                if code[i] == 0:
+                if code[i] is None:
 
-                    code[i] = random.choice(usable_colors)
+                    code[i] = rng.choice(usable_colors)
 
-            codes.append(list_to_str(code))
+            codes.append(bytes(code))
 
         return codes
 
+    def generate_codes_array(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Generate codes based on ABColor SCSA as an array, see SCSA.generate_codes_array"""
+
+        rng = np.random.default_rng() if rng is None else rng
+
+        usable_colors = np.zeros((num_codes, 2), dtype=np.uint8)
+        usable_colors[:, 1] = 1  # "A" and "B"
+
+        rows = np.arange(num_codes)
+        first, second = sample_positions(rng, num_codes, length)
+
+        # Every peg picks one of the two colors, the two positions guarantee both colors are used at least once
+        picks = rng.integers(0, 2, (num_codes, length))
+        picks[rows, first] = 0
+        picks[rows, second] = 1
+
+        return usable_colors[rows[:, None], picks]
+
+    def support_size(self, length: int, num_colors: int) -> int:
+        """Patterns of "A"s and "B"s both used, see SCSA.support_size"""
+
+        return 2**length - 2 if num_colors >= 2 and length >= 2 else 0
+
+    def rank(self, code: bytes, num_colors: int) -> int:
+
+        code = self.check_code(code, num_colors)
+
+        if set(code) != {0, 1}:
+
+            raise ValueError("Code " + repr(code) + " can not be generated by " + self.name + ".")
+
+        return digits_rank(code, 2) - 1
+
+    def unrank(self, rank: int, length: int, num_colors: int) -> bytes:
+
+        if not 0 <= rank < self.support_size(length, num_colors):
+
+            raise ValueError("Rank " + str(rank) + " is outside the support of " + self.name + ".")
+
+        return bytes(digits_unrank(rank + 1, length, 2))
+
+    def log_prior(self, code: bytes, num_colors: int) -> float:
+        """Log probability of code, higher for codes using both colors about as often (see generate_packed_codes)"""
+
+        try:
+
+            self.rank(code, num_colors)
+
+        except ValueError:
+
+            return -math.inf
+
+        length = len(code)
+        count = code.count(code[0])
+
+        # Both picked positions (one per color, "A" then "B") must hold their color, every other peg has two choices.
+        return (
+            math.log(1 * count * (length - count))
+            - math.log(length * (length - 1))
+            - (length - 2) * math.log(2)
+        )
+
 
 class TwoColorAlternating(SCSA):
     """SCSA that generates codes that alternate between two colors"""
 
+    min_colors = 2
+
     def __init__(self):
         """Constructor for TwoColorAlternating"""
 
         self.name = "TwoColorAlternating"
 
-    def generate_codes(
-        self, length: int, colors: list[str], num_codes: int = 1
-    ) -> list[str]:
-        """Generate codes based on TwoColorAlternating SCSA
+    def generate_packed_codes(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: random.Random = None
+    ) -> list[bytes]:
+        """Generate packed codes based on TwoColorAlternating SCSA
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
-            colors (list[str]): All possible colors that can be used to generate a code.
+            num_colors (int): Number of colors that can be used to generate a code.
             num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            rng (random.Random, optional): Stream to draw from. Defaults to None (random).
 
         Returns:
-            list[str]: Returns code(s) generated from SCSA.
+            list[bytes]: Returns packed code(s) generated from SCSA.
         """
 
+        rng = random if rng is None else rng
+
+        colors = range(num_colors)  # Packed codes store the index of each color
+
         if len(colors) < 2:
 
             return []
@@ -282,23 +736,69 @@ class TwoColorAlternating(SCSA):
 
         for _ in range(num_codes):
 
-            first_color, second_color = random.sample(colors, k=2)
+            first_color, second_color = rng.sample(colors, k=2)
 
-            code = ""
+            code = (bytes([first_color, second_color]) * ((length + 1) // 2))[:length]
 
-            for i in range(length):
+            codes.append(code)
 
-                if i % 2 == 0:
+        return codes
 
-                    code += first_color
+    def generate_codes_array(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Generate codes based on TwoColorAlternating SCSA as an array, see SCSA.generate_codes_array"""
 
-                else:
+        rng = np.random.default_rng() if rng is None else rng
 
-                    code += second_color
+        if num_colors < 2:
 
-            codes.append(code)
+            return np.zeros((0, length), dtype=np.uint8)
 
-        return codes
+        usable_colors = sample_colors(rng, num_codes, num_colors, 2)
+
+        return usable_colors[:, np.arange(length) % 2]
+
+    def support_size(self, length: int, num_colors: int) -> int:
+        """Ordered pairs of different colors (only the first color matters for one peg), see SCSA.support_size"""
+
+        if num_colors < 2:
+
+            return 0
+
+        return num_colors * (num_colors - 1) if length >= 2 else num_colors
+
+    def rank(self, code: bytes, num_colors: int) -> int:
+
+        code = self.check_code(code, num_colors)
+
+        if len(code) == 1:
+
+            return code[0]
+
+        first, second = code[0], code[1]
+        rank = first * (num_colors - 1) + second - (second > first)
+
+        if first == second or code != self.unrank(rank, len(code), num_colors):
+
+            raise ValueError("Code " + repr(code) + " can not be generated by " + self.name + ".")
+
+        return rank
+
+    def unrank(self, rank: int, length: int, num_colors: int) -> bytes:
+
+        if not 0 <= rank < self.support_size(length, num_colors):
+
+            raise ValueError("Rank " + str(rank) + " is outside the support of " + self.name + ".")
+
+        if length == 1:
+
+            return bytes([rank])
+
+        first, second = divmod(rank, num_colors - 1)
+        second += second >= first
+
+        return (bytes([first, second]) * ((length + 1) // 2))[:length]
 
 
 class OnlyOnce(SCSA):
@@ -309,20 +809,24 @@ class OnlyOnce(SCSA):
 
         self.name = "OnlyOnce"
 
-    def generate_codes(
-        self, length: int, colors: list[str], num_codes: int = 1
-    ) -> list[str]:
-        """Generate codes based on OnlyOnce SCSA
+    def generate_packed_codes(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: random.Random = None
+    ) -> list[bytes]:
+        """Generate packed codes based on OnlyOnce SCSA
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
-            colors (list[str]): All possible colors that can be used to generate a code.
+            num_colors (int): Number of colors that can be used to generate a code.
             num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            rng (random.Random, optional): Stream to draw from. Defaults to None (random).
 
         Returns:
-            list[str]: Returns code(s) generated from SCSA.
+            list[bytes]: Returns packed code(s) generated from SCSA.
         """
 
+        rng = random if rng is None else rng
+
+        colors = range(num_colors)  # Packed codes store the index of each color
         actual_len = -1
 
         if len(colors) < length:
@@ -334,18 +838,78 @@ class OnlyOnce(SCSA):
 
         for _ in range(num_codes):
 
-            code = list_to_str(random.sample(colors, k=length))
+            code = rng.sample(colors, k=length)
 
             if actual_len != -1:
 
                 while len(code) < actual_len:
 
-                    code += random.choice(colors)
+                    code.append(rng.choice(colors))
 
-            codes.append(code)
+            codes.append(bytes(code))
+
+        return codes
+
+    def generate_codes_array(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Generate codes based on OnlyOnce SCSA as an array, see SCSA.generate_codes_array"""
+
+        rng = np.random.default_rng() if rng is None else rng
+
+        distinct = min(length, num_colors)
+
+        # Shuffling every row of all the colors picks the first distinct colors without repetition
+        codes = np.empty((num_codes, length), dtype=np.uint8)
+        shuffled = rng.permuted(np.tile(np.arange(num_colors, dtype=np.uint8), (num_codes, 1)), axis=1)
+        codes[:, :distinct] = shuffled[:, :distinct]
+        codes[:, distinct:] = rng.integers(0, num_colors, (num_codes, length - distinct), dtype=np.uint8)
 
         return codes
 
+    def support_size(self, length: int, num_colors: int) -> int:
+        """Arrangements of different colors, followed by any colors once every color is used, see SCSA.support_size"""
+
+        distinct = min(length, num_colors)
+
+        return math.perm(num_colors, distinct) * num_colors ** (length - distinct) if num_colors >= 1 else 0
+
+    def rank(self, code: bytes, num_colors: int) -> int:
+        """Rank of the arrangement of different colors (each digit counting smaller colors left), then of the rest"""
+
+        code = self.check_code(code, num_colors)
+        distinct = min(len(code), num_colors)
+
+        if len(set(code[:distinct])) != distinct:
+
+            raise ValueError("Code " + repr(code) + " can not be generated by " + self.name + ".")
+
+        rank = 0
+
+        for i, peg in enumerate(code[:distinct]):
+
+            rank = rank * (num_colors - i) + peg - sum(used < peg for used in code[:i])
+
+        return rank * num_colors ** (len(code) - distinct) + digits_rank(code[distinct:], num_colors)
+
+    def unrank(self, rank: int, length: int, num_colors: int) -> bytes:
+
+        if not 0 <= rank < self.support_size(length, num_colors):
+
+            raise ValueError("Rank " + str(rank) + " is outside the support of " + self.name + ".")
+
+        distinct = min(length, num_colors)
+        rank, rest = divmod(rank, num_colors ** (length - distinct))
+        digits = [0] * distinct
+
+        for i in range(distinct - 1, -1, -1):
+
+            rank, digits[i] = divmod(rank, num_colors - i)
+
+        left = list(range(num_colors))
+
+        return bytes([left.pop(digit) for digit in digits] + digits_unrank(rest, length - distinct, num_colors))
+
 
 class FirstLast(SCSA):
     """SCSA that generates codes in which the first and last colors are the same"""
@@ -355,20 +919,25 @@ class FirstLast(SCSA):
 
         self.name = "FirstLast"
 
-    def generate_codes(
-        self, length: int, colors: list[str], num_codes: int = 1
-    ) -> list[str]:
-        """Generate codes based on FirstLast SCSA
+    def generate_packed_codes(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: random.Random = None
+    ) -> list[bytes]:
+        """Generate packed codes based on FirstLast SCSA
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
-            colors (list[str]): All possible colors that can be used to generate a code.
+            num_colors (int): Number of colors that can be used to generate a code.
             num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            rng (random.Random, optional): Stream to draw from. Defaults to None (random).
 
         Returns:
-            list[str]: Returns code(s) generated from SCSA.
+            list[bytes]: Returns packed code(s) generated from SCSA.
         """
 
+        rng = random if rng is None else rng
+
+        colors = range(num_colors)  # Packed codes store the index of each color
+
         if len(colors) < 1:
 
             return []
@@ -377,41 +946,86 @@ class FirstLast(SCSA):
 
         for _ in range(num_codes):
 
-            code = random.choices(colors, k=length - 2)
-            color = random.choices(colors, k=1)
+            code = rng.choices(colors, k=length - 2)
+            color = rng.choices(colors, k=1)
 
-            code.insert(0, color[0])
-            code.append(color[0])
-
-            code = list_to_str(code)
+            code = bytes(color) + bytes(code) + bytes(color)
 
             codes.append(code)
 
         return codes
 
+    def generate_codes_array(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Generate codes based on FirstLast SCSA as an array, see SCSA.generate_codes_array"""
+
+        rng = np.random.default_rng() if rng is None else rng
+
+        if num_colors < 1:
+
+            return np.zeros((0, length), dtype=np.uint8)
+
+        codes = rng.integers(0, num_colors, (num_codes, length), dtype=np.uint8)
+        codes[:, -1] = codes[:, 0]
+
+        return codes
+
+    def support_size(self, length: int, num_colors: int) -> int:
+        """Every choice of the pegs but the last one, see SCSA.support_size"""
+
+        return num_colors ** max(length - 1, 1) if num_colors >= 1 else 0
+
+    def rank(self, code: bytes, num_colors: int) -> int:
+
+        code = self.check_code(code, num_colors)
+
+        if code[0] != code[-1]:
+
+            raise ValueError("Code " + repr(code) + " can not be generated by " + self.name + ".")
+
+        return digits_rank(code[: max(len(code) - 1, 1)], num_colors)
+
+    def unrank(self, rank: int, length: int, num_colors: int) -> bytes:
+
+        if not 0 <= rank < self.support_size(length, num_colors):
+
+            raise ValueError("Rank " + str(rank) + " is outside the support of " + self.name + ".")
+
+        pegs = digits_unrank(rank, max(length - 1, 1), num_colors)
+
+        return bytes(pegs + pegs[:1] if length > 1 else pegs)
+
 
 class UsuallyFewer(SCSA):
     """SCSA that generates codes that usually has fewer (2 or 3) colors"""
 
+    min_colors = 3
+
     def __init__(self):
         """Constructor for UsuallyFewer"""
 
         self.name = "UsuallyFewer"
 
-    def generate_codes(
-        self, length: int, colors: list[str], num_codes: int = 1
-    ) -> list[str]:
-        """Generate codes based on UsuallyFewer SCSA
+    def generate_packed_codes(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: random.Random = None
+    ) -> list[bytes]:
+        """Generate packed codes based on UsuallyFewer SCSA
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
-            colors (list[str]): All possible colors that can be used to generate a code.
+            num_colors (int): Number of colors that can be used to generate a code.
             num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            rng (random.Random, optional): Stream to draw from. Defaults to None (random).
 
         Returns:
-            list[str]: Returns code(s) generated from SCSA.
+            list[bytes]: Returns packed code(s) generated from SCSA.
         """
 
+        rng = random if rng is None else rng
+
+        colors = range(num_colors)  # Packed codes store the index of each color
+
         if len(colors) < 3:
 
             return []
@@ -420,47 +1034,98 @@ class UsuallyFewer(SCSA):
 
         for _ in range(num_codes):
 
-            probability = random.randint(0, 100)
+            probability = rng.randint(0, 100)
 
             if probability < 90:
 
-                num = random.randint(2, 3)
+                num = rng.randint(2, 3)
 
-                picked_colors = random.sample(colors, k=num)
+                picked_colors = rng.sample(colors, k=num)
 
             else:
 
                 picked_colors = colors
 
-            code = list_to_str(random.choices(picked_colors, k=length))
+            code = bytes(rng.choices(picked_colors, k=length))
 
             codes.append(code)
 
         return codes
 
+    def generate_codes_array(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Generate codes based on UsuallyFewer SCSA as an array, see SCSA.generate_codes_array"""
+
+        rng = np.random.default_rng() if rng is None else rng
+
+        if num_colors < 3:
+
+            return np.zeros((0, length), dtype=np.uint8)
+
+        probability = rng.integers(0, 101, num_codes)  # Same as random.randint(0, 100)
+        num = np.where(probability < 90, rng.integers(2, 4, num_codes), num_colors)
+        picked_colors = sample_colors(rng, num_codes, num_colors, 3)
+
+        # Every peg picks one of the first num picked colors, codes using all the colors pick among every color
+        rows = np.arange(num_codes)[:, None]
+        picks = (rng.random((num_codes, length)) * np.minimum(num, picked_colors.shape[1])[:, None]).astype(np.intp)
+        codes = picked_colors[rows, picks]
+        every_color = num == num_colors
+
+        codes[every_color] = rng.integers(0, num_colors, (int(every_color.sum()), length), dtype=np.uint8)
+
+        return codes
+
+    def log_prior(self, code: bytes, num_colors: int) -> float:
+        """Log probability of code, mixing 2 or 3 picked colors (90 in 101) with every color (see SCSA.log_prior)"""
+
+        try:
+
+            self.rank(code, num_colors)
+
+        except ValueError:
+
+            return -math.inf
+
+        return log_mixture(
+            [
+                (45 / 101, subset_log_prior(code, num_colors, 2)),
+                (45 / 101, subset_log_prior(code, num_colors, 3)),
+                (11 / 101, subset_log_prior(code, num_colors, num_colors)),
+            ]
+        )
+
 
 class PreferFewer(SCSA):
     """SCSA that generates codes with a preference for fewer colors"""
 
+    min_colors = 2
+
     def __init__(self):
         """Constructor for PreferFewer"""
 
         self.name = "PreferFewer"
 
-    def generate_codes(
-        self, length: int, colors: list[str], num_codes: int = 1
-    ) -> list[str]:
-        """Generate codes based on PreferFewer SCSA
+    def generate_packed_codes(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: random.Random = None
+    ) -> list[bytes]:
+        """Generate packed codes based on PreferFewer SCSA
 
         Args:
             length (int): The length of the code to be generated (same as number of pegs for an instance of Mastermind).
-            colors (list[str]): All possible colors that can be used to generate a code.
+            num_colors (int): Number of colors that can be used to generate a code.
             num_codes (int, optional): Number of codes to generate. Defaults to 1.
+            rng (random.Random, optional): Stream to draw from. Defaults to None (random).
 
         Returns:
-            list[str]: Returns code(s) generated from SCSA.
+            list[bytes]: Returns packed code(s) generated from SCSA.
         """
 
+        rng = random if rng is None else rng
+
+        colors = range(num_colors)  # Packed codes store the index of each color
+
         if len(colors) < 2:
 
             return []
@@ -469,44 +1134,89 @@ class PreferFewer(SCSA):
 
         for _ in range(num_codes):
 
-            probability = random.randint(0, 100)
+            probability = rng.randint(0, 100)
 
             if probability <= 49:
 
                 num = 1
 
-                picked_colors = random.sample(colors, k=num)
+                picked_colors = rng.sample(colors, k=num)
 
             elif probability <= 74:
 
                 num = 2
 
-                picked_colors = random.sample(colors, k=num)
+                picked_colors = rng.sample(colors, k=num)
 
             elif probability <= 87:
 
                 num = min(3, len(colors))
 
-                picked_colors = random.sample(colors, k=num)
+                picked_colors = rng.sample(colors, k=num)
 
             elif probability <= 95:
 
                 num = min(4, len(colors))
 
-                picked_colors = random.sample(colors, k=num)
+                picked_colors = rng.sample(colors, k=num)
 
             elif probability <= 98:
 
                 num = min(5, len(colors))
 
-                picked_colors = random.sample(colors, k=num)
+                picked_colors = rng.sample(colors, k=num)
 
             else:
 
                 picked_colors = colors
 
-            code = list_to_str(random.choices(picked_colors, k=length))
+            code = bytes(rng.choices(picked_colors, k=length))
 
             codes.append(code)
 
         return codes
+
+    def generate_codes_array(
+        self, length: int, num_colors: int, num_codes: int = 1, rng: np.random.Generator = None
+    ) -> np.ndarray:
+        """Generate codes based on PreferFewer SCSA as an array, see SCSA.generate_codes_array"""
+
+        rng = np.random.default_rng() if rng is None else rng
+
+        if num_colors < 2:
+
+            return np.zeros((0, length), dtype=np.uint8)
+
+        probability = rng.integers(0, 101, num_codes)  # Same as random.randint(0, 100)
+        num = np.minimum(np.searchsorted([49, 74, 87, 95, 98], probability) + 1, num_colors)
+        num[probability > 98] = num_colors
+        picked_colors = sample_colors(rng, num_codes, num_colors, min(5, num_colors))
+
+        # Every peg picks one of the first num picked colors, codes using all the colors pick among every color
+        rows = np.arange(num_codes)[:, None]
+        picks = (rng.random((num_codes, length)) * np.minimum(num, picked_colors.shape[1])[:, None]).astype(np.intp)
+        codes = picked_colors[rows, picks]
+        every_color = num == num_colors
+
+        codes[every_color] = rng.integers(0, num_colors, (int(every_color.sum()), length), dtype=np.uint8)
+
+        return codes
+
+    def log_prior(self, code: bytes, num_colors: int) -> float:
+        """Log probability of code, mixing 1 to 5 picked colors with every color (see SCSA.log_prior)"""
+
+        try:
+
+            self.rank(code, num_colors)
+
+        except ValueError:
+
+            return -math.inf
+
+        # Chances (out of the 101 values of random.randint(0, 100)) of every number of picked colors
+        weights = [(50, 1), (25, 2), (13, min(3, num_colors)), (8, min(4, num_colors)), (3, min(5, num_colors))]
+
+        return log_mixture(
+            [(weight / 101, subset_log_prior(code, num_colors, k)) for weight, k in weights]
+            + [(2 / 101, subset_log_prior(code, num_colors, num_colors))]
+        )
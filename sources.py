@@ -0,0 +1,232 @@
+# File contains sources of secret codes for tournaments, read lazily so tournaments stream in constant memory.
+# See mastermind.py (Mastermind.run_tournament) for example usages.
+#
+# A source yields (round index, code) pairs, round indices starting at 1. split() cuts a source into picklable
+# parts of consecutive rounds for worker processes: sources that workers can read themselves (SCSAs, shared
+# memory corpora and packed code files) send only a range, other sources are read by the parent a part at a time.
+
+import gzip
+import itertools
+import lzma
+from abc import ABC, abstractmethod
+from randomness import RandomStream
+
+
+# Number of rounds per part of sources whose length is unknown.
+STREAM_PART = 256
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+XZ_MAGIC = b"\xfd7zXZ\x00"
+
+
+class CodeSource(ABC):
+    """Source of the secret codes of a tournament"""
+
+    def __init__(self, first: int = 1):
+        """Constructor for CodeSource
+
+        Args:
+            first (int, optional): Index of the first round. Defaults to 1.
+        """
+
+        self.first = first
+        self.key = ()  # Identifies the codes of the source, see checkpoint.py
+
+    @abstractmethod
+    def __iter__(self):
+
+        pass
+
+    def skip(self, rounds: int) -> None:
+        """Starts the source after its first rounds rounds, e.g. to resume a tournament."""
+
+        self.first += rounds
+
+    def length(self) -> int:
+        """Number of rounds of the source, None if it is only known once the source is read."""
+
+        return None
+
+    def split(self, size: int):
+        """Cuts the source into parts of up to size consecutive rounds
+
+        Args:
+            size (int): Number of rounds per part.
+
+        Yields:
+            CodeSource: Part of the source, picklable, read in turn by the parent.
+        """
+
+        codes = iter(self)
+
+        while True:
+
+            part = list(itertools.islice(codes, size))
+
+            if not part:
+
+                break
+
+            yield ListSource(part)
+
+
+class ListSource(CodeSource):
+    """Codes already read"""
+
+    def __init__(self, rounds: list):
+        """Constructor for ListSource
+
+        Args:
+            rounds (list[tuple[int, bytes or str]]): (round index, code) of every round.
+        """
+
+        super().__init__()
+
+        self.rounds = rounds
+
+    def __iter__(self):
+
+        return iter(self.rounds[self.first - 1 :])
+
+    def length(self) -> int:
+
+        return len(self.rounds)
+
+
+class SCSASource(CodeSource):
+    """Codes generated by an SCSA as they are needed
+
+    Round i generates its code from rng.code_stream(i) just before it is played, so the round plays out the same way
+    whichever process plays it.
+    """
+
+    def __init__(
+        self, scsa, board_length: int, num_colors: int, num_rounds: int, rng: RandomStream, first: int = 1
+    ):
+        """Constructor for SCSASource
+
+        Args:
+            scsa (SCSA): SCSA used to generate secret codes.
+            board_length (int): Number of pegs.
+            num_colors (int): Number of possible colors.
+            num_rounds (int): Number of rounds of the tournament.
+            rng (RandomStream): Stream of the tournament (see randomness.py).
+            first (int, optional): Index of the first round. Defaults to 1.
+        """
+
+        super().__init__(first)
+
+        self.scsa = scsa
+        self.board_length = board_length
+        self.num_colors = num_colors
+        self.num_rounds = num_rounds
+        self.rng = rng
+        self.last = num_rounds  # Index of the last round
+        self.key = (scsa.name, num_rounds, rng.root_seed)
+
+    def __iter__(self):
+
+        for idx in range(self.first, self.last + 1):
+
+            code = self.scsa.generate_packed_codes(self.board_length, self.num_colors, 1, self.rng.code_stream(idx))
+
+            yield (idx, code[0])
+
+    def length(self) -> int:
+
+        return self.last
+
+    def split(self, size: int):
+
+        for lo in range(self.first, self.last + 1, size):
+
+            part = SCSASource(self.scsa, self.board_length, self.num_colors, self.num_rounds, self.rng, lo)
+            part.last = min(lo + size - 1, self.last)
+
+            yield part
+
+
+def open_code_file(file_name: str):
+    """Opens a file of codes for reading as text, decompressing gzip and xz/lzma files (detected by their magic)."""
+
+    file = open(file_name, "rb")
+    magic = file.read(len(XZ_MAGIC))
+    file.close()
+
+    if magic.startswith(GZIP_MAGIC):
+
+        return gzip.open(file_name, "rt")
+
+    if magic.startswith(XZ_MAGIC) or file_name.endswith(".lzma"):
+
+        return lzma.open(file_name, "rt")
+
+    return open(file_name, "r")
+
+
+class FileSource(CodeSource):
+    """Codes read a line at a time from a text file (see read_from_file), optionally gzip or xz/lzma compressed"""
+
+    def __init__(self, file_name: str, first: int = 1):
+        """Constructor for FileSource
+
+        Args:
+            file_name (str): Name of file with one code per line, blank lines are skipped.
+            first (int, optional): Index of the first round. Defaults to 1.
+        """
+
+        super().__init__(first)
+
+        self.file_name = file_name
+        self.key = (file_name,)
+
+    def __iter__(self):
+
+        file = open_code_file(self.file_name)
+        codes = (line.strip() for line in file if line.strip())
+
+        try:
+
+            yield from zip(itertools.count(self.first), itertools.islice(codes, self.first - 1, None))
+
+        finally:
+
+            file.close()
+
+
+class IndexedSource(CodeSource):
+    """Codes of a corpus read by index: a CodeCorpus (see corpus.py) or BinaryCodes (see codefile.py), round i
+    playing code i - 1
+    """
+
+    def __init__(self, codes, first: int = 1, last: int = None):
+        """Constructor for IndexedSource
+
+        Args:
+            codes (CodeCorpus or BinaryCodes): Codes of the tournament.
+            first (int, optional): Index of the first round. Defaults to 1.
+            last (int, optional): Index of the last round. Defaults to None (every code).
+        """
+
+        super().__init__(first)
+
+        self.codes = codes
+        self.last = len(codes) if last is None else last
+        self.key = (getattr(codes, "file_name", "corpus"), len(codes))
+
+    def __iter__(self):
+
+        codes = self.codes
+
+        return ((idx, codes[idx - 1]) for idx in range(self.first, self.last + 1))
+
+    def length(self) -> int:
+
+        return self.last
+
+    def split(self, size: int):
+
+        for lo in range(self.first, self.last + 1, size):
+
+            yield IndexedSource(self.codes, lo, min(lo + size - 1, self.last))
@@ -0,0 +1,214 @@
+# File contains a parameter sweep over board_length x num_colors x SCSA x player.
+# Example:
+#   python3 sweep.py --board_length 4 5 7 --num_colors 5 6 --scsa_name InsertColors OnlyOnce \
+#       --player_name Endgame Beta --num_rounds 100 --jobs 4 --seed 1 --output sweep.jsonl
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import timeit
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from mastermind import Mastermind
+from registry import PLAYER_NAMES, SCSA_NAMES, make_colors, str_to_player, str_to_scsa
+
+
+# Fields identifying a cell of the grid, a cell already in the output is not played again.
+CELL_FIELDS = ["board_length", "num_colors", "scsa_name", "player_name", "num_rounds", "seed"]
+
+RECORD_FIELDS = CELL_FIELDS + ["score", "wins", "losses", "failures", "mean_guesses", "time"]
+
+
+def make_cells(grid: dict) -> list:
+    """Expands a grid specification into its cells, largest first
+
+    Args:
+        grid (dict): Lists of values for "board_length", "num_colors", "scsa_name" and "player_name",
+                     and single values for "num_rounds" and "seed".
+
+    Returns:
+        list[dict]: Returns one dict of CELL_FIELDS per combination, sorted by decreasing expected cost.
+    """
+
+    cells = [
+        {
+            "board_length": board_length,
+            "num_colors": num_colors,
+            "scsa_name": scsa_name,
+            "player_name": player_name,
+            "num_rounds": grid["num_rounds"],
+            "seed": grid.get("seed"),
+        }
+        for board_length, num_colors, scsa_name, player_name in itertools.product(
+            grid["board_length"], grid["num_colors"], grid["scsa_name"], grid["player_name"]
+        )
+    ]
+
+    # Scheduling the largest cells first keeps a single long cell from finishing the sweep on its own.
+    cells.sort(key=lambda cell: cell["board_length"] * cell["num_colors"], reverse=True)
+
+    return cells
+
+
+def cell_key(cell: dict) -> tuple:
+    """Key of a cell, read back from CSV strings or JSON values alike."""
+
+    return tuple(str(cell[field]) if cell[field] is not None else "" for field in CELL_FIELDS)
+
+
+def read_finished(output: str) -> set:
+    """Reads keys of the cells already in an output file
+
+    Args:
+        output (str): Name of .csv or .jsonl file.
+
+    Returns:
+        set[tuple]: Returns keys of finished cells, empty if the file does not exist.
+    """
+
+    if not os.path.exists(output):
+
+        return set()
+
+    file = open(output, "r", newline="")
+
+    if output.endswith(".csv"):
+
+        records = list(csv.DictReader(file))
+
+    else:
+
+        records = [json.loads(line) for line in file if line.strip()]
+
+    file.close()
+
+    return set(cell_key(record) for record in records)
+
+
+def run_cell(cell: dict) -> dict:
+    """Plays the tournament of a cell
+
+    Args:
+        cell (dict): Cell of the grid, see make_cells.
+
+    Returns:
+        dict: Returns record with RECORD_FIELDS.
+    """
+
+    start = timeit.default_timer()
+
+    mastermind = Mastermind(cell["board_length"], make_colors(cell["num_colors"]))
+    results = mastermind.play_tournament(
+        str_to_player(cell["player_name"]),
+        str_to_scsa(cell["scsa_name"]),
+        cell["num_rounds"],
+        seed=cell["seed"],
+        verbose=False,
+    )
+
+    record = dict(cell)
+    record["score"] = results.score
+    record["wins"] = results.get_number_of_wins()
+    record["losses"] = results.get_number_of_losses()
+    record["failures"] = results.get_number_of_failures()
+    record["mean_guesses"] = results.get_mean_guesses()
+    record["time"] = timeit.default_timer() - start
+
+    return record
+
+
+def run_sweep(grid: dict, output: str, jobs: int = 1) -> None:
+    """Plays every cell of a grid not yet in output and appends one record per cell as soon as it finishes
+
+    Args:
+        grid (dict): Grid specification, see make_cells.
+        output (str): Name of file to write records to, CSV if it ends with .csv, JSON lines otherwise.
+        jobs (int, optional): Number of processes playing cells in parallel. Defaults to 1.
+    """
+
+    finished = read_finished(output)
+    cells = [cell for cell in make_cells(grid) if cell_key(cell) not in finished]
+
+    print("Cells:", len(cells), "to play,", len(finished), "already finished")
+
+    is_csv = output.endswith(".csv")
+    new_file = not os.path.exists(output) or os.path.getsize(output) == 0
+    file = open(output, "a", newline="")
+
+    if is_csv:
+
+        writer = csv.DictWriter(file, fieldnames=RECORD_FIELDS)
+
+        if new_file:
+
+            writer.writeheader()
+
+    def write(record: dict) -> None:
+
+        if is_csv:
+
+            writer.writerow(record)
+
+        else:
+
+            file.write(json.dumps(record) + "\n")
+
+        file.flush()
+
+        print(
+            "{board_length}x{num_colors} {scsa_name} {player_name}: score {score:.2f}, "
+            "{wins} wins, {losses} losses, {failures} failures".format(**record)
+        )
+
+    if jobs <= 1:
+
+        for cell in cells:
+
+            write(run_cell(cell))
+
+    else:
+
+        with ProcessPoolExecutor(jobs) as pool:
+
+            for future in as_completed([pool.submit(run_cell, cell) for cell in cells]):
+
+                write(future.result())
+
+    file.close()
+
+    return
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Play a grid of Mastermind tournaments.")
+    parser.add_argument("--grid", nargs="?", type=str, default=None, help="JSON file with the grid specification")
+    parser.add_argument("--board_length", nargs="+", type=int)
+    parser.add_argument("--num_colors", nargs="+", type=int)
+    parser.add_argument("--scsa_name", nargs="+", type=str, choices=SCSA_NAMES)
+    parser.add_argument("--player_name", nargs="+", type=str, choices=PLAYER_NAMES)
+    parser.add_argument("--num_rounds", nargs="?", type=int, default=None)
+    parser.add_argument("--seed", nargs="?", type=int, default=None)
+    parser.add_argument("--jobs", nargs="?", type=int, default=1)
+    parser.add_argument("--output", nargs="?", type=str, default="sweep.jsonl")
+    args = parser.parse_args()
+
+    grid = {}
+
+    if args.grid is not None:
+
+        file = open(args.grid, "r")
+        grid = json.load(file)
+        file.close()
+
+    # Command-line values override the grid file.
+    for field in ["board_length", "num_colors", "scsa_name", "player_name", "num_rounds", "seed"]:
+
+        if getattr(args, field) is not None:
+
+            grid[field] = getattr(args, field)
+
+    grid.setdefault("num_rounds", 100)
+
+    run_sweep(grid, args.output, args.jobs)